@@ -0,0 +1,70 @@
+"""Times every content coding and level on representative request bodies and calibrates a policy for a bandwidth.
+
+For every body size the table shows the compressed size, the compression time and the total cost, which is the
+compression time plus the upload time of the compressed body at the given bandwidth. calibrate() then picks the size
+classes and levels that minimize that cost. zstd and brotli are included when their packages are installed.
+
+Usage:
+    python benchmarks/bench_compression.py [--bandwidth-mbit 10] [--sizes 2000 16000 64000 500000]
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+
+from hyper_sdk.compression import available_encodings, calibrate, compress
+
+LEVELS = {"gzip": (1, 6, 9), "zstd": (1, 3, 10), "br": (1, 4, 9)}
+
+
+def body(size: int) -> bytes:
+    # Request bodies are JSON with an obfuscated script: a small alphabet with many repeated identifiers.
+    rng = random.Random(size)
+    words = ["".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(2, 10))) for _ in range(400)]
+    parts, length = [], 0
+    while length < size:
+        part = rng.choice(words) + rng.choice("(){}[];,.=+-*/ ") + str(rng.randint(0, 999))
+        parts.append(part)
+        length += len(part)
+    return json.dumps({"userAgent": "Mozilla/5.0", "script": "".join(parts)[:size], "ip": "127.0.0.1"}).encode()
+
+
+def timed(data: bytes, encoding: str, level: int, repeat: int = 3) -> tuple:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = compress(data, encoding, level)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return len(compressed), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bandwidth-mbit", type=float, default=10.0, help="upload bandwidth in Mbit/s")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 16_000, 64_000, 500_000])
+    args = parser.parse_args()
+
+    bandwidth = args.bandwidth_mbit * 1e6 / 8
+    samples = [body(size) for size in args.sizes]
+    encodings = available_encodings()
+
+    print(f"{'body':>8}  {'coding':<8}  {'size':>8}  {'time':>9}  {'cost':>9}")
+    for sample in samples:
+        print(f"{len(sample):>8}  {'none':<8}  {len(sample):>8}  {0:>7.2f}ms  {len(sample) / bandwidth * 1e3:>7.2f}ms")
+        for encoding in encodings:
+            for level in LEVELS[encoding]:
+                size, elapsed = timed(sample, encoding, level)
+                cost = elapsed + size / bandwidth
+                print(f"{'':>8}  {encoding + '-' + str(level):<8}  {size:>8}  {elapsed * 1e3:>7.2f}ms  "
+                      f"{cost * 1e3:>7.2f}ms")
+
+    policy = calibrate(samples, bandwidth=bandwidth, encodings=encodings)
+    print(f"\ncalibrated for {args.bandwidth_mbit:g} Mbit/s, codings in order of preference {policy.encodings}:")
+    for size_class in policy.size_classes:
+        print(f"  bodies < {size_class.max_size}: {size_class.levels or 'uncompressed'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compares plain and dictionary compression of a script body that changed little since the scripts trained on.
+
+The corpus is synthetic: successive versions of one script, each rewriting a small share of its statements, the way
+anti-bot scripts change between releases. A dictionary is trained on the older versions and the newest one is
+compressed with and without it. Pass --corpus to use captured scripts instead, one file per version, oldest first.
+
+Usage:
+    python benchmarks/bench_dictionary.py [--versions 8] [--script-size 500000] [--dictionary-size 262144]
+        [--corpus scripts/*.js]
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from typing import List
+
+from hyper_sdk.compression import compress
+from hyper_sdk.compression_dictionary import dictionary_encodings, train_dictionary
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def synthetic_versions(count: int, size: int, changed: float = 0.05) -> List[str]:
+    rng = random.Random(size)
+
+    def statement() -> str:
+        name = "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(3, 12)))
+        return f"var {name}=function(a,b){{return a[{rng.randint(0, 999)}]^b.{name}({rng.random():.6f})}};"
+
+    statements = []
+    while sum(map(len, statements)) < size:
+        statements.append(statement())
+    versions = ["".join(statements)]
+    for _ in range(count - 1):
+        statements = [statement() if rng.random() < changed else item for item in statements]
+        versions.append("".join(statements))
+    return versions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--versions", type=int, default=8)
+    parser.add_argument("--script-size", type=int, default=500_000)
+    parser.add_argument("--dictionary-size", type=int, default=256 * 1024)
+    parser.add_argument("--corpus", nargs="+", help="captured scripts, oldest first")
+    args = parser.parse_args()
+
+    if args.corpus:
+        versions = []
+        for path in args.corpus:
+            with open(path, encoding="utf-8", errors="replace") as file:
+                versions.append(file.read())
+    else:
+        versions = synthetic_versions(args.versions, args.script_size)
+
+    dictionary = train_dictionary(versions[:-1], size=args.dictionary_size)
+    body = json.dumps({"userAgent": "Mozilla/5.0", "script": versions[-1], "ip": "127.0.0.1"}).encode()
+    print(f"body {len(body)} bytes, dictionary {len(dictionary.data)} bytes trained on {len(versions) - 1} versions")
+
+    candidates = [("gzip", 6, lambda: compress(body, "gzip", 6))]
+    if zstandard is not None:
+        candidates.append(("zstd", 3, lambda: compress(body, "zstd", 3)))
+    for encoding in dictionary_encodings():
+        candidates.append((encoding, 3, lambda encoding=encoding: dictionary.compress(body, encoding, 3)))
+
+    print(f"{'coding':<8}  {'size':>8}  {'ratio':>6}  {'time':>9}")
+    for encoding, level, run in candidates:
+        run()
+        start = time.perf_counter()
+        compressed = run()
+        elapsed = time.perf_counter() - start
+        print(f"{encoding + '-' + str(level):<8}  {len(compressed):>8}  {len(body) / len(compressed):>5.1f}x  "
+              f"{elapsed * 1e3:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
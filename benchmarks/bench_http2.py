@@ -0,0 +1,204 @@
+"""Compares HTTP/1.1 and HTTP/2 on the sync Session: TLS handshakes and latency percentiles under concurrent threads.
+
+The API is replaced by a local TLS server that speaks both protocols, counts the connections it accepts and answers
+every request after a fixed delay. It needs the openssl command line tool to create a self-signed certificate.
+
+"HTTP/1.1 +" keeps one idle connection per thread instead of httpx's default of 20.
+
+Usage:
+    python benchmarks/bench_http2.py [--threads 64] [--requests 2000] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import httpx
+
+RESPONSE = b'{"payload": "sensor-data", "context": "context"}'
+
+
+class LocalApi:
+    """Local TLS server answering HTTP/1.1 and HTTP/2 requests after a delay, counting accepted connections."""
+
+    def __init__(self, certfile: str, keyfile: str, latency: float) -> None:
+        self.latency = latency
+        self.connections = 0
+        self.port = 0
+        self._context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self._context.load_cert_chain(certfile, keyfile)
+        self._context.set_alpn_protocols(["h2", "http/1.1"])
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        async def cancel() -> None:
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+        asyncio.run_coroutine_threadsafe(cancel(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._serve, "127.0.0.1", 0, ssl=self._context, backlog=1024))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        ssl_object = writer.get_extra_info("ssl_object")
+        try:
+            if ssl_object.selected_alpn_protocol() == "h2":
+                await self._serve_h2(reader, writer)
+            else:
+                await self._serve_http1(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, h2.exceptions.ProtocolError):
+            # A protocol error closes the connection, as a strict production server would.
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http1(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            await asyncio.sleep(self.latency)
+            writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: "
+                         + str(len(RESPONSE)).encode() + b"\r\n\r\n" + RESPONSE)
+            await writer.drain()
+
+    async def _serve_h2(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        writer.write(connection.data_to_send())
+
+        async def respond(stream_id: int) -> None:
+            await asyncio.sleep(self.latency)
+            if connection.state_machine.state == h2.connection.ConnectionState.CLOSED:
+                return
+            connection.send_headers(stream_id, [(":status", "200"), ("content-type", "application/json"),
+                                                ("content-length", str(len(RESPONSE)))])
+            connection.send_data(stream_id, RESPONSE, end_stream=True)
+            writer.write(connection.data_to_send())
+
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.DataReceived):
+                    connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    asyncio.ensure_future(respond(event.stream_id))
+            writer.write(connection.data_to_send())
+            await writer.drain()
+
+
+class LocalTransport(httpx.BaseTransport):
+    """Sends the requests of the session to the local server instead of the API host."""
+
+    def __init__(self, port: int, **kwargs: Any) -> None:
+        self.port = port
+        self.transport = httpx.HTTPTransport(**kwargs)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(host="localhost", port=self.port)
+        return self.transport.handle_request(request)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def create_certificate(directory: str) -> Dict[str, str]:
+    certfile, keyfile = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost",
+                    "-addext", "subjectAltName=DNS:localhost", "-keyout", keyfile, "-out", certfile],
+                   check=True, capture_output=True)
+    return {"certfile": certfile, "keyfile": keyfile}
+
+
+def run(http2: bool, port: int, certfile: str, threads: int, requests: int,
+        limits: Optional[httpx.Limits]) -> List[Optional[float]]:
+    from hyper_sdk import Session, SensorInput
+
+    # The same client the session creates for http2 and limits, with the local server's certificate trusted.
+    transport = LocalTransport(port, http2=http2, limits=limits or httpx.Limits(max_connections=100,
+                                                                                max_keepalive_connections=20),
+                               verify=ssl.create_default_context(cafile=certfile))
+    session = Session("api-key", client=httpx.Client(transport=transport), compression=False)
+    sensor_input = SensorInput("abck", "bmsz", "3", "https://www.example.com/", "Mozilla/5.0", "127.0.0.1", "en-US",
+                               "", "", "")
+
+    def call(_: int) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            session.generate_sensor_data(sensor_input)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(call, range(requests)))
+    session.close()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="server delay per request in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = create_certificate(directory)
+        server = LocalApi(files["certfile"], files["keyfile"], args.latency)
+        server.start()
+
+        print(f"{'protocol':<10}  {'handshakes':>10}  {'errors':>6}  {'p50':>8}  {'p99':>8}  {'req/s':>8}")
+        pool = httpx.Limits(max_connections=args.threads, max_keepalive_connections=args.threads)
+        for name, http2, limits in (("HTTP/1.1", False, None), ("HTTP/1.1 +", False, pool), ("HTTP/2", True, None)):
+            before = server.connections
+            start = time.perf_counter()
+            results = run(http2, server.port, files["certfile"], args.threads, args.requests, limits)
+            elapsed = time.perf_counter() - start
+            latencies = sorted(latency for latency in results if latency is not None)
+            if not latencies:
+                print(f"{name:<10}  {server.connections - before:>10}  {len(results):>6}")
+                continue
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f"{name:<10}  {server.connections - before:>10}  {len(results) - len(latencies):>6}  "
+                  f"{p50 * 1000:>6.1f}ms  {p99 * 1000:>6.1f}ms  {len(latencies) / elapsed:>8.0f}")
+
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
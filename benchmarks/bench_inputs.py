@@ -0,0 +1,81 @@
+"""Compares the memory and construction time of the slotted input types with the previous __dict__ classes.
+
+It also times building the request body of an input for the first time and again, which reuses the cached JSON of
+its fields.
+
+Usage:
+    python benchmarks/bench_inputs.py [--count 100000] [--json-backend json]
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+from hyper_sdk import SensorInput, UtmvcInput
+from hyper_sdk.core import ENDPOINTS, SessionCore
+
+
+class PreviousSensorInput:
+    # SensorInput before it was slotted, kept verbatim as the baseline.
+    def __init__(self, abck: str, bmsz: str, version: str, page_url: str, user_agent: str, ip: str, accept_language: str,
+                 context: str, script: str, script_url: str):
+        self.abck = abck
+        self.bmsz = bmsz
+        self.version = version
+        self.page_url = page_url
+        self.user_agent = user_agent
+        self.script = script
+        self.script_url = script_url
+        self.context = context
+        self.ip = ip
+        self.accept_language = accept_language
+
+
+class PreviousUtmvcInput:
+    def __init__(self, user_agent: str, session_ids: list, script: str):
+        self.user_agent = user_agent
+        self.session_ids = session_ids
+        self.script = script
+
+
+SENSOR_ARGS = ("abck", "bmsz", "3", "https://www.example.com/", "Mozilla/5.0", "127.0.0.1", "en-US", "", "", "")
+UTMVC_ARGS = ("Mozilla/5.0", ["session-id"], "")
+
+
+def bytes_per_instance(cls: type, arguments: tuple, count: int) -> float:
+    # The field values are shared, so only the instances themselves are counted.
+    tracemalloc.start()
+    instances = [cls(*arguments) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return size / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--json-backend", default="json")
+    args = parser.parse_args()
+
+    print(f"{'input':<12}  {'class':<9}  {'bytes':>6}  {'construction':>12}")
+    for name, previous, current, arguments in (("SensorInput", PreviousSensorInput, SensorInput, SENSOR_ARGS),
+                                               ("UtmvcInput", PreviousUtmvcInput, UtmvcInput, UTMVC_ARGS)):
+        for label, cls in (("previous", previous), ("slotted", current)):
+            size = bytes_per_instance(cls, arguments, args.count)
+            construction = min(timeit.repeat(lambda: cls(*arguments), number=args.count, repeat=3)) / args.count
+            print(f"{name:<12}  {label:<9}  {size:>6.0f}  {construction * 1e6:>10.2f}us")
+
+    core = SessionCore("api-key", compression=False, json_backend=args.json_backend)
+    endpoint = ENDPOINTS["generate_sensor_data"]
+    input_data = SensorInput(*SENSOR_ARGS)
+    number = 50_000
+    fresh = min(timeit.repeat(lambda: core._encode_payload(endpoint.url, endpoint.build(input_data)),
+                              number=number, repeat=3)) / number
+    cached = min(timeit.repeat(lambda: core._encode_payload(endpoint.url, endpoint.request_data(input_data)),
+                               number=number, repeat=3)) / number
+    print(f"\nsensor request body ({args.json_backend}): built {fresh * 1e6:.2f}us, cached {cached * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    main()
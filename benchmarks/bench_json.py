@@ -0,0 +1,68 @@
+"""Compares the JSON backends on request bodies and responses of the sizes the SDK typically sends and receives.
+
+Backends whose package is not installed are skipped.
+
+Usage:
+    python benchmarks/bench_json.py [--backends json orjson msgspec] [--number 200]
+"""
+
+import argparse
+import os
+import random
+import string
+import timeit
+from typing import Any, Dict
+
+from hyper_sdk.serialization import json_backend
+
+
+def script(size: int) -> str:
+    # Scripts are ASCII with quotes, backslashes and newlines to escape, like obfuscated anti-bot code.
+    alphabet = string.ascii_letters + string.digits + "(){}[];,.=+-*/'\"\\\n "
+    rng = random.Random(size)
+    return "".join(rng.choice(alphabet) for _ in range(size))
+
+
+def payloads() -> Dict[str, Any]:
+    return {
+        "200 B request": {"st": 1700000000000, "ct": "0" * 100, "domain": "www.example.com", "workTime": 0},
+        "20 KB request": {
+            "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0",
+            "abck": os.urandom(300).hex(), "bmsz": os.urandom(150).hex(), "version": "3",
+            "pageUrl": "https://www.example.com/", "context": os.urandom(9000).hex(), "ip": "127.0.0.1",
+            "acceptLanguage": "en-US,en;q=0.9",
+        },
+        "500 KB script": {"userAgent": "Mozilla/5.0", "script": script(500_000), "ip": "127.0.0.1"},
+    }
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:>8.2f}ms"
+    return f"{seconds * 1e6:>8.1f}us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["json", "orjson", "msgspec"])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    backends = {}
+    for name in args.backends:
+        try:
+            backends[name] = json_backend(name)
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+
+    print(f"{'payload':<15}  {'backend':<8}  {'dumps':>10}  {'loads':>10}")
+    for label, payload in payloads().items():
+        for name, backend in backends.items():
+            encoded = backend.dumps(payload)
+            dumps = min(timeit.repeat(lambda: backend.dumps(payload), number=args.number, repeat=3))
+            loads = min(timeit.repeat(lambda: backend.loads(encoded), number=args.number, repeat=3))
+            print(f"{label:<15}  {name:<8}  {format_time(dumps / args.number)}  {format_time(loads / args.number)}")
+
+
+if __name__ == "__main__":
+    main()
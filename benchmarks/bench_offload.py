@@ -0,0 +1,64 @@
+"""Measures event-loop lag and throughput of SessionAsync with many concurrent large calls, with and without offloading.
+
+Every call is a generate_kasada_payload with a large script, answered by an httpx MockTransport after a fixed delay.
+LoopLagMonitor records how late the event loop runs a periodic timer while the calls are in flight.
+
+Usage:
+    python benchmarks/bench_offload.py [--tasks 500] [--script-size 500000] [--latency 0.005] [--json-backend json]
+"""
+
+import argparse
+import asyncio
+import random
+import string
+import time
+
+import httpx
+
+from hyper_sdk import KasadaPayloadInput, LoopLagMonitor, SessionAsync
+from hyper_sdk.offload import OFFLOAD_THRESHOLD
+
+
+def script(size: int) -> str:
+    alphabet = string.ascii_letters + string.digits + "(){}[];,.=+-*/'\"\\\n "
+    rng = random.Random(size)
+    return "".join(rng.choice(alphabet) for _ in range(size))
+
+
+async def run(tasks: int, script_text: str, latency: float, json_backend: str, offload_threshold) -> dict:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"payload": "payload", "headers": {"x-kpsdk-ct": "ct"}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    session = SessionAsync("api-key", client=client, json_backend=json_backend, offload_threshold=offload_threshold)
+    inputs = [KasadaPayloadInput("Mozilla/5.0", "https://www.example.com/ips.js", script_text, "en-US", "127.0.0.1")
+              for _ in range(tasks)]
+
+    async with LoopLagMonitor() as monitor:
+        start = time.perf_counter()
+        await asyncio.gather(*(session.generate_kasada_payload(input_data) for input_data in inputs))
+        elapsed = time.perf_counter() - start
+    await client.aclose()
+    return dict(monitor.stats(), calls_per_second=tasks / elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--script-size", type=int, default=500_000)
+    parser.add_argument("--latency", type=float, default=0.005, help="transport delay per request in seconds")
+    parser.add_argument("--json-backend", default="json")
+    args = parser.parse_args()
+
+    script_text = script(args.script_size)
+    print(f"{'mode':<10}  {'lag mean':>10}  {'lag p99':>10}  {'lag max':>10}  {'calls/s':>8}")
+    for name, threshold in (("on loop", None), ("offloaded", OFFLOAD_THRESHOLD)):
+        stats = asyncio.run(run(args.tasks, script_text, args.latency, args.json_backend, threshold))
+        print(f"{name:<10}  {stats['mean'] * 1e3:>8.1f}ms  {stats['p99'] * 1e3:>8.1f}ms  {stats['max'] * 1e3:>8.1f}ms  "
+              f"{stats['calls_per_second']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
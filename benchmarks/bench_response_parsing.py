@@ -0,0 +1,84 @@
+"""Measures the per-call cost of parsing large gzip-encoded API responses, before and after the single decode.
+
+The responses are served through an httpx MockTransport with content-encoding: gzip, so httpx decodes them once as it
+does for the real API. The previous pipeline then tried gzip.decompress on the decoded bytes again, which raised and
+was swallowed, before json.loads; the current one parses the decoded bytes directly.
+
+Usage:
+    python benchmarks/bench_response_parsing.py [--sizes 50000 200000 1000000] [--number 200]
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import timeit
+from typing import Any, Dict
+
+import httpx
+
+from hyper_sdk.core import SessionCore
+
+
+def kasada_payload_response(size: int) -> Dict[str, Any]:
+    return {
+        "payload": base64.b64encode(os.urandom(size * 3 // 4)).decode(),
+        "headers": {"x-kpsdk-ct": "0" * 300, "x-kpsdk-cd": "{}", "x-kpsdk-v": "j-1.0.0"},
+    }
+
+
+def interstitial_payload_response(size: int) -> Dict[str, Any]:
+    return {
+        "payload": "&".join(f"k{i}={os.urandom(24).hex()}" for i in range(size // 56)),
+        "headers": {"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"},
+    }
+
+
+def fetch(body: Dict[str, Any]) -> httpx.Response:
+    compressed = gzip.compress(json.dumps(body).encode())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-encoding": "gzip", "content-type": "application/json"},
+                              stream=httpx.ByteStream(compressed))
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        return client.post("https://kasada.hypersolutions.co/payload")
+
+
+def previous_parse(response: httpx.Response) -> Dict[str, Any]:
+    # The parsing before the change, kept verbatim as the baseline.
+    content = response.content
+    content_encoding = response.headers.get("content-encoding", "").lower()
+
+    if content_encoding == "gzip":
+        try:
+            content = gzip.decompress(content)
+        except Exception:
+            pass
+
+    return json.loads(content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50_000, 200_000, 1_000_000])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    core = SessionCore("api-key", json_backend="json")
+    print(f"{'response':<22}  {'size':>8}  {'previous':>10}  {'current':>10}  {'saved':>6}")
+    for name, build in (("kasada payload", kasada_payload_response),
+                        ("interstitial payload", interstitial_payload_response)):
+        for size in args.sizes:
+            response = fetch(build(size))
+            assert previous_parse(response) == core.parse_response(response)[0]
+            previous = min(timeit.repeat(lambda: previous_parse(response), number=args.number, repeat=3))
+            current = min(timeit.repeat(lambda: core.parse_response(response), number=args.number, repeat=3))
+            previous, current = previous / args.number * 1e6, current / args.number * 1e6
+            print(f"{name:<22}  {len(response.content):>8}  {previous:>8.0f}us  {current:>8.0f}us  "
+                  f"{1 - current / previous:>5.0%}")
+
+
+if __name__ == "__main__":
+    main()
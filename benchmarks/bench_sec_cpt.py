@@ -0,0 +1,78 @@
+"""Compares the sec-cpt proof-of-work solver with the previous pure Python loop at several difficulties.
+
+Usage:
+    python benchmarks/bench_sec_cpt.py [--difficulties 5000 20000 100000] [--count 10] [--repeat 3] [--workers 4]
+"""
+
+import argparse
+import hashlib
+import os
+import statistics
+import time
+from typing import Callable, List
+
+from hyper_sdk.akamai.sec_cpt import solve_sec_cpt_answers
+
+SEC = "8C6F2A1B3D4E5F60718293A4B5C6D7E8"
+TIMESTAMP = 1700000000
+NONCE = "b1c2d3e4f5a6"
+
+
+def reference_answers(sec: str, timestamp: int, nonce: str, difficulty: int, count: int) -> List[str]:
+    # The solver loop before the engine was introduced, kept verbatim as the baseline.
+    answers = []
+    while True:
+        answer = f"0.{os.urandom(8).hex()}"
+        hash_input = f"{sec}{timestamp}{nonce}{difficulty}{answer}"
+
+        output = 0
+        for byte in hashlib.sha256(hash_input.encode('ascii')).digest():
+            output = (output << 8) | byte
+            output %= difficulty
+
+        if output == 0:
+            difficulty += 1
+            answers.append(answer)
+
+            if len(answers) == count:
+                break
+            continue
+
+    return answers
+
+
+def measure(solve: Callable[[], List[str]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solve()
+        timings.append(time.perf_counter() - start)
+    # The search time is random, the median of a few runs is stable enough to compare.
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--difficulties", type=int, nargs="+", default=[5000, 20000, 100000])
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="also time the process pool with this many workers")
+    args = parser.parse_args()
+
+    header = f"{'difficulty':>10}  {'reference':>10}  {'engine':>10}  {'speedup':>7}"
+    if args.workers > 1:
+        header += f"  {'pool x' + str(args.workers):>10}"
+    print(header)
+    for difficulty in args.difficulties:
+        reference = measure(lambda: reference_answers(SEC, TIMESTAMP, NONCE, difficulty, args.count), args.repeat)
+        engine = measure(lambda: solve_sec_cpt_answers(SEC, TIMESTAMP, NONCE, difficulty, args.count), args.repeat)
+        line = f"{difficulty:>10}  {reference:>9.2f}s  {engine:>9.2f}s  {reference / engine:>6.1f}x"
+        if args.workers > 1:
+            pool = measure(lambda: solve_sec_cpt_answers(SEC, TIMESTAMP, NONCE, difficulty, args.count,
+                                                         workers=args.workers), args.repeat)
+            line += f"  {pool:>9.2f}s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measures the construction time and resident memory of many Session instances, with and without a shared client.
+
+Every mode runs in a fresh interpreter so its memory is measured from the same baseline:
+
+  own-ssl  every Session gets its own httpx.Client, which loads the CA bundle again (the behaviour before the registry)
+  default  every Session creates its own client from the cached SSL context
+  shared   all Sessions share one pooled client through shared_client=True
+
+Usage:
+    python benchmarks/bench_shared_client.py [--sessions 1000] [--modes own-ssl default shared]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = ("own-ssl", "default", "shared")
+
+
+def rss_bytes() -> int:
+    # VmRSS is the current resident set size, ru_maxrss only reports the peak.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def measure(mode: str, sessions: int) -> dict:
+    import httpx
+    from hyper_sdk import Session
+
+    # Import and warm up everything that is loaded once per process before taking the baseline.
+    Session("warmup", shared_client=mode == "shared").close()
+    before = rss_bytes()
+
+    start = time.perf_counter()
+    if mode == "own-ssl":
+        created = [Session(f"key-{i}", client=httpx.Client(http2=True)) for i in range(sessions)]
+    else:
+        created = [Session(f"key-{i}", shared_client=mode == "shared") for i in range(sessions)]
+    elapsed = time.perf_counter() - start
+    rss = rss_bytes() - before
+
+    for session in created:
+        session.close()
+    return {"mode": mode, "seconds": elapsed, "rss": rss}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.sessions)))
+        return
+
+    print(f"{'mode':<8}  {'total':>8}  {'per session':>11}  {'RSS':>8}  {'RSS per 1,000':>13}")
+    for mode in args.modes:
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode,
+                                 "--sessions", str(args.sessions)], check=True, capture_output=True, text=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        per_thousand = result["rss"] / args.sessions * 1000
+        print(f"{mode:<8}  {result['seconds']:>7.2f}s  {result['seconds'] / args.sessions * 1000:>9.2f}ms  "
+              f"{result['rss'] / 2 ** 20:>6.1f}MB  {per_thousand / 2 ** 20:>11.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measures the peak memory of in-flight sensor requests with a large script, with and without streamed bodies.
+
+The transport discards the body chunk by chunk as a socket would, so the peak only counts what the client side holds.
+Every call uses a new script, as a script seen for the first time is the worst case. tracemalloc traces the calls
+only; the input scripts are created before it starts.
+
+Usage:
+    python benchmarks/bench_streaming.py [--script-size 600000] [--in-flight 1 8] [--stream-threshold 262144]
+"""
+
+import argparse
+import os
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import httpx
+
+from hyper_sdk import SensorInput, Session
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    for _ in request.stream:
+        pass
+    return httpx.Response(200, json={"payload": "sensor-data", "context": "context"})
+
+
+def peak_per_request(scripts: List[str], stream_threshold: Optional[int]) -> float:
+    session = Session("api-key", client=httpx.Client(transport=httpx.MockTransport(handler)),
+                      stream_threshold=stream_threshold)
+    inputs = [SensorInput("abck", "bmsz", "3", "https://www.example.com/", "Mozilla/5.0", "127.0.0.1", "en-US", "",
+                          script, "https://www.example.com/script.js") for script in scripts]
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    with ThreadPoolExecutor(max_workers=len(inputs)) as pool:
+        list(pool.map(session.generate_sensor_data, inputs))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    session.close()
+    return (peak - baseline) / len(inputs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script-size", type=int, default=600_000)
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--stream-threshold", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    print(f"{'in flight':>9}  {'buffered':>12}  {'streamed':>12}")
+    for in_flight in args.in_flight:
+        # Scripts are ASCII with characters to escape, a fresh set per run so no fragment is cached yet.
+        results = []
+        for threshold in (None, args.stream_threshold):
+            scripts = [os.urandom(args.script_size // 2).hex().replace("a", '"') for _ in range(in_flight)]
+            results.append(peak_per_request(scripts, threshold))
+        print(f"{in_flight:>9}  {results[0] / 1024:>8.0f} KiB  {results[1] / 1024:>8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
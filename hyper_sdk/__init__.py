@@ -1,10 +1,32 @@
 from .akamai.pixel import *
 from .akamai.script_path import *
 from .akamai.sec_cpt import *
+from .akamai.sec_cpt_scheduler import *
 from .akamai.stop_signal import *
 from .incapsula.utmvc import *
 from .incapsula.dynamic import *
+from .shared import *
+from .wire import *
+from .results import *
+from .batch import *
+from .executor import *
+from .retry import *
+from .hedge import *
+from .rate_limit import *
+from .client_registry import *
+from .concurrency import *
+from .circuit_breaker import *
+from .dispatcher import *
+from .serialization import *
+from .streaming import *
+from .compression_dictionary import *
+from .compression import *
+from .script_cache import *
+from .offload import *
+from .core import *
+from .transport import *
 from .session import *
 from .session_async import *
+from .worker import *
 from .kasada.parse import *
 from .datadome.parse import *
@@ -1,4 +1,5 @@
 from .pixel import *
 from .script_path import *
 from .sec_cpt import *
+from .sec_cpt_scheduler import *
 from .stop_signal import *
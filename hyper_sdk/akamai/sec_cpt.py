@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import hashlib
 import json
@@ -5,7 +6,10 @@ import os
 import re
 import time
 from collections import OrderedDict
-from typing import List
+from concurrent.futures import Executor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+
+from ..serialization import default_json_backend
 
 sec_duration_expr = re.compile(r'data-duration=(\d+)')
 sec_challenge_expr = re.compile(r'challenge="(.*?)"')
@@ -37,7 +41,7 @@ class SecCptChallenge:
 
     @staticmethod
     def parse_from_json(json_payload: str) -> 'SecCptChallenge':
-        api_response = json.loads(json_payload)
+        api_response = default_json_backend.loads(json_payload)
 
         challenge_data = SecCptChallengeData(
             api_response.get('token', ''),
@@ -58,7 +62,7 @@ class SecCptChallenge:
             raise Exception("hyper-sdk: Challenge data not found.")
 
         decoded_challenge = base64.b64decode(challenge_match.group(1))
-        challenge_data = json.loads(decoded_challenge)
+        challenge_data = default_json_backend.loads(decoded_challenge)
 
         return SecCptChallengeData(
             challenge_data.get('token', ''),
@@ -89,42 +93,138 @@ class SecCptChallenge:
 
         return page_match.group(1)
 
-    def generate_sec_cpt_payload(self, sec_cpt_cookie: str) -> str:
+    def generate_sec_cpt_payload(self, sec_cpt_cookie: str, workers: Optional[int] = None,
+                                 executor: Optional[Executor] = None) -> str:
+        """
+            Solves the proof of work of the challenge and returns the payload to post to the challenge path.
+
+            Args:
+                sec_cpt_cookie (str): The sec_cpt cookie value.
+                workers (int, optional): Number of processes to solve the answers with, see solve_sec_cpt_answers.
+                executor (Executor, optional): An existing process pool to solve the answers with.
+
+            Returns:
+                str: The JSON payload containing the token and answers.
+
+            Raises:
+                Exception: If the sec_cpt cookie is malformed.
+        """
         sec, _, _ = sec_cpt_cookie.partition("~")
         if sec == sec_cpt_cookie:
             raise Exception("hyper-sdk: Malformed sec_cpt cookie.")
 
-        answers = self._generate_sec_cpt_answers(sec)
+        answers = self._generate_sec_cpt_answers(sec, workers, executor)
 
         payload = OrderedDict([
             ("token", self.challenge_data.token),
             ("answers", answers)
         ])
 
+        # Formatted by the standard library, the separators of the payload are kept as they have always been sent.
         return json.dumps(payload)
 
     def sleep(self):
         time.sleep(self.duration)
 
-    def _generate_sec_cpt_answers(self, sec: str) -> List[str]:
+    async def wait(self):
+        """
+            Waits for the challenge duration without blocking the event loop.
+
+            To release many challenges from a single timer, see AsyncSecCptScheduler.
+        """
+        await asyncio.sleep(self.duration)
+
+    def _generate_sec_cpt_answers(self, sec: str, workers: Optional[int] = None,
+                                  executor: Optional[Executor] = None) -> List[str]:
+        return solve_sec_cpt_answers(sec, self.challenge_data.timestamp, self.challenge_data.nonce,
+                                     self.challenge_data.difficulty, self.challenge_data.count,
+                                     workers=workers, executor=executor)
+
+
+def solve_sec_cpt_answers(sec: str, timestamp: int, nonce: str, difficulty: int, count: int,
+                          workers: Optional[int] = None, executor: Optional[Executor] = None,
+                          chunk_size: int = 4096) -> List[str]:
+    """
+        Solves the proof of work of a sec-cpt challenge.
+
+        The i-th answer must hash, together with the challenge fields and a difficulty of difficulty + i, to a SHA-256
+        digest that is divisible by that difficulty. Since the answers do not depend on each other they are searched
+        independently: sequentially in this process by default, or as bounded chunks on a process pool. Pending
+        chunks are cancelled as soon as all count answers are found.
+
+        Args:
+            sec (str): The first part of the sec_cpt cookie.
+            timestamp (int): The challenge timestamp.
+            nonce (str): The challenge nonce.
+            difficulty (int): The challenge difficulty.
+            count (int): The number of answers to find.
+            workers (int, optional): Number of processes to use, values below 2 solve in this process.
+            executor (Executor, optional): An existing process pool to use instead of creating one.
+            chunk_size (int, optional): Number of candidates tried by a single pool task.
+
+        Returns:
+            List[str]: The answers in challenge order.
+    """
+    prefixes = [f"{sec}{timestamp}{nonce}{difficulty + i}".encode('ascii') for i in range(count)]
+
+    if executor is None and (workers is None or workers < 2):
         answers = []
-        difficulty = self.challenge_data.difficulty
-
-        while True:
-            answer = f"0.{os.urandom(8).hex()}"
-            hash_input = f"{sec}{self.challenge_data.timestamp}{self.challenge_data.nonce}{difficulty}{answer}"
-
-            output = 0
-            for byte in hashlib.sha256(hash_input.encode('ascii')).digest():
-                output = (output << 8) | byte
-                output %= difficulty
-
-            if output == 0:
-                difficulty += 1
-                answers.append(answer)
-
-                if len(answers) == self.challenge_data.count:
-                    break
-                continue
-
-        return answers
\ No newline at end of file
+        for i, prefix in enumerate(prefixes):
+            answer = None
+            while answer is None:
+                answer = _search_sec_cpt_answer(prefix, difficulty + i, chunk_size)
+            answers.append(answer)
+        return answers
+
+    if executor is not None:
+        return _solve_on_executor(executor, prefixes, difficulty, max(workers or 1, 1), chunk_size)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _solve_on_executor(pool, prefixes, difficulty, workers, chunk_size)
+
+
+def _solve_on_executor(executor: Executor, prefixes: List[bytes], difficulty: int, workers: int,
+                       chunk_size: int) -> List[str]:
+    answers: Dict[int, str] = {}
+    pending = {}
+    # Keep at least two chunks per worker queued so no process idles while results are collected.
+    slots = max(workers * 2, len(prefixes))
+    next_index = 0
+
+    try:
+        while len(answers) < len(prefixes):
+            while len(pending) < slots:
+                unsolved = [i for i in range(len(prefixes)) if i not in answers]
+                index = unsolved[next_index % len(unsolved)]
+                next_index += 1
+                future = executor.submit(_search_sec_cpt_answer, prefixes[index], difficulty + index, chunk_size)
+                pending[future] = index
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                answer = future.result()
+                if answer is not None and index not in answers:
+                    answers[index] = answer
+    finally:
+        for future in pending:
+            future.cancel()
+
+    return [answers[i] for i in range(len(prefixes))]
+
+
+def _search_sec_cpt_answer(prefix: bytes, difficulty: int, attempts: int) -> Optional[str]:
+    base = hashlib.sha256(prefix)
+    copy = base.copy
+    from_bytes = int.from_bytes
+
+    # Draw the randomness for the whole chunk at once, every candidate uses 8 bytes as 16 hex characters.
+    candidates = os.urandom(8 * attempts).hex()
+    for offset in range(0, 16 * attempts, 16):
+        answer = "0." + candidates[offset:offset + 16]
+        digest = copy()
+        digest.update(answer.encode('ascii'))
+        if from_bytes(digest.digest(), 'big') % difficulty == 0:
+            return answer
+
+    return None
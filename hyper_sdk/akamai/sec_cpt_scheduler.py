@@ -0,0 +1,271 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from .sec_cpt import SecCptChallenge
+
+
+class TimerWheel:
+    """
+        A hashed timer wheel with O(1) insertion and cancellation.
+
+        Timers are hashed into one of a fixed number of slots by their expiry tick. Timers that expire more than one
+        revolution ahead carry the number of remaining revolutions and are skipped until it reaches zero. The wheel
+        does not keep time itself, the owner calls advance() once per elapsed tick. It is not thread-safe.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512):
+        if tick <= 0 or slots < 1:
+            raise ValueError("hyper-sdk: tick must be positive and slots at least 1.")
+
+        self.tick = tick
+        self._slots: List[Dict[int, list]] = [{} for _ in range(slots)]
+        self._position = 0
+        self._next_id = 0
+        self._locations: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def schedule(self, ticks: int, item: Any) -> int:
+        """
+            Inserts a timer that expires after the given number of ticks.
+
+            Args:
+                ticks (int): Number of ticks until the timer expires, at least 1.
+                item (Any): The value returned by advance() once the timer expires.
+
+            Returns:
+                int: A timer id that can be passed to cancel().
+        """
+        ticks = max(1, ticks)
+        slot = (self._position + ticks) % len(self._slots)
+        rounds = (ticks - 1) // len(self._slots)
+
+        timer_id = self._next_id
+        self._next_id += 1
+        self._slots[slot][timer_id] = [rounds, item]
+        self._locations[timer_id] = slot
+        return timer_id
+
+    def cancel(self, timer_id: int) -> bool:
+        """
+            Removes a pending timer.
+
+            Args:
+                timer_id (int): The id returned by schedule().
+
+            Returns:
+                bool: True if the timer was pending, False if it already expired or was cancelled.
+        """
+        slot = self._locations.pop(timer_id, None)
+        if slot is None:
+            return False
+        del self._slots[slot][timer_id]
+        return True
+
+    def advance(self) -> List[Any]:
+        """
+            Moves the wheel forward by one tick.
+
+            Returns:
+                List[Any]: The items of all timers that expired on this tick.
+        """
+        self._position = (self._position + 1) % len(self._slots)
+        bucket = self._slots[self._position]
+
+        expired = []
+        for timer_id in list(bucket):
+            entry = bucket[timer_id]
+            if entry[0] > 0:
+                entry[0] -= 1
+                continue
+            del bucket[timer_id]
+            del self._locations[timer_id]
+            expired.append(entry[1])
+        return expired
+
+    def drain(self) -> List[Any]:
+        """
+            Removes all pending timers.
+
+            Returns:
+                List[Any]: The items of all timers that were pending.
+        """
+        items = [entry[1] for bucket in self._slots for entry in bucket.values()]
+        for bucket in self._slots:
+            bucket.clear()
+        self._locations.clear()
+        return items
+
+
+class SecCptScheduler:
+    """
+        Releases solved sec-cpt challenges once their duration has elapsed, without blocking a thread per challenge.
+
+        All registered challenges share a single timer wheel driven by one background thread. Each registration
+        returns a concurrent.futures.Future that resolves to the solved payload when the challenge may be posted.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512):
+        self._wheel = TimerWheel(tick, slots)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._start = time.monotonic()
+        self._ticks = 0
+        self._thread = threading.Thread(target=self._run, name="hyper-sdk-sec-cpt", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def schedule(self, challenge: SecCptChallenge, payload: str,
+                 callback: Optional[Callable[[Future], Any]] = None) -> Future:
+        """
+            Registers a solved challenge to be released once its duration has elapsed.
+
+            Args:
+                challenge (SecCptChallenge): The parsed challenge.
+                payload (str): The solved payload, usually the result of generate_sec_cpt_payload.
+                callback (Callable, optional): Called with the future once it resolves, from the scheduler thread.
+
+            Returns:
+                Future: Resolves to the payload once the challenge may be posted, cancel it to drop the timer.
+        """
+        future: Future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        with self._lock:
+            if self._stopped.is_set():
+                raise RuntimeError("hyper-sdk: Scheduler is closed.")
+            ticks = self._ticks_until(challenge.duration)
+            timer_id = self._wheel.schedule(ticks, (future, payload))
+
+        future.add_done_callback(lambda f: f.cancelled() and self._cancel(timer_id))
+        return future
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._wheel)
+
+    def close(self) -> None:
+        """Stops the scheduler thread and cancels all pending challenges."""
+        self._stopped.set()
+        self._thread.join()
+
+    def _ticks_until(self, duration: float) -> int:
+        deadline = time.monotonic() + duration
+        return math.ceil((deadline - self._start) / self._wheel.tick) - self._ticks
+
+    def _cancel(self, timer_id: int) -> None:
+        with self._lock:
+            self._wheel.cancel(timer_id)
+
+    def _run(self) -> None:
+        tick = self._wheel.tick
+        while not self._stopped.wait(max(0.0, self._start + (self._ticks + 1) * tick - time.monotonic())):
+            with self._lock:
+                expired = []
+                target = int((time.monotonic() - self._start) / tick)
+                while self._ticks < target:
+                    self._ticks += 1
+                    expired.extend(self._wheel.advance())
+
+            for future, payload in expired:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(payload)
+
+        with self._lock:
+            pending = self._wheel.drain()
+        for future, _ in pending:
+            future.cancel()
+
+
+class AsyncSecCptScheduler:
+    """
+        asyncio flavour of SecCptScheduler.
+
+        A single task drives the timer wheel on the running event loop. Each registration returns an asyncio.Future
+        that resolves to the solved payload, awaiting it never blocks the loop.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512):
+        self._wheel = TimerWheel(tick, slots)
+        self._start = 0.0
+        self._ticks = 0
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def schedule(self, challenge: SecCptChallenge, payload: str,
+                 callback: Optional[Callable[[asyncio.Future], Any]] = None) -> asyncio.Future:
+        """
+            Registers a solved challenge to be released once its duration has elapsed.
+
+            Must be called from within the running event loop.
+
+            Args:
+                challenge (SecCptChallenge): The parsed challenge.
+                payload (str): The solved payload, usually the result of generate_sec_cpt_payload.
+                callback (Callable, optional): Called with the future once it resolves.
+
+            Returns:
+                asyncio.Future: Resolves to the payload once the challenge may be posted, cancel it to drop the timer.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None:
+            self._loop = loop
+            self._start = loop.time()
+            self._task = loop.create_task(self._run())
+
+        future = loop.create_future()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        deadline = loop.time() + challenge.duration
+        ticks = math.ceil((deadline - self._start) / self._wheel.tick) - self._ticks
+        timer_id = self._wheel.schedule(ticks, (future, payload))
+        future.add_done_callback(lambda f: f.cancelled() and self._wheel.cancel(timer_id))
+        return future
+
+    def __len__(self) -> int:
+        return len(self._wheel)
+
+    async def close(self) -> None:
+        """Stops the scheduler task and cancels all pending challenges."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._ticks = 0
+
+        for future, _ in self._wheel.drain():
+            future.cancel()
+
+    async def _run(self) -> None:
+        tick = self._wheel.tick
+        while True:
+            await asyncio.sleep(max(0.0, self._start + (self._ticks + 1) * tick - self._loop.time()))
+            target = int((self._loop.time() - self._start) / tick)
+            while self._ticks < target:
+                self._ticks += 1
+                for future, payload in self._wheel.advance():
+                    if not future.done():
+                        future.set_result(payload)
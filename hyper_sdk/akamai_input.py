@@ -1,4 +1,10 @@
-class SensorInput:
+from .wire import WireInput
+
+
+class SensorInput(WireInput):
+    __slots__ = ('abck', 'bmsz', 'version', 'page_url', 'user_agent', 'script', 'script_url', 'context', 'ip',
+                 'accept_language')
+
     def __init__(self, abck: str, bmsz: str, version: str, page_url: str, user_agent: str, ip: str, accept_language: str,
                  context: str, script: str, script_url: str):
         self.abck = abck
@@ -13,7 +19,9 @@ class SensorInput:
         self.accept_language = accept_language
 
 
-class PixelInput:
+class PixelInput(WireInput):
+    __slots__ = ('user_agent', 'html_var', 'script_var', 'accept_language', 'ip')
+
     def __init__(self, user_agent: str, html_var: str, script_var: str, accept_language: str, ip: str):
         self.user_agent = user_agent
         self.html_var = html_var
@@ -22,7 +30,9 @@ class PixelInput:
         self.ip = ip
 
 
-class SbsdInput:
+class SbsdInput(WireInput):
+    __slots__ = ('index', 'user_agent', 'uuid', 'page_url', 'o_cookie', 'script', 'accept_language', 'ip')
+
     def __init__(self, index: int, user_agent: str, uuid: str, page_url: str, o_cookie: str, script: str,
                  accept_language: str, ip: str):
         self.index = index
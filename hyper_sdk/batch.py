@@ -0,0 +1,119 @@
+"""Bounded, streaming batch execution helpers used by the Session classes."""
+
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Union
+import asyncio
+
+
+class BatchResult:
+    """
+    The outcome of a single item of a batch.
+
+    Exactly one of result and error is set, errors are returned per item instead of failing the whole batch.
+    """
+
+    __slots__ = ('index', 'input', 'result', 'error')
+
+    def __init__(self, index: int, input_data: Any, result: Any = None, error: Optional[BaseException] = None) -> None:
+        self.index = index
+        self.input = input_data
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item completed without an error."""
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """
+        Returns the result of the item.
+
+        Returns:
+            Any: The result
+
+        Raises:
+            BaseException: The error of the item if it failed
+        """
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f"BatchResult(index={self.index}, error={self.error!r})"
+        return f"BatchResult(index={self.index}, result={self.result!r})"
+
+
+async def _iterate(inputs: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if hasattr(inputs, '__aiter__'):
+        async for item in inputs:
+            yield item
+    else:
+        for item in inputs:
+            yield item
+
+
+async def _run(func: Callable[[Any], Awaitable[Any]], index: int, input_data: Any) -> BatchResult:
+    try:
+        return BatchResult(index, input_data, result=await func(input_data))
+    except Exception as e:
+        return BatchResult(index, input_data, error=e)
+
+
+async def map_async(func: Callable[[Any], Awaitable[Any]], inputs: Union[Iterable[Any], AsyncIterable[Any]],
+                    concurrency: int = 16, ordered: bool = True) -> AsyncIterator[BatchResult]:
+    """
+    Applies a coroutine function to a stream of inputs with a bounded number of calls in flight.
+
+    Inputs are pulled lazily, so memory stays flat regardless of the input length. With ordered results, completed
+    items are held back until all earlier items have been yielded, and at most 2 * concurrency items are outstanding.
+
+    Args:
+        func (Callable): The coroutine function to call with every input
+        inputs (Iterable or AsyncIterable): The inputs
+        concurrency (int, optional): Maximum number of calls in flight
+        ordered (bool, optional): Whether results are yielded in input order instead of completion order
+
+    Yields:
+        BatchResult: The outcome of every input
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    iterator = _iterate(inputs).__aiter__()
+    window = 2 * concurrency if ordered else concurrency
+    pending = set()
+    buffered: Dict[int, BatchResult] = {}
+    next_index = 0
+    next_yield = 0
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency and next_index - next_yield < window:
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(_run(func, next_index, item)))
+                next_index += 1
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if not ordered:
+                    next_yield += 1
+                    yield result
+                    continue
+                buffered[result.index] = result
+
+            while next_yield in buffered:
+                yield buffered.pop(next_yield)
+                next_yield += 1
+    finally:
+        for task in pending:
+            task.cancel()
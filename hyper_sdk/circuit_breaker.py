@@ -0,0 +1,308 @@
+"""Per-host circuit breaker for the request path of the Session classes."""
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Collection, Deque, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Receives the host, the previous state and the new state.
+CircuitHook = Callable[[str, str, str], None]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker of its host is open."""
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(f"hyper-sdk: Circuit breaker for {host} is open, retry in {retry_after:.1f}s.")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class _Circuit:
+    def __init__(self, window: int) -> None:
+        self.state = CLOSED
+        self.outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self.failures = 0
+        self.slow = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    def add(self, failed: bool, slow: bool) -> None:
+        if len(self.outcomes) == self.outcomes.maxlen:
+            old_failed, old_slow = self.outcomes[0]
+            self.failures -= old_failed
+            self.slow -= old_slow
+        self.outcomes.append((failed, slow))
+        self.failures += failed
+        self.slow += slow
+
+    def reset(self) -> None:
+        self.outcomes.clear()
+        self.failures = 0
+        self.slow = 0
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a product host while it is failing, so a degraded backend does not tie up connections
+    and threads needed for the other products.
+
+    Outcomes are tracked per endpoint host over a window of recent calls. Once at least min_calls outcomes are known
+    and the ratio of failures (transport errors and failure statuses) or slow calls reaches its threshold, the circuit
+    opens and requests fail fast with CircuitOpenError. After open_duration a single probe request is let through
+    (half-open): the circuit closes if it succeeds and opens again otherwise. A breaker is thread-safe and can be
+    shared by sync and async sessions. Hooks run synchronously in the calling thread on every state change.
+    """
+
+    def __init__(self, failure_threshold: float = 0.5, slow_call_duration: Optional[float] = None,
+                 slow_call_threshold: float = 0.8, window: int = 50, min_calls: int = 10,
+                 open_duration: float = 30.0, failure_statuses: Collection[int] = (500, 502, 503, 504),
+                 hooks: Optional[Iterable[CircuitHook]] = None) -> None:
+        """
+        Creates a new CircuitBreaker.
+
+        Args:
+            failure_threshold (float, optional): Ratio of failed calls in the window that opens the circuit
+            slow_call_duration (float, optional): Latency in seconds above which a call counts as slow, latency is
+                ignored if omitted
+            slow_call_threshold (float, optional): Ratio of slow calls in the window that opens the circuit
+            window (int, optional): Number of recent calls considered per host
+            min_calls (int, optional): Number of calls required in the window before the circuit may open
+            open_duration (float, optional): Seconds the circuit stays open before a probe request is allowed
+            failure_statuses (Collection[int], optional): HTTP status codes counted as failures
+            hooks (Iterable[CircuitHook], optional): Called with the host, the old and the new state on every change
+        """
+        if not 0 < failure_threshold <= 1 or not 0 < slow_call_threshold <= 1:
+            raise ValueError("thresholds must be between 0 and 1")
+        if not 1 <= min_calls <= window:
+            raise ValueError("min_calls must be between 1 and window")
+
+        self.failure_threshold = failure_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_threshold = slow_call_threshold
+        self.window = window
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.failure_statuses = frozenset(failure_statuses)
+        self._hooks: List[CircuitHook] = list(hooks or ())
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A copy starts with every circuit closed.
+        return {
+            "failure_threshold": self.failure_threshold,
+            "slow_call_duration": self.slow_call_duration,
+            "slow_call_threshold": self.slow_call_threshold,
+            "window": self.window,
+            "min_calls": self.min_calls,
+            "open_duration": self.open_duration,
+            "failure_statuses": self.failure_statuses,
+            "hooks": self._hooks,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def add_hook(self, hook: CircuitHook) -> None:
+        """
+        Registers a hook that is called on every state change.
+
+        Args:
+            hook (CircuitHook): Called with the host, the old and the new state
+        """
+        self._hooks.append(hook)
+
+    def state(self, host: str) -> str:
+        """
+        Returns the state of the circuit of a host.
+
+        Args:
+            host (str): The hostname, such as "datadome.hypersolutions.co"
+
+        Returns:
+            str: "closed", "open" or "half_open"
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            return CLOSED if circuit is None else circuit.state
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the state, window counts, rejected requests and number of trips of every host.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The statistics keyed by host
+        """
+        with self._lock:
+            return {
+                host: {
+                    "state": circuit.state,
+                    "calls": len(circuit.outcomes),
+                    "failures": circuit.failures,
+                    "slow_calls": circuit.slow,
+                    "rejected": circuit.rejected,
+                    "trips": circuit.trips,
+                }
+                for host, circuit in self._circuits.items()
+            }
+
+    def check(self, url: str) -> None:
+        """
+        Fails fast if a request to the URL would be rejected, without reserving the half-open probe.
+
+        Args:
+            url (str): The endpoint URL
+
+        Raises:
+            CircuitOpenError: If the circuit of the host is open
+        """
+        host = url.split('/', 3)[2]
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.state == CLOSED:
+                return
+            retry_after = self._retry_after(circuit)
+            if retry_after is None:
+                return
+            circuit.rejected += 1
+        raise CircuitOpenError(host, retry_after)
+
+    def call(self, url: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Runs a sync request through the circuit of its host.
+
+        Args:
+            url (str): The endpoint URL
+            send (Callable[[], httpx.Response]): Sends the request
+
+        Returns:
+            httpx.Response: The HTTP response
+
+        Raises:
+            CircuitOpenError: If the circuit of the host is open
+        """
+        host, probe = self._admit(url)
+        started = time.monotonic()
+        try:
+            response = send()
+        except Exception:
+            self._record(host, probe, True, False)
+            raise
+        except BaseException:
+            self._abandon(host, probe)
+            raise
+        self._record_response(host, probe, response, time.monotonic() - started)
+        return response
+
+    async def call_async(self, url: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Runs an async request through the circuit of its host. A cancelled request does not count as an outcome.
+
+        Args:
+            url (str): The endpoint URL
+            send (Callable[[], Awaitable[httpx.Response]]): Sends the request
+
+        Returns:
+            httpx.Response: The HTTP response
+
+        Raises:
+            CircuitOpenError: If the circuit of the host is open
+        """
+        host, probe = self._admit(url)
+        started = time.monotonic()
+        try:
+            response = await send()
+        except Exception:
+            self._record(host, probe, True, False)
+            raise
+        except BaseException:
+            self._abandon(host, probe)
+            raise
+        self._record_response(host, probe, response, time.monotonic() - started)
+        return response
+
+    def _retry_after(self, circuit: _Circuit) -> Optional[float]:
+        # Seconds until a request may pass the circuit, None if one may pass now. Called with the lock held.
+        if circuit.state == OPEN:
+            remaining = circuit.opened_at + self.open_duration - time.monotonic()
+            return remaining if remaining > 0 else None
+        if circuit.state == HALF_OPEN and circuit.probing:
+            return 0.0
+        return None
+
+    def _admit(self, url: str) -> Tuple[str, bool]:
+        host = url.split('/', 3)[2]
+        changed = None
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None:
+                circuit = self._circuits[host] = _Circuit(self.window)
+            if circuit.state == CLOSED:
+                return host, False
+
+            retry_after = self._retry_after(circuit)
+            if retry_after is not None:
+                circuit.rejected += 1
+                raise CircuitOpenError(host, retry_after)
+            if circuit.state == OPEN:
+                circuit.state = HALF_OPEN
+                changed = (OPEN, HALF_OPEN)
+            circuit.probing = True
+
+        if changed is not None:
+            self._notify(host, *changed)
+        return host, True
+
+    def _record_response(self, host: str, probe: bool, response: httpx.Response, latency: float) -> None:
+        failed = response.status_code in self.failure_statuses
+        slow = self.slow_call_duration is not None and latency > self.slow_call_duration
+        self._record(host, probe, failed, slow)
+
+    def _record(self, host: str, probe: bool, failed: bool, slow: bool) -> None:
+        changed = None
+        with self._lock:
+            circuit = self._circuits[host]
+            if probe:
+                circuit.probing = False
+                if failed or slow:
+                    changed = self._open(circuit)
+                else:
+                    circuit.reset()
+                    circuit.state = CLOSED
+                    changed = (HALF_OPEN, CLOSED)
+            elif circuit.state == CLOSED:
+                # Outcomes of requests admitted before the circuit opened are ignored once it is no longer closed.
+                circuit.add(failed, slow)
+                if len(circuit.outcomes) >= self.min_calls and (
+                        circuit.failures >= self.failure_threshold * len(circuit.outcomes) or
+                        circuit.slow >= self.slow_call_threshold * len(circuit.outcomes)):
+                    changed = self._open(circuit)
+
+        if changed is not None:
+            self._notify(host, *changed)
+
+    def _abandon(self, host: str, probe: bool) -> None:
+        if probe:
+            with self._lock:
+                self._circuits[host].probing = False
+
+    def _open(self, circuit: _Circuit) -> Tuple[str, str]:
+        old = circuit.state
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.trips += 1
+        circuit.reset()
+        return old, OPEN
+
+    def _notify(self, host: str, old: str, new: str) -> None:
+        for hook in self._hooks:
+            hook(host, old, new)
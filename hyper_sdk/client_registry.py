@@ -0,0 +1,150 @@
+"""Process-wide registry of pooled HTTP clients and SSL contexts shared by many Session instances."""
+
+from typing import Dict, Optional, Tuple, Union
+import os
+import ssl
+import threading
+
+import certifi
+import httpx
+
+_ssl_lock = threading.Lock()
+_ssl_contexts: Dict[Tuple[Optional[str], Optional[str]], ssl.SSLContext] = {}
+
+
+def ssl_context() -> ssl.SSLContext:
+    """
+    Returns the process-wide SSL context used by the clients of the Session classes.
+
+    Loading the CA bundle is by far the most expensive part of creating a client, so the context is created once per
+    CA location. Like httpx, the SSL_CERT_FILE and SSL_CERT_DIR environment variables take precedence over certifi.
+    The context can also be passed as verify to custom clients.
+
+    Returns:
+        ssl.SSLContext: The shared SSL context
+    """
+    cafile = os.environ.get("SSL_CERT_FILE")
+    capath = os.environ.get("SSL_CERT_DIR")
+    if cafile is None and capath is None:
+        cafile = certifi.where()
+    key = (cafile, capath)
+
+    context = _ssl_contexts.get(key)
+    if context is None:
+        with _ssl_lock:
+            context = _ssl_contexts.get(key)
+            if context is None:
+                context = _ssl_contexts[key] = ssl.create_default_context(cafile=cafile, capath=capath)
+    return context
+
+
+def _limits_key(limits: Optional[httpx.Limits]) -> Optional[Tuple[Optional[int], Optional[int], Optional[float]]]:
+    if limits is None:
+        return None
+    return limits.max_connections, limits.max_keepalive_connections, limits.keepalive_expiry
+
+
+class ClientRegistry:
+    """
+    Reference-counted pool of HTTP clients shared by sessions with the same connection settings.
+
+    Sessions with different credentials can share one client, since credentials are sent as request headers. Every
+    acquire must be paired with a release; the client is closed when its last session releases it, so closing one
+    session never tears down the connections of the others. Sync and async clients are kept apart. In a forked child
+    process the registry starts empty, the clients of the parent are left untouched.
+    """
+
+    def __init__(self) -> None:
+        """Creates a new, empty ClientRegistry."""
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._clients: Dict[tuple, Union[httpx.Client, httpx.AsyncClient]] = {}
+        self._refs: Dict[int, int] = {}
+
+    def acquire(self, http2: bool = False, limits: Optional[httpx.Limits] = None) -> httpx.Client:
+        """
+        Returns the shared sync client for the connection settings, creating it if needed.
+
+        Args:
+            http2 (bool, optional): Whether the client negotiates HTTP/2
+            limits (httpx.Limits, optional): Connection pool limits of the client
+
+        Returns:
+            httpx.Client: The shared client
+        """
+        return self._acquire(("sync", http2, _limits_key(limits)), httpx.Client, http2, limits)
+
+    def acquire_async(self, http2: bool = True, limits: Optional[httpx.Limits] = None) -> httpx.AsyncClient:
+        """
+        Returns the shared async client for the connection settings, creating it if needed.
+
+        Args:
+            http2 (bool, optional): Whether the client negotiates HTTP/2
+            limits (httpx.Limits, optional): Connection pool limits of the client
+
+        Returns:
+            httpx.AsyncClient: The shared client
+        """
+        return self._acquire(("async", http2, _limits_key(limits)), httpx.AsyncClient, http2, limits)
+
+    def release(self, client: httpx.Client) -> None:
+        """
+        Drops a reference to a shared sync client and closes it if it was the last one.
+
+        Args:
+            client (httpx.Client): A client returned by acquire
+        """
+        if self._release(client):
+            client.close()
+
+    async def release_async(self, client: httpx.AsyncClient) -> None:
+        """
+        Drops a reference to a shared async client and closes it if it was the last one.
+
+        Args:
+            client (httpx.AsyncClient): A client returned by acquire_async
+        """
+        if self._release(client):
+            await client.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the number of shared clients and the references held on them.
+
+        Returns:
+            Dict[str, int]: A dictionary containing clients and references
+        """
+        with self._lock:
+            return {"clients": len(self._clients), "references": sum(self._refs.values())}
+
+    def _acquire(self, key: tuple, factory: type, http2: bool, limits: Optional[httpx.Limits]):
+        if self._pid != os.getpid():
+            self.__init__()
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                kwargs = {} if limits is None else {"limits": limits}
+                client = self._clients[key] = factory(http2=http2, verify=ssl_context(), **kwargs)
+                self._refs[id(client)] = 0
+            self._refs[id(client)] += 1
+            return client
+
+    def _release(self, client: Union[httpx.Client, httpx.AsyncClient]) -> bool:
+        if self._pid != os.getpid():
+            self.__init__()
+        with self._lock:
+            refs = self._refs.get(id(client))
+            if refs is None:
+                raise ValueError("client is not managed by this registry")
+            if refs > 1:
+                self._refs[id(client)] = refs - 1
+                return False
+            del self._refs[id(client)]
+            for key, shared in list(self._clients.items()):
+                if shared is client:
+                    del self._clients[key]
+            return True
+
+
+# The registry used by sessions created with shared_client=True.
+default_client_registry = ClientRegistry()
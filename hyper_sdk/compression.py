@@ -0,0 +1,369 @@
+"""Request body compression policy: the algorithm and level used for every payload size class."""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+import gzip
+import sys
+import threading
+import time
+import zlib
+
+from .compression_dictionary import CompressionDictionary, DICTIONARY_ENCODINGS, dictionary_encodings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Payloads up to this many bytes are sent uncompressed by the default policy.
+COMPRESSION_THRESHOLD = 1000
+
+# Content codings in order of preference, the ones whose package is not installed are skipped.
+PREFERRED_ENCODINGS = ("zstd", "br", "gzip")
+
+# Content codings of the default policy. zstd and brotli are opt-in: whether they are installed locally says nothing
+# about whether the API accepts them, and an API that rejects them with anything but 415 would fail every request.
+DEFAULT_ENCODINGS = ("gzip",)
+
+
+def available_encodings() -> List[str]:
+    """
+    Returns the content codings that can be compressed with in this environment.
+
+    Returns:
+        List[str]: The codings in order of preference, gzip is always available
+    """
+    encodings = []
+    for encoding in PREFERRED_ENCODINGS:
+        if encoding == "zstd" and zstandard is None or encoding == "br" and brotli is None:
+            continue
+        encodings.append(encoding)
+    return encodings
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """
+    Compresses data with a content coding.
+
+    Args:
+        data (bytes): The data
+        encoding (str): One of "gzip", "zstd" and "br"
+        level (int): The compression level of the algorithm
+
+    Returns:
+        bytes: The compressed data
+
+    Raises:
+        ValueError: If the coding is unknown or its package is not installed
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=level)
+    raise ValueError(f"hyper-sdk: Content coding {encoding!r} is not available.")
+
+
+class _BrotliCompressor:
+    """Gives brotli's incremental compressor the compress/flush interface of zlib."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def compressor(encoding: str, level: int) -> Any:
+    """
+    Creates an incremental compressor for a content coding.
+
+    Args:
+        encoding (str): One of "gzip", "zstd" and "br"
+        level (int): The compression level of the algorithm
+
+    Returns:
+        Any: An object with the compress(data) and flush() methods of zlib's compression objects
+
+    Raises:
+        ValueError: If the coding is unknown or its package is not installed
+    """
+    if encoding == "gzip":
+        # A window of 31 bits writes the gzip header and trailer.
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=level).compressobj()
+    if encoding == "br" and brotli is not None:
+        return _BrotliCompressor(level)
+    raise ValueError(f"hyper-sdk: Content coding {encoding!r} is not available.")
+
+
+def decompress(data: bytes, encoding: str, dictionaries: Iterable[CompressionDictionary] = ()) -> bytes:
+    """
+    Decompresses data compressed with a content coding.
+
+    Args:
+        data (bytes): The compressed data
+        encoding (str): One of "gzip", "zstd", "br" and "dcz"
+        dictionaries (Iterable[CompressionDictionary], optional): The dictionaries known for the dictionary codings
+
+    Returns:
+        bytes: The decompressed data
+
+    Raises:
+        ValueError: If the coding is unknown, its package is not installed or the dictionary of the data is unknown
+    """
+    if encoding in DICTIONARY_ENCODINGS:
+        for dictionary in dictionaries:
+            if dictionary.matches(data, encoding):
+                return dictionary.decompress(data, encoding)
+        raise ValueError("hyper-sdk: The body was compressed against an unknown dictionary.")
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if encoding == "br" and brotli is not None:
+        return brotli.decompress(data)
+    raise ValueError(f"hyper-sdk: Content coding {encoding!r} is not available.")
+
+
+class SizeClass(NamedTuple):
+    """Payloads smaller than max_size are compressed with the level of the first accepted coding in levels."""
+
+    max_size: int
+    levels: Dict[str, int]
+
+
+# Small bodies are sent as is, mid-size bodies are dominated by the per-call CPU cost and use the fastest levels, and
+# large scripts use the default levels, which save the most bytes per CPU second.
+DEFAULT_SIZE_CLASSES = (
+    SizeClass(COMPRESSION_THRESHOLD + 1, {}),
+    SizeClass(64 * 1024, {"zstd": 1, "br": 1, "gzip": 1}),
+    SizeClass(sys.maxsize, {"zstd": 3, "br": 4, "gzip": 6}),
+)
+
+
+class CompressionPolicy:
+    """
+    Chooses the content coding and level of request bodies by size.
+
+    Bodies are compressed with gzip unless other codings are passed explicitly, such as available_encodings() to
+    prefer zstd and brotli when their packages (zstandard, brotli) are installed. A coding the API answers with 415
+    Unsupported Media Type is not used for that host again, so the policy falls back to gzip, which is always accepted.
+    A policy can be shared by sessions, they then share what was learned about the hosts.
+
+    With a dictionary and zstandard installed, bodies are compressed against it with the dcz coding first, at the zstd
+    level of their size class. It requires the API to know the dictionary, and falls back the same way.
+    """
+
+    def __init__(self, size_classes: Optional[Sequence[SizeClass]] = None,
+                 encodings: Optional[Iterable[str]] = None,
+                 dictionary: Optional[CompressionDictionary] = None) -> None:
+        """
+        Creates a new CompressionPolicy.
+
+        Args:
+            size_classes (Sequence[SizeClass], optional): The size classes, ordered by max_size, bodies larger than the
+                last class are sent uncompressed
+            encodings (Iterable[str], optional): The codings to use in order of preference, gzip if omitted, preceded
+                by the dictionary codings if a dictionary is given
+            dictionary (CompressionDictionary, optional): A preset dictionary known to the API
+
+        Raises:
+            ValueError: If a coding is unknown or its package is not installed
+        """
+        available = available_encodings()
+        defaults = list(DEFAULT_ENCODINGS)
+        if dictionary is not None:
+            available = list(dictionary_encodings()) + available
+            defaults = list(dictionary_encodings()) + defaults
+        self.size_classes = tuple(DEFAULT_SIZE_CLASSES if size_classes is None else size_classes)
+        self.encodings = tuple(defaults if encodings is None else encodings)
+        self.dictionary = dictionary
+        for encoding in self.encodings:
+            if encoding not in available:
+                raise ValueError(f"hyper-sdk: Content coding {encoding!r} is not available.")
+
+        self._lock = threading.Lock()
+        self._rejected: Dict[str, Set[str]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"size_classes": self.size_classes, "encodings": self.encodings, "dictionary": self.dictionary}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def select(self, host: str, size: int) -> Tuple[Optional[str], int]:
+        """
+        Chooses how to compress a body.
+
+        Args:
+            host (str): The host the body is sent to
+            size (int): The size of the body in bytes
+
+        Returns:
+            Tuple[Optional[str], int]: The content coding and level, or None and 0 if the body is sent uncompressed
+        """
+        for size_class in self.size_classes:
+            if size < size_class.max_size:
+                break
+        else:
+            return None, 0
+
+        rejected = self._rejected.get(host, ())
+        for encoding in self.encodings:
+            level = size_class.levels.get(encoding, size_class.levels.get(DICTIONARY_ENCODINGS.get(encoding, "")))
+            if level is not None and encoding not in rejected:
+                return encoding, level
+        return None, 0
+
+    def reject(self, host: str, encoding: str) -> bool:
+        """
+        Records that a host does not accept a content coding.
+
+        Args:
+            host (str): The host
+            encoding (str): The content coding
+
+        Returns:
+            bool: Whether the request should be sent again with another coding, gzip is never rejected
+        """
+        if encoding == "gzip":
+            return False
+        with self._lock:
+            self._rejected.setdefault(host, set()).add(encoding)
+        return True
+
+    def compress(self, host: str, data: bytes) -> Tuple[bytes, Optional[str]]:
+        """
+        Compresses a body as chosen by select.
+
+        Args:
+            host (str): The host the body is sent to
+            data (bytes): The body
+
+        Returns:
+            Tuple[bytes, Optional[str]]: The body and its content coding, None if it is sent uncompressed
+        """
+        encoding, level = self.select(host, len(data))
+        if encoding is None:
+            return data, None
+        return self.encode(data, encoding, level), encoding
+
+    def encode(self, data: bytes, encoding: str, level: int) -> bytes:
+        """
+        Compresses data with a content coding, against the dictionary of the policy for the dictionary codings.
+
+        Args:
+            data (bytes): The data
+            encoding (str): The content coding
+            level (int): The compression level
+
+        Returns:
+            bytes: The compressed data
+
+        Raises:
+            ValueError: If the coding is not available
+        """
+        if encoding in DICTIONARY_ENCODINGS:
+            if self.dictionary is None:
+                raise ValueError(f"hyper-sdk: Content coding {encoding!r} requires a dictionary.")
+            return self.dictionary.compress(data, encoding, level)
+        return compress(data, encoding, level)
+
+    def compressor(self, encoding: str, level: int) -> Any:
+        """
+        Creates an incremental compressor for a content coding, against the dictionary of the policy for the
+        dictionary codings.
+
+        Args:
+            encoding (str): The content coding
+            level (int): The compression level
+
+        Returns:
+            Any: An object with the compress(data) and flush() methods of zlib's compression objects
+
+        Raises:
+            ValueError: If the coding is not available
+        """
+        if encoding in DICTIONARY_ENCODINGS:
+            if self.dictionary is None:
+                raise ValueError(f"hyper-sdk: Content coding {encoding!r} requires a dictionary.")
+            return self.dictionary.compressor(encoding, level)
+        return compressor(encoding, level)
+
+
+def calibrate(samples: Iterable[bytes], bandwidth: float, encodings: Optional[Iterable[str]] = None,
+              levels: Optional[Dict[str, Sequence[int]]] = None, repeat: int = 3,
+              dictionary: Optional[CompressionDictionary] = None) -> CompressionPolicy:
+    """
+    Builds a compression policy from timings of representative request bodies on this machine.
+
+    Every sample gets a size class of its own, reaching halfway (geometrically) to the next larger sample. For every
+    coding, the class uses the level that minimizes the compression time plus the transfer time of the compressed body
+    at the given bandwidth; a coding that does not beat sending the body uncompressed is left out of the class.
+
+    Example:
+        policy = calibrate([sensor_body, script_body], bandwidth=10 * 1024 * 1024 / 8)  # 10 Mbit/s uplink
+        session = Session(api_key, compression_policy=policy)
+
+    Args:
+        samples (Iterable[bytes]): Representative request bodies, such as serialized sensor and script payloads
+        bandwidth (float): The upload bandwidth in bytes per second
+        encodings (Iterable[str], optional): The codings to calibrate, gzip (and the dictionary codings) if omitted
+        levels (Dict[str, Sequence[int]], optional): The levels to try per coding
+        repeat (int, optional): Number of timed compressions per sample and level, the fastest counts
+        dictionary (CompressionDictionary, optional): A preset dictionary known to the API, whose codings are
+            calibrated as well
+
+    Returns:
+        CompressionPolicy: The calibrated policy
+
+    Raises:
+        ValueError: If there are no samples or the bandwidth is not positive
+    """
+    if bandwidth <= 0:
+        raise ValueError("bandwidth must be positive")
+    samples = sorted(samples, key=len)
+    if not samples:
+        raise ValueError("at least one sample is required")
+
+    policy = CompressionPolicy((), encodings, dictionary)
+    candidate_levels = {"gzip": (1, 3, 6, 9), "zstd": (1, 3, 6, 10, 15), "br": (1, 4, 6, 9)}
+    candidate_levels.update({encoding: candidate_levels[base] for encoding, base in DICTIONARY_ENCODINGS.items()})
+    if levels is not None:
+        candidate_levels.update(levels)
+
+    size_classes = []
+    for index, sample in enumerate(samples):
+        raw_cost = len(sample) / bandwidth
+        class_levels = {}
+        for encoding in policy.encodings:
+            best_cost, best_level = raw_cost, None
+            for level in candidate_levels[encoding]:
+                elapsed = float("inf")
+                for _ in range(max(1, repeat)):
+                    start = time.perf_counter()
+                    compressed = policy.encode(sample, encoding, level)
+                    elapsed = min(elapsed, time.perf_counter() - start)
+                cost = elapsed + len(compressed) / bandwidth
+                if cost < best_cost:
+                    best_cost, best_level = cost, level
+            if best_level is not None:
+                class_levels[encoding] = best_level
+
+        if index + 1 < len(samples):
+            max_size = int((max(len(sample), 1) * max(len(samples[index + 1]), 1)) ** 0.5) + 1
+        else:
+            max_size = sys.maxsize
+        size_classes.append(SizeClass(max_size, class_levels))
+
+    return CompressionPolicy(size_classes, policy.encodings, dictionary)
@@ -0,0 +1,226 @@
+"""Preset compression dictionaries for request bodies that carry nearly identical anti-bot scripts."""
+
+from typing import Any, Dict, Iterable, Optional, Union
+import hashlib
+import json
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Header of a dictionary-compressed zstd body (RFC 9842), followed by the SHA-256 of the dictionary.
+DCZ_MAGIC = b'\x5e\x2a\x4d\x18\x20\x00\x00\x00'
+
+# Dictionary codings and the coding whose level they use in a size class. dcz is the zstd coding of RFC 9842.
+DICTIONARY_ENCODINGS = {"dcz": "zstd"}
+
+
+class CompressionDictionary:
+    """
+    A preset dictionary that request bodies are compressed against, so content shared with earlier scripts costs
+    almost nothing to upload.
+
+    The API must know the dictionary, it is identified by its SHA-256 (id) in dcz bodies, which require zstandard.
+    Dictionaries are versioned by their id, save and load keep them with the application.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """
+        Creates a new CompressionDictionary.
+
+        Args:
+            data (bytes): The dictionary, a trained zstd dictionary or raw content
+        """
+        if not data:
+            raise ValueError("dictionary data must not be empty")
+
+        self.data = data
+        self.digest = hashlib.sha256(data).digest()
+        self.id = self.digest.hex()
+        self._lock = threading.Lock()
+        self._zstd_dicts: Dict[Optional[int], Any] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"data": self.data}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def __repr__(self) -> str:
+        return f"CompressionDictionary(id={self.id[:16]}..., size={len(self.data)})"
+
+    @classmethod
+    def load(cls, path: str) -> 'CompressionDictionary':
+        """
+        Reads a dictionary from a file.
+
+        Args:
+            path (str): The file path
+
+        Returns:
+            CompressionDictionary: The dictionary
+        """
+        with open(path, 'rb') as file:
+            return cls(file.read())
+
+    def save(self, path: str) -> None:
+        """
+        Writes the dictionary to a file.
+
+        Args:
+            path (str): The file path
+        """
+        with open(path, 'wb') as file:
+            file.write(self.data)
+
+    def compress(self, data: bytes, encoding: str, level: int) -> bytes:
+        """
+        Compresses data against the dictionary.
+
+        Args:
+            data (bytes): The data
+            encoding (str): "dcz"
+            level (int): The zstd compression level
+
+        Returns:
+            bytes: The compressed data
+
+        Raises:
+            ValueError: If the coding is unknown or its package is not installed
+        """
+        if encoding == "dcz" and zstandard is not None:
+            compressor = zstandard.ZstdCompressor(level=level, dict_data=self._zstd(level))
+            return DCZ_MAGIC + self.digest + compressor.compress(data)
+        raise ValueError(f"hyper-sdk: Content coding {encoding!r} is not available.")
+
+    def compressor(self, encoding: str, level: int) -> Any:
+        """
+        Creates an incremental compressor against the dictionary.
+
+        Args:
+            encoding (str): "dcz"
+            level (int): The zstd compression level
+
+        Returns:
+            Any: An object with the compress(data) and flush() methods of zlib's compression objects
+
+        Raises:
+            ValueError: If the coding is unknown or its package is not installed
+        """
+        if encoding == "dcz" and zstandard is not None:
+            return _DczCompressor(self.digest, zstandard.ZstdCompressor(level=level, dict_data=self._zstd(level)))
+        raise ValueError(f"hyper-sdk: Content coding {encoding!r} is not available.")
+
+    def decompress(self, data: bytes, encoding: str) -> bytes:
+        """
+        Decompresses data compressed against the dictionary.
+
+        Args:
+            data (bytes): The compressed data
+            encoding (str): "dcz"
+
+        Returns:
+            bytes: The decompressed data
+
+        Raises:
+            ValueError: If the data was compressed against another dictionary or the coding is not available
+        """
+        if encoding == "dcz" and zstandard is not None:
+            if not self.matches(data, encoding):
+                raise ValueError("hyper-sdk: The body was compressed against another dictionary.")
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._zstd(None))
+            return decompressor.decompressobj().decompress(data[len(DCZ_MAGIC) + len(self.digest):])
+        raise ValueError(f"hyper-sdk: Content coding {encoding!r} is not available.")
+
+    def matches(self, data: bytes, encoding: str) -> bool:
+        """
+        Returns whether a compressed body refers to this dictionary.
+
+        Args:
+            data (bytes): The compressed body
+            encoding (str): "dcz"
+
+        Returns:
+            bool: Whether the body was compressed against this dictionary
+        """
+        if encoding == "dcz":
+            return data[:len(DCZ_MAGIC)] == DCZ_MAGIC and \
+                data[len(DCZ_MAGIC):len(DCZ_MAGIC) + len(self.digest)] == self.digest
+        return False
+
+    def _zstd(self, level: Optional[int]) -> Any:
+        # A precomputed dictionary is bound to its compression level, so one is kept per level. Precomputing digests
+        # the dictionary once instead of on every compression.
+        with self._lock:
+            zstd_dict = self._zstd_dicts.get(level)
+            if zstd_dict is None:
+                zstd_dict = zstandard.ZstdCompressionDict(self.data)
+                if level is not None:
+                    zstd_dict.precompute_compress(level=level)
+                self._zstd_dicts[level] = zstd_dict
+            return zstd_dict
+
+
+class _DczCompressor:
+    """Incremental dcz compressor, writing the dcz header before the zstd frame."""
+
+    def __init__(self, digest: bytes, compressor: Any) -> None:
+        self._header = DCZ_MAGIC + digest
+        self._compressor = compressor.compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        header, self._header = self._header, b''
+        return header + self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        header, self._header = self._header, b''
+        return header + self._compressor.flush()
+
+
+def dictionary_encodings() -> Iterable[str]:
+    """
+    Returns the dictionary codings that can be compressed with in this environment.
+
+    Returns:
+        Iterable[str]: The codings in order of preference, none if zstandard is not installed
+    """
+    return ("dcz",) if zstandard is not None else ()
+
+
+def train_dictionary(samples: Iterable[Union[str, bytes]], size: int = 256 * 1024) -> CompressionDictionary:
+    """
+    Trains a dictionary from a local corpus of captured scripts or request bodies.
+
+    Scripts are trained on in their JSON-escaped form, as they appear in request bodies. With zstandard installed and a
+    corpus large enough, zstd's dictionary trainer selects the most common content. Otherwise the dictionary is the raw
+    content of the most recent samples, which suits scripts that change little between versions; pass the samples
+    oldest first.
+
+    Example:
+        scripts = [open(path).read() for path in sorted(glob.glob("corpus/*.js"), key=os.path.getmtime)]
+        train_dictionary(scripts).save("scripts.dict")
+
+    Args:
+        samples (Iterable[Union[str, bytes]]): Scripts, or request bodies as bytes
+        size (int, optional): The maximum dictionary size in bytes
+
+    Returns:
+        CompressionDictionary: The trained dictionary
+
+    Raises:
+        ValueError: If there are no samples
+    """
+    fragments = [sample if isinstance(sample, bytes) else json.dumps(sample).encode('utf-8') for sample in samples]
+    fragments = [fragment for fragment in fragments if fragment]
+    if not fragments:
+        raise ValueError("at least one sample is required")
+
+    if zstandard is not None:
+        try:
+            return CompressionDictionary(zstandard.train_dictionary(size, fragments).as_bytes())
+        except zstandard.ZstdError:
+            # The trainer needs many samples, a small corpus is used as raw content instead.
+            pass
+    return CompressionDictionary(b''.join(fragments)[-size:])
@@ -0,0 +1,206 @@
+"""Adaptive (AIMD) concurrency control for the async Session class."""
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+
+class _HostLimit:
+    def __init__(self, limit: float) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.short_latency: Optional[float] = None
+        self.long_latency: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.last_decrease = 0.0
+
+    def wake(self) -> None:
+        while self.waiters and self.in_flight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class AdaptiveConcurrency:
+    """
+    Adjusts the number of requests in flight per product host with additive increase / multiplicative decrease.
+
+    Every successful response grows the limit of its host by increase / limit, so by about increase per round trip. The
+    limit is cut by the decrease factor when a request fails, is throttled with 429 or returns a 5xx, or when the short
+    term latency average rises above the long term baseline by more than the tolerance (a latency gradient below one).
+    Decreases are spaced by at least one baseline round trip so a burst of failures only counts once. Requests above
+    the limit wait in FIFO order. Meant to be used from a single event loop.
+    """
+
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 256, increase: float = 1.0,
+                 decrease: float = 0.7, tolerance: float = 1.5, short_window: int = 10, long_window: int = 200,
+                 history: int = 256) -> None:
+        """
+        Creates a new AdaptiveConcurrency controller.
+
+        Args:
+            initial (int, optional): Initial limit of every host
+            min_limit (int, optional): Lower bound of the limit
+            max_limit (int, optional): Upper bound of the limit
+            increase (float, optional): Additive increase of the limit per round trip
+            decrease (float, optional): Multiplicative decrease factor of the limit
+            tolerance (float, optional): Ratio of short to long term latency above which the limit is decreased
+            short_window (int, optional): Number of samples of the short term latency average
+            long_window (int, optional): Number of samples over which the latency baseline adapts to a regression
+            history (int, optional): Number of limit decisions kept
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial <= max_limit")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.short_window = short_window
+        self.long_window = long_window
+        self._short_alpha = 2.0 / (short_window + 1)
+        self._long_alpha = 2.0 / (long_window + 1)
+        self._hosts: Dict[str, _HostLimit] = {}
+        self._history: Deque[Tuple[float, str, str, int, int]] = deque(maxlen=history)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A copy starts again from the initial limit.
+        return {
+            "initial": self.initial,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "increase": self.increase,
+            "decrease": self.decrease,
+            "tolerance": self.tolerance,
+            "short_window": self.short_window,
+            "long_window": self.long_window,
+            "history": self._history.maxlen,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    async def acquire(self, url: str) -> None:
+        """
+        Waits until the host of the URL is below its limit. Every acquire must be paired with release.
+
+        Args:
+            url (str): The endpoint URL
+        """
+        host = self._host(url)
+        if host.in_flight < int(host.limit) and not host.waiters:
+            host.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        host.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation, pass it on.
+                host.in_flight -= 1
+                host.wake()
+            raise
+
+    def release(self, url: str, status_code: Optional[int] = None, latency: Optional[float] = None,
+                failed: bool = False) -> None:
+        """
+        Frees the slot of a request and adapts the limit of its host to the outcome.
+
+        Args:
+            url (str): The endpoint URL
+            status_code (int, optional): The HTTP status code of the response
+            latency (float, optional): The latency of the request in seconds
+            failed (bool, optional): Whether the request failed without a response, a cancelled request passes
+                neither status_code nor failed and leaves the limit unchanged
+        """
+        name = url.split('/', 3)[2]
+        host = self._host(url)
+        host.in_flight -= 1
+
+        if failed or status_code is not None:
+            host.requests += 1
+        if failed or status_code == 429 or (status_code is not None and status_code >= 500):
+            host.errors += 1
+            self._decrease(name, host, "error" if failed else f"status {status_code}")
+        elif status_code is not None and latency is not None:
+            self._observe(name, host, latency)
+
+        host.wake()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the current limit, requests in flight, queue depth and latency averages of every host.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The statistics keyed by host
+        """
+        return {
+            name: {
+                "limit": int(host.limit),
+                "in_flight": host.in_flight,
+                "queue_depth": len(host.waiters),
+                "short_latency": host.short_latency,
+                "long_latency": host.long_latency,
+                "requests": host.requests,
+                "errors": host.errors,
+            }
+            for name, host in self._hosts.items()
+        }
+
+    def history(self) -> List[Dict[str, Any]]:
+        """
+        Returns the most recent limit decisions.
+
+        Returns:
+            List[Dict[str, Any]]: Decisions with time (monotonic), host, reason and the old and new limit
+        """
+        return [
+            {"time": at, "host": name, "reason": reason, "old_limit": old, "new_limit": new}
+            for at, name, reason, old, new in self._history
+        ]
+
+    def _host(self, url: str) -> _HostLimit:
+        name = url.split('/', 3)[2]
+        host = self._hosts.get(name)
+        if host is None:
+            host = self._hosts[name] = _HostLimit(self.initial)
+        return host
+
+    def _observe(self, name: str, host: _HostLimit, latency: float) -> None:
+        if host.short_latency is None:
+            host.short_latency = host.long_latency = latency
+        else:
+            host.short_latency += self._short_alpha * (latency - host.short_latency)
+            # The baseline follows improvements quickly and regressions slowly, so it approximates the unloaded latency.
+            alpha = self._short_alpha if latency < host.long_latency else self._long_alpha
+            host.long_latency += alpha * (latency - host.long_latency)
+
+        if host.short_latency > host.long_latency * self.tolerance:
+            self._decrease(name, host, "latency")
+            return
+
+        old = int(host.limit)
+        host.limit = min(float(self.max_limit), host.limit + self.increase / host.limit)
+        if int(host.limit) != old:
+            self._history.append((time.monotonic(), name, "increase", old, int(host.limit)))
+
+    def _decrease(self, name: str, host: _HostLimit, reason: str) -> None:
+        now = time.monotonic()
+        if now - host.last_decrease < (host.long_latency or 0.0):
+            return
+        host.last_decrease = now
+
+        old = int(host.limit)
+        host.limit = max(float(self.min_limit), host.limit * self.decrease)
+        if int(host.limit) != old:
+            self._history.append((now, name, reason, old, int(host.limit)))
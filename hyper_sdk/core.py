@@ -0,0 +1,432 @@
+"""
+Sans-IO core shared by the sync and async Session classes.
+
+The core turns inputs into prepared requests and parses responses into results without doing any IO. The sessions
+only send the prepared requests, so every per-call step is implemented once and any transport can drive the core.
+"""
+
+from typing import Any, Callable, Dict, Generator, Optional, Tuple, Union
+import functools
+
+from .serialization import JsonBackend, json_backend as _json_backend
+from .shared import HeaderCache, validate_response
+from .script_cache import ScriptCache, ScriptFragmentCache, default_fragment_cache, is_script_miss
+from .compression import CompressionPolicy
+from .streaming import StreamingBody
+from .wire import WireInput, WireData
+from .results import SensorResult, UtmvcResult, KasadaPayloadResult, TrustDecisionPayloadResult
+from .akamai_input import SensorInput, PixelInput, SbsdInput
+from .incapsula_input import UtmvcInput, ReeseInput
+from .trustdecision_input import PayloadInput, DecodeInput, SignatureInput
+
+
+class PreparedRequest:
+    """A request ready to be posted: the endpoint URL, the headers and the encoded body."""
+
+    __slots__ = ('url', 'headers', 'body')
+
+    def __init__(self, url: str, headers: Dict[str, str], body: Union[bytes, StreamingBody]) -> None:
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self) -> str:
+        body = f"{len(self.body)} bytes" if isinstance(self.body, bytes) else repr(self.body)
+        return f"PreparedRequest(url={self.url!r}, body={body})"
+
+
+class Endpoint:
+    """An API endpoint: its URL, how request data is built from an input and how the result is parsed."""
+
+    __slots__ = ('url', 'build', 'parse')
+
+    def __init__(self, url: str, build: Callable[[Any], Dict[str, Any]],
+                 parse: Callable[[Dict[str, Any]], Any]) -> None:
+        self.url = url
+        self.build = build
+        self.parse = parse
+
+    def request_data(self, input_data: Any) -> Dict[str, Any]:
+        """
+        Returns the request data of an input, cached on the input if it supports it.
+
+        Args:
+            input_data (Any): The input object
+
+        Returns:
+            Dict[str, Any]: The request data, which must not be modified
+        """
+        if isinstance(input_data, WireInput):
+            return input_data.wire(self.build)
+        return self.build(input_data)
+
+
+# Driven by the sessions: yields prepared requests, receives the parsed response data and status code of each.
+RequestFlow = Generator[PreparedRequest, Tuple[Dict[str, Any], int], Any]
+
+
+def _to_dict(input_data: Any) -> Dict[str, Any]:
+    return input_data.to_dict()
+
+
+def _payload(response_data: Dict[str, Any]) -> str:
+    return response_data["payload"]
+
+
+def _payload_with_headers(response_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "payload": response_data["payload"],
+        "headers": response_data["headers"]
+    }
+
+
+def _build_sensor(input_data: SensorInput) -> Dict[str, Any]:
+    return {
+        'userAgent': input_data.user_agent,
+        'abck': input_data.abck,
+        'bmsz': input_data.bmsz,
+        'version': input_data.version,
+        'pageUrl': input_data.page_url,
+        'script': input_data.script,
+        'scriptUrl': input_data.script_url,
+        'context': input_data.context,
+        'ip': input_data.ip,
+        'acceptLanguage': input_data.accept_language,
+    }
+
+
+def _parse_sensor(response_data: Dict[str, Any]) -> SensorResult:
+    return SensorResult(response_data["payload"], response_data.get("context", ""))
+
+
+def _build_sbsd(input_data: SbsdInput) -> Dict[str, Any]:
+    return {
+        'userAgent': input_data.user_agent,
+        'uuid': input_data.uuid,
+        'pageUrl': input_data.page_url,
+        'o': input_data.o_cookie,
+        'script': input_data.script,
+        'acceptLanguage': input_data.accept_language,
+        'ip': input_data.ip,
+        'index': input_data.index,
+    }
+
+
+def _build_pixel(input_data: PixelInput) -> Dict[str, Any]:
+    return {
+        'userAgent': input_data.user_agent,
+        'htmlVar': input_data.html_var,
+        'scriptVar': input_data.script_var,
+        'ip': input_data.ip,
+        'acceptLanguage': input_data.accept_language,
+    }
+
+
+def _build_reese84(input_data: ReeseInput) -> Dict[str, Any]:
+    return {
+        'userAgent': input_data.user_agent,
+        'acceptLanguage': input_data.accept_language,
+        'ip': input_data.ip,
+        'scriptUrl': input_data.script_url,
+        'pageUrl': input_data.pageUrl,
+        'pow': input_data.pow,
+        'script': input_data.script,
+    }
+
+
+def _build_utmvc(input_data: UtmvcInput) -> Dict[str, Any]:
+    return {
+        'userAgent': input_data.user_agent,
+        'sessionIds': input_data.session_ids,
+        'script': input_data.script,
+    }
+
+
+def _parse_utmvc(response_data: Dict[str, Any]) -> UtmvcResult:
+    return UtmvcResult(response_data["payload"], response_data["swhanedl"])
+
+
+def _parse_kasada_payload(response_data: Dict[str, Any]) -> KasadaPayloadResult:
+    return KasadaPayloadResult(response_data["payload"], response_data["headers"])
+
+
+def _build_trustdecision_payload(input_data: PayloadInput) -> Dict[str, Any]:
+    return {
+        'userAgent': input_data.user_agent,
+        'pageUrl': input_data.page_url,
+        'fpUrl': input_data.fp_url,
+        'ip': input_data.ip,
+        'acceptLanguage': input_data.accept_language,
+        'script': input_data.script,
+    }
+
+
+def _parse_trustdecision_payload(response_data: Dict[str, Any]) -> TrustDecisionPayloadResult:
+    return TrustDecisionPayloadResult(response_data["payload"], response_data["timeZone"], response_data["clientId"])
+
+
+def _build_trustdecision_decode(input_data: DecodeInput) -> Dict[str, Any]:
+    return {
+        'result': input_data.result,
+        'requestId': input_data.request_id,
+    }
+
+
+def _build_trustdecision_signature(input_data: SignatureInput) -> Dict[str, Any]:
+    return {
+        'clientId': input_data.client_id,
+        'path': input_data.path,
+    }
+
+
+# Every API endpoint, keyed by the name of the session method calling it.
+ENDPOINTS: Dict[str, Endpoint] = {
+    "generate_sensor_data": Endpoint("https://akm.hypersolutions.co/v2/sensor", _build_sensor, _parse_sensor),
+    "generate_sbsd_data": Endpoint("https://akm.hypersolutions.co/sbsd", _build_sbsd, _payload),
+    "generate_pixel_data": Endpoint("https://akm.hypersolutions.co/pixel", _build_pixel, _payload),
+    "generate_reese84_sensor": Endpoint("https://incapsula.hypersolutions.co/reese84", _build_reese84, _payload),
+    "generate_utmvc_cookie": Endpoint("https://incapsula.hypersolutions.co/utmvc", _build_utmvc, _parse_utmvc),
+    "generate_kasada_pow": Endpoint("https://kasada.hypersolutions.co/cd", _to_dict, _payload),
+    "generate_kasada_payload": Endpoint("https://kasada.hypersolutions.co/payload", _to_dict,
+                                        _parse_kasada_payload),
+    "generate_botid_header": Endpoint("https://kasada.hypersolutions.co/botid", _to_dict, _payload),
+    "generate_interstitial_payload": Endpoint("https://datadome.hypersolutions.co/interstitial", _to_dict,
+                                              _payload_with_headers),
+    "generate_slider_payload": Endpoint("https://datadome.hypersolutions.co/slider", _to_dict,
+                                        _payload_with_headers),
+    "generate_tags_payload": Endpoint("https://datadome.hypersolutions.co/tags", _to_dict, _payload),
+    "generate_trustdecision_payload": Endpoint("https://trustdecision.hypersolutions.co/payload",
+                                               _build_trustdecision_payload, _parse_trustdecision_payload),
+    "decode_trustdecision_session_key": Endpoint("https://trustdecision.hypersolutions.co/decode",
+                                                 _build_trustdecision_decode, _payload),
+    "generate_trustdecision_signature": Endpoint("https://trustdecision.hypersolutions.co/sign",
+                                                 _build_trustdecision_signature, _payload),
+}
+
+
+class SessionCore:
+    """
+    The IO-free part of a session: credentials, request encoding, script hash negotiation and response parsing.
+
+    Session and SessionAsync extend it with a transport. It can also be used on its own to drive any HTTP stack:
+
+    Example:
+        core = SessionCore("your-api-key")
+        flow = core.call_flow("generate_pixel_data", pixel_input)
+        request = next(flow)
+        while True:
+            response = transport.post(request.url, headers=request.headers, content=request.body)
+            try:
+                request = flow.send(core.parse_response(response))
+            except StopIteration as done:
+                pixel_data = done.value
+                break
+    """
+
+    def __init__(self, api_key: str, jwt_key: Optional[str] = None, app_key: Optional[str] = None,
+                 app_secret: Optional[str] = None, compression: bool = True,
+                 header_cache: Optional[HeaderCache] = None, script_cache: Optional[ScriptCache] = None,
+                 fragment_cache: Optional[ScriptFragmentCache] = None,
+                 json_backend: Optional[Union[str, JsonBackend]] = None,
+                 compression_policy: Optional[CompressionPolicy] = None,
+                 stream_threshold: Optional[int] = None) -> None:
+        """
+        Creates a new SessionCore.
+
+        Args:
+            api_key (str): The API key for authentication
+            jwt_key (str, optional): The JWT key for signature generation
+            app_key (str, optional): The application key
+            app_secret (str, optional): The application secret
+            compression (bool, optional): Whether to compress large request bodies
+            header_cache (HeaderCache, optional): Cache of the signed authentication headers
+            script_cache (ScriptCache, optional): Enables referencing uploaded scripts by hash
+            fragment_cache (ScriptFragmentCache, optional): Cache of serialized script fragments, the process-wide
+                default_fragment_cache if omitted
+            json_backend (Union[str, JsonBackend], optional): The JSON backend, or one of "orjson", "msgspec", "json"
+                and "auto", the fastest installed backend is used if omitted
+            compression_policy (CompressionPolicy, optional): Chooses the content coding and level of request bodies
+                by size, the default policy if omitted
+            stream_threshold (int, optional): Length of a script from which its request body is serialized and
+                compressed while it is sent instead of up front, which caps the memory of every request; bodies are
+                never streamed if omitted
+        """
+        self.api_key = api_key
+        self.jwt_key = jwt_key
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.compression = compression
+        self.header_cache = HeaderCache() if header_cache is None else header_cache
+        self.script_cache = script_cache
+        self.fragment_cache = default_fragment_cache if fragment_cache is None else fragment_cache
+        self.json_backend = _json_backend(json_backend)
+        self.compression_policy = CompressionPolicy() if compression_policy is None else compression_policy
+        self.stream_threshold = stream_threshold
+
+    def prepare(self, url: str, input_data: Dict[str, Any]) -> PreparedRequest:
+        """
+        Builds the headers and the encoded body of a request.
+
+        Args:
+            url (str): The endpoint URL
+            input_data (Dict[str, Any]): The request data
+
+        Returns:
+            PreparedRequest: The prepared request
+        """
+        headers = self._build_headers()
+        payload, encoding = self._encode_payload(url, input_data)
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        return PreparedRequest(url, headers, payload)
+
+    def parse_response(self, response: Any) -> Tuple[Dict[str, Any], int]:
+        """
+        Parses a response of any transport.
+
+        The content is expected to be decoded already: httpx and urllib3 undo the content-encoding negotiated through
+        accept-encoding while reading the body, so it is parsed as is, straight from the bytes.
+
+        Args:
+            response (Any): The response, with status_code and decoded content attributes
+
+        Returns:
+            Tuple[Dict[str, Any], int]: The parsed response data and the HTTP status code
+        """
+        if response.status_code == 415:
+            # An unsupported content coding may be rejected by a proxy in front of the API, without a JSON body.
+            return {}, 415
+        return self.json_backend.loads(response.content), response.status_code
+
+    def call_flow(self, name: str, input_data: Any) -> RequestFlow:
+        """
+        Returns the request flow of a generate method, which returns the parsed result.
+
+        Args:
+            name (str): The name of the session method, a key of ENDPOINTS
+            input_data (Any): The input object of the method
+
+        Returns:
+            RequestFlow: The request flow
+        """
+        endpoint = ENDPOINTS[name]
+        response_data = yield from self.request_flow(endpoint.url, endpoint.request_data(input_data))
+        return endpoint.parse(response_data)
+
+    def request_flow(self, url: str, input_data: Dict[str, Any]) -> RequestFlow:
+        """
+        Returns the request flow of raw request data, which returns the validated response data.
+
+        When a script cache is configured, the script of the request data is referenced by its hash once it is known
+        to be stored on the API, and uploaded in full again if the API reports a miss.
+
+        Args:
+            url (str): The endpoint URL
+            input_data (Dict[str, Any]): The request data
+
+        Returns:
+            RequestFlow: The request flow
+        """
+        script = input_data.get('script') if self.script_cache is not None else None
+        if not script:
+            response_data, status_code = yield from self._exchange(url, input_data)
+            validate_response(response_data, status_code)
+            return response_data
+
+        digest = self.script_cache.digest(script)
+        if self.script_cache.is_uploaded(digest):
+            request_data = {key: value for key, value in input_data.items() if key != 'script'}
+            request_data['scriptHash'] = digest
+            response_data, status_code = yield from self._exchange(url, request_data)
+            if not is_script_miss(response_data):
+                validate_response(response_data, status_code)
+                return response_data
+            self.script_cache.forget(digest)
+
+        request_data = dict(input_data)
+        request_data['scriptHash'] = digest
+        response_data, status_code = yield from self._exchange(url, request_data)
+        validate_response(response_data, status_code)
+        self.script_cache.mark_uploaded(digest)
+        return response_data
+
+    def _exchange(self, url: str, request_data: Dict[str, Any]) -> RequestFlow:
+        """
+        Returns the request flow of a single request, sent again with other content codings while the API does not
+        accept the one chosen by the compression policy.
+
+        Args:
+            url (str): The endpoint URL
+            request_data (Dict[str, Any]): The request data
+
+        Returns:
+            RequestFlow: The request flow, which returns the parsed response data and the HTTP status code
+        """
+        while True:
+            request = self.prepare(url, request_data)
+            response_data, status_code = yield request
+            encoding = request.headers.get("content-encoding")
+            # Every rejected coding is excluded from the next choice, so this ends with gzip at the latest.
+            if status_code != 415 or encoding is None or \
+                    not self.compression_policy.reject(url.split('/', 3)[2], encoding):
+                return response_data, status_code
+
+    def _build_headers(self) -> Dict[str, str]:
+        """
+        Builds the headers dictionary including organization credentials if available.
+
+        The signed tokens are reused from the session's header cache until shortly before they expire.
+
+        Returns:
+            Dict[str, str]: Headers dictionary with all required authentication headers
+        """
+        return self.header_cache.get(self.api_key, self.jwt_key, self.app_key, self.app_secret, self.compression)
+
+    def _encode_payload(self, url: str,
+                        input_data: Dict[str, Any]) -> Tuple[Union[bytes, StreamingBody], Optional[str]]:
+        """
+        Serializes the request data and compresses it as chosen by the compression policy.
+
+        Scripts are serialized through the fragment cache so they are only escaped once. gzip compressed script bodies
+        reuse the cached compressed script if the fragment cache is configured to. Bodies of scripts longer than the
+        stream threshold are streamed instead.
+
+        Args:
+            url (str): The endpoint URL
+            input_data (Dict[str, Any]): The request data
+
+        Returns:
+            Tuple[Union[bytes, StreamingBody], Optional[str]]: The request body and its content coding, None if it is
+                not compressed
+        """
+        script = input_data.get('script')
+        has_script = isinstance(script, str) and bool(script)
+        if has_script and self.stream_threshold is not None and len(script) >= self.stream_threshold:
+            encoding, level = None, 0
+            if self.compression:
+                encoding, level = self.compression_policy.select(url.split('/', 3)[2], len(script))
+            compressor = None if encoding is None else functools.partial(self.compression_policy.compressor,
+                                                                         encoding, level)
+            return self.fragment_cache.encode_stream(input_data, self.json_backend, compressor), encoding
+        if has_script:
+            payload, _ = self.fragment_cache.encode(input_data, False, self.json_backend)
+        elif isinstance(input_data, WireData):
+            payload = input_data.fields_json(self.json_backend)
+        else:
+            payload = self.json_backend.dumps(input_data)
+        if not self.compression:
+            return payload, None
+
+        host = url.split('/', 3)[2]
+        encoding, level = self.compression_policy.select(host, len(payload))
+        if encoding is None:
+            return payload, None
+        if encoding == "gzip" and has_script and self.fragment_cache.reuse_compressed:
+            body, compressed = self.fragment_cache.encode(input_data, True, self.json_backend)
+            if compressed:
+                return body, encoding
+        try:
+            return self.compression_policy.encode(payload, encoding, level), encoding
+        except Exception:
+            # Fall back to uncompressed if compression fails
+            return payload, None
@@ -1,6 +1,7 @@
-import json
 from urllib.parse import urlencode
 
+from ..serialization import default_json_backend
+
 
 def parse_slider_device_check_link(src: str, datadome_cookie: str, referer: str) -> str:
     """
@@ -24,7 +25,7 @@ def parse_slider_device_check_link(src: str, datadome_cookie: str, referer: str)
     try:
         dd_object = src.split("var dd=")[1].split("</script>")[0]
         dd_object = dd_object.replace("'", '"')
-        dd_object_parsed = json.loads(dd_object)
+        dd_object_parsed = default_json_backend.loads(dd_object)
     except Exception as _:
         raise RuntimeError("Failed to parse dd object.")
 
@@ -66,7 +67,7 @@ def parse_interstitial_device_check_link(src: str, datadome_cookie: str, referer
     try:
         dd_object = src.split("var dd=")[1].split("</script>")[0]
         dd_object = dd_object.replace("'", '"')
-        dd_object_parsed = json.loads(dd_object)
+        dd_object_parsed = default_json_backend.loads(dd_object)
     except Exception as _:
         raise RuntimeError("Failed to parse dd object.")
 
@@ -1,5 +1,9 @@
+from .wire import WireInput
+
+
+class DataDomeSliderInput(WireInput):
+    __slots__ = ('user_agent', 'device_link', 'html', 'puzzle', 'piece', 'parent_url', 'accept_language', 'ip')
 
-class DataDomeSliderInput:
     def __init__(self, user_agent: str, device_link: str, html: str, puzzle: str, piece: str, parent_url: str, accept_language: str, ip: str):
         # UserAgent must be a Chrome Windows User-Agent.
         self.user_agent = user_agent
@@ -38,7 +42,9 @@ class DataDomeSliderInput:
         }
 
 
-class DataDomeInterstitialInput:
+class DataDomeInterstitialInput(WireInput):
+    __slots__ = ('user_agent', 'device_link', 'html', 'accept_language', 'ip')
+
     def __init__(self, user_agent: str, device_link: str, html: str, accept_language: str, ip: str):
         # UserAgent must be a Chrome Windows User-Agent.
         self.user_agent = user_agent
@@ -63,7 +69,9 @@ class DataDomeInterstitialInput:
         }
 
 
-class DataDomeTagsInput:
+class DataDomeTagsInput(WireInput):
+    __slots__ = ('user_agent', 'cid', 'ddk', 'referer', 'tags_type', 'version', 'accept_language', 'ip')
+
     def __init__(self, user_agent: str, ddk: str, referer: str, tags_type: str, version: str, accept_language: str, ip: str, cid: str = ""):
         self.user_agent = user_agent
         self.cid = cid
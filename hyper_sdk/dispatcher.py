@@ -0,0 +1,258 @@
+"""Priority-aware request dispatching for the async Session class."""
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Mapping, Optional
+import asyncio
+import math
+import time
+
+PRIORITY_CRITICAL = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_CRITICAL: "critical",
+    PRIORITY_NORMAL: "normal",
+    PRIORITY_BULK: "bulk",
+}
+
+# Small calls on the user-facing critical path, and large uploads that usually run in the background.
+DEFAULT_PRIORITIES = {
+    "https://kasada.hypersolutions.co/cd": PRIORITY_CRITICAL,
+    "https://trustdecision.hypersolutions.co/sign": PRIORITY_CRITICAL,
+    "https://trustdecision.hypersolutions.co/decode": PRIORITY_CRITICAL,
+    "https://akm.hypersolutions.co/v2/sensor": PRIORITY_BULK,
+    "https://kasada.hypersolutions.co/payload": PRIORITY_BULK,
+}
+
+_current_priority: ContextVar[Optional[int]] = ContextVar("hyper_sdk_priority", default=None)
+
+
+@contextmanager
+def priority(value: int) -> Iterator[None]:
+    """
+    Context manager that assigns a priority class to every request sent within it, including from tasks created
+    within it.
+
+    Example:
+        with priority(PRIORITY_CRITICAL):
+            signature = await session.generate_trustdecision_signature(signature_input)
+
+    Args:
+        value (int): The priority class, lower values are served first
+    """
+    token = _current_priority.set(value)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def with_priority(func: Callable[..., Awaitable[Any]], value: int) -> Callable[..., Awaitable[Any]]:
+    """
+    Wraps a coroutine function so every request it sends carries a priority class.
+
+    Args:
+        func (Callable[..., Awaitable[Any]]): The coroutine function, such as a bound generate method
+        value (int): The priority class
+
+    Returns:
+        Callable[..., Awaitable[Any]]: The wrapped coroutine function
+    """
+    async def call(*args: Any, **kwargs: Any) -> Any:
+        with priority(value):
+            return await func(*args, **kwargs)
+
+    return call
+
+
+class _Class:
+    def __init__(self, window: int) -> None:
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.in_flight = 0
+        self.dispatched = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits: Deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float) -> None:
+        self.dispatched += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.waits.append(wait)
+
+
+class PriorityDispatcher:
+    """
+    Shares a number of request slots between priority classes.
+
+    Waiting requests are dispatched strictly by class (lower values first) and in FIFO order within a class, so
+    critical calls jump the queue of pending bulk requests. Reserved slots can only be taken by their class and the
+    classes above it, so lower classes can never occupy every slot and delay a critical call by more than one free
+    slot. The wait of every dispatched request is recorded per class. Meant to be used from a single event loop.
+    """
+
+    def __init__(self, max_concurrency: int = 32, reserved: Optional[Mapping[int, int]] = None,
+                 priorities: Optional[Mapping[str, int]] = None, default_priority: int = PRIORITY_NORMAL,
+                 window: int = 1024) -> None:
+        """
+        Creates a new PriorityDispatcher.
+
+        Args:
+            max_concurrency (int, optional): Total number of requests in flight
+            reserved (Mapping[int, int], optional): Slots reserved per priority class, defaults to a quarter of the
+                slots for PRIORITY_CRITICAL
+            priorities (Mapping[str, int], optional): Priority class per endpoint URL, defaults to DEFAULT_PRIORITIES
+            default_priority (int, optional): Priority class of endpoints without an explicit class
+            window (int, optional): Number of recent waits kept per class for the percentiles
+        """
+        if reserved is None:
+            reserved = {PRIORITY_CRITICAL: max(1, max_concurrency // 4)}
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if sum(reserved.values()) >= max_concurrency:
+            raise ValueError("reserved slots must leave at least one shared slot")
+
+        self.max_concurrency = max_concurrency
+        self.reserved = dict(reserved)
+        self.priorities = dict(DEFAULT_PRIORITIES if priorities is None else priorities)
+        self.default_priority = default_priority
+        self.window = window
+        self.in_flight = 0
+        self._classes: Dict[int, _Class] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "reserved": self.reserved,
+            "priorities": self.priorities,
+            "default_priority": self.default_priority,
+            "window": self.window,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def priority_of(self, url: str) -> int:
+        """
+        Returns the priority class of a request, set with priority() or derived from its endpoint.
+
+        Args:
+            url (str): The endpoint URL
+
+        Returns:
+            int: The priority class
+        """
+        value = _current_priority.get()
+        if value is not None:
+            return value
+        return self.priorities.get(url, self.default_priority)
+
+    def limit(self, value: int) -> int:
+        """
+        Returns the number of slots a priority class may use, all slots minus those reserved for higher classes.
+
+        Args:
+            value (int): The priority class
+
+        Returns:
+            int: The number of usable slots
+        """
+        return self.max_concurrency - sum(count for cls, count in self.reserved.items() if cls < value)
+
+    async def acquire(self, url: str) -> int:
+        """
+        Waits for a request slot. Every acquire must be paired with release.
+
+        Args:
+            url (str): The endpoint URL
+
+        Returns:
+            int: The priority class the slot was granted to, to be passed to release
+        """
+        value = self.priority_of(url)
+        cls = self._class(value)
+        if not self._higher_waiting(value) and not cls.waiters and self.in_flight < self.limit(value):
+            self._enter(cls)
+            cls.record(0.0)
+            return value
+
+        waiter = asyncio.get_running_loop().create_future()
+        cls.waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation, pass it on.
+                self.release(value)
+            elif waiter in cls.waiters:
+                cls.waiters.remove(waiter)
+            raise
+        cls.record(time.monotonic() - started)
+        return value
+
+    def release(self, value: int) -> None:
+        """
+        Frees a request slot and dispatches the next waiting requests.
+
+        Args:
+            value (int): The priority class returned by acquire
+        """
+        self.in_flight -= 1
+        self._classes[value].in_flight -= 1
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the queue depth, requests in flight and queue wait times of every priority class.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The statistics keyed by class name, waits are in seconds
+        """
+        result = {}
+        for value in sorted(self._classes):
+            cls = self._classes[value]
+            waits = sorted(cls.waits)
+            result[PRIORITY_NAMES.get(value, str(value))] = {
+                "queued": len(cls.waiters),
+                "in_flight": cls.in_flight,
+                "dispatched": cls.dispatched,
+                "mean_wait": cls.total_wait / cls.dispatched if cls.dispatched else 0.0,
+                "p95_wait": _percentile(waits, 0.95),
+                "max_wait": cls.max_wait,
+            }
+        return result
+
+    def _class(self, value: int) -> _Class:
+        cls = self._classes.get(value)
+        if cls is None:
+            cls = self._classes[value] = _Class(self.window)
+        return cls
+
+    def _higher_waiting(self, value: int) -> bool:
+        return any(cls.waiters for other, cls in self._classes.items() if other < value)
+
+    def _enter(self, cls: _Class) -> None:
+        self.in_flight += 1
+        cls.in_flight += 1
+
+    def _dispatch(self) -> None:
+        for value in sorted(self._classes):
+            cls = self._classes[value]
+            while cls.waiters:
+                if self.in_flight >= self.limit(value):
+                    # Lower classes may only use fewer slots, none of them can be dispatched either.
+                    return
+                waiter = cls.waiters.popleft()
+                if not waiter.done():
+                    self._enter(cls)
+                    waiter.set_result(None)
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, math.ceil(percentile * len(ordered)) - 1)]
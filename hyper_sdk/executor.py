@@ -0,0 +1,193 @@
+"""Thread-pool executor facade for the sync Session class."""
+
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union, TYPE_CHECKING
+import collections
+import os
+
+from .results import SensorResult, UtmvcResult, KasadaPayloadResult, TrustDecisionPayloadResult
+from .batch import BatchResult
+from .akamai_input import SensorInput, PixelInput, SbsdInput
+from .kasada_input import KasadaPowInput, KasadaPayloadInput, BotIDHeaderInput
+from .datadome_input import DataDomeSliderInput, DataDomeInterstitialInput, DataDomeTagsInput
+from .incapsula_input import UtmvcInput, ReeseInput
+from .trustdecision_input import PayloadInput, DecodeInput, SignatureInput
+
+if TYPE_CHECKING:
+    from .session import Session
+
+
+class SessionExecutor:
+    """
+    Runs the generate methods of a sync Session on a pool of worker threads.
+
+    All workers share the session's httpx connection pool and its cached signed headers. Serialization and gzip
+    compression (which releases the GIL) of one request run while other workers wait on network I/O, so preparing the
+    next request overlaps with sending the current one. Closing the executor does not close the session.
+    """
+
+    def __init__(self, session: 'Session', max_workers: Optional[int] = None) -> None:
+        """
+        Creates a new SessionExecutor, usually through Session.executor().
+
+        Args:
+            session (Session): The session to run the requests with
+            max_workers (int, optional): Number of worker threads, defaults to the ThreadPoolExecutor default of
+                min(32, cpu_count + 4)
+        """
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self.session = session
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hyper-sdk")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the worker threads.
+
+        Args:
+            wait (bool, optional): Whether to wait for the submitted requests to complete
+        """
+        self._pool.shutdown(wait=wait)
+
+    def submit(self, method: Union[str, Callable[[Any], Any]], input_data: Any) -> Future:
+        """
+        Submits a call of a session method.
+
+        Args:
+            method (Union[str, Callable]): The method to call, either bound or by name such as "generate_pixel_data"
+            input_data (Any): The input object
+
+        Returns:
+            Future: The future of the call's result
+        """
+        if isinstance(method, str):
+            method = getattr(self.session, method)
+        return self._pool.submit(method, input_data)
+
+    def submit_sensor_data(self, input_data: SensorInput) -> 'Future[SensorResult]':
+        """Submits Session.generate_sensor_data, see its documentation for the result."""
+        return self.submit(self.session.generate_sensor_data, input_data)
+
+    def submit_sbsd_data(self, input_data: SbsdInput) -> 'Future[str]':
+        """Submits Session.generate_sbsd_data, see its documentation for the result."""
+        return self.submit(self.session.generate_sbsd_data, input_data)
+
+    def submit_pixel_data(self, input_data: PixelInput) -> 'Future[str]':
+        """Submits Session.generate_pixel_data, see its documentation for the result."""
+        return self.submit(self.session.generate_pixel_data, input_data)
+
+    def submit_reese84_sensor(self, input_data: ReeseInput) -> 'Future[str]':
+        """Submits Session.generate_reese84_sensor, see its documentation for the result."""
+        return self.submit(self.session.generate_reese84_sensor, input_data)
+
+    def submit_utmvc_cookie(self, input_data: UtmvcInput) -> 'Future[UtmvcResult]':
+        """Submits Session.generate_utmvc_cookie, see its documentation for the result."""
+        return self.submit(self.session.generate_utmvc_cookie, input_data)
+
+    def submit_kasada_pow(self, input_data: KasadaPowInput) -> 'Future[str]':
+        """Submits Session.generate_kasada_pow, see its documentation for the result."""
+        return self.submit(self.session.generate_kasada_pow, input_data)
+
+    def submit_kasada_payload(self, input_data: KasadaPayloadInput) -> 'Future[KasadaPayloadResult]':
+        """Submits Session.generate_kasada_payload, see its documentation for the result."""
+        return self.submit(self.session.generate_kasada_payload, input_data)
+
+    def submit_botid_header(self, input_data: BotIDHeaderInput) -> 'Future[str]':
+        """Submits Session.generate_botid_header, see its documentation for the result."""
+        return self.submit(self.session.generate_botid_header, input_data)
+
+    def submit_interstitial_payload(self, input_data: DataDomeInterstitialInput) -> 'Future[Dict[str, Any]]':
+        """Submits Session.generate_interstitial_payload, see its documentation for the result."""
+        return self.submit(self.session.generate_interstitial_payload, input_data)
+
+    def submit_slider_payload(self, input_data: DataDomeSliderInput) -> 'Future[Dict[str, Any]]':
+        """Submits Session.generate_slider_payload, see its documentation for the result."""
+        return self.submit(self.session.generate_slider_payload, input_data)
+
+    def submit_tags_payload(self, input_data: DataDomeTagsInput) -> 'Future[str]':
+        """Submits Session.generate_tags_payload, see its documentation for the result."""
+        return self.submit(self.session.generate_tags_payload, input_data)
+
+    def submit_trustdecision_payload(self, input_data: PayloadInput) -> 'Future[TrustDecisionPayloadResult]':
+        """Submits Session.generate_trustdecision_payload, see its documentation for the result."""
+        return self.submit(self.session.generate_trustdecision_payload, input_data)
+
+    def submit_trustdecision_session_key(self, input_data: DecodeInput) -> 'Future[str]':
+        """Submits Session.decode_trustdecision_session_key, see its documentation for the result."""
+        return self.submit(self.session.decode_trustdecision_session_key, input_data)
+
+    def submit_trustdecision_signature(self, input_data: SignatureInput) -> 'Future[str]':
+        """Submits Session.generate_trustdecision_signature, see its documentation for the result."""
+        return self.submit(self.session.generate_trustdecision_signature, input_data)
+
+    def map(self, method: Union[str, Callable[[Any], Any]], inputs: Iterable[Any], ordered: bool = True,
+            max_pending: Optional[int] = None) -> Iterator[BatchResult]:
+        """
+        Calls a session method for every input and yields the outcome of each call.
+
+        Inputs are pulled lazily and at most max_pending calls are submitted at a time, so long inputs are processed
+        with flat memory. A failing item yields a BatchResult carrying the error instead of failing the whole batch.
+
+        Args:
+            method (Union[str, Callable]): The method to call, either bound or by name such as "generate_pixel_data"
+            inputs (Iterable[Any]): The input objects
+            ordered (bool, optional): Whether results are yielded in input order instead of completion order
+            max_pending (int, optional): Maximum number of submitted calls, defaults to twice the number of workers
+
+        Returns:
+            Iterator[BatchResult]: The result of every input
+        """
+        if isinstance(method, str):
+            method = getattr(self.session, method)
+        if max_pending is None:
+            max_pending = 2 * self.max_workers
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        return self._map(method, inputs, ordered, max_pending)
+
+    def _map(self, method: Callable[[Any], Any], inputs: Iterable[Any], ordered: bool,
+             max_pending: int) -> Iterator[BatchResult]:
+        pending: 'collections.OrderedDict[Future, Tuple[int, Any]]' = collections.OrderedDict()
+        iterator = iter(inputs)
+        index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[self._pool.submit(method, item)] = (index, item)
+                    index += 1
+
+                if not pending:
+                    return
+
+                if ordered:
+                    future = next(iter(pending))
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(iter(done))
+                item_index, item = pending.pop(future)
+                yield _to_batch_result(future, item_index, item)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _to_batch_result(future: Future, index: int, item: Any) -> BatchResult:
+    # Blocks until the call has completed.
+    error = future.exception()
+    if error is not None:
+        return BatchResult(index, item, error=error)
+    return BatchResult(index, item, result=future.result())
@@ -0,0 +1,264 @@
+"""Hedged requests for latency-critical endpoints of the Session classes."""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Collection, Deque, Dict, Optional
+import asyncio
+import math
+import threading
+import time
+
+import httpx
+
+# Small, latency-critical endpoints that are hedged by default.
+DEFAULT_HEDGED_ENDPOINTS = (
+    "https://kasada.hypersolutions.co/cd",
+    "https://trustdecision.hypersolutions.co/sign",
+    "https://trustdecision.hypersolutions.co/decode",
+)
+
+
+class HedgePolicy:
+    """
+    Sends a duplicate request when a call is slower than usual and uses whichever response arrives first.
+
+    The hedge is sent once a call has been pending for the hedge delay: a fixed delay, or the given percentile of the
+    recently observed latencies of the endpoint once enough samples have been collected. The ratio of hedged calls is
+    capped by max_ratio so hedging cannot multiply the load under a general slowdown. The losing request is cancelled,
+    or for sync sessions abandoned and closed once it completes, since a running sync request cannot be interrupted.
+
+    Sync calls never wait for the hedge threads: a call uses a thread for its primary request and another for its hedge
+    only while one is free, and otherwise runs the request on the caller's thread without hedging it. At most
+    max_workers requests are therefore hedgeable at once, all other calls proceed as if hedging were off.
+    """
+
+    def __init__(self, endpoints: Optional[Collection[str]] = DEFAULT_HEDGED_ENDPOINTS, delay: Optional[float] = None,
+                 percentile: float = 0.95, max_ratio: float = 0.1, min_samples: int = 20, window: int = 256,
+                 max_workers: int = 16) -> None:
+        """
+        Creates a new HedgePolicy.
+
+        Args:
+            endpoints (Collection[str], optional): Endpoint URLs to hedge, None hedges every endpoint
+            delay (float, optional): Fixed hedge delay in seconds, also used until enough latencies are learned
+            percentile (float, optional): Latency percentile used as learned hedge delay
+            max_ratio (float, optional): Maximum ratio of calls that may send a hedge
+            min_samples (int, optional): Number of latencies to observe before the learned delay is used
+            window (int, optional): Number of recent latencies kept per endpoint
+            max_workers (int, optional): Number of threads used to run hedged sync requests, calls beyond it are not
+                hedged
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if not 0 <= max_ratio <= 1:
+            raise ValueError("max_ratio must be between 0 and 1")
+
+        self.endpoints = None if endpoints is None else frozenset(endpoints)
+        self.delay = delay
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.window = window
+        self.max_workers = max_workers
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._free_workers = threading.Semaphore(max_workers)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Learned latencies and the thread pool are not pickled.
+        return {
+            "endpoints": self.endpoints,
+            "delay": self.delay,
+            "percentile": self.percentile,
+            "max_ratio": self.max_ratio,
+            "min_samples": self.min_samples,
+            "window": self.window,
+            "max_workers": self.max_workers,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def applies(self, url: str) -> bool:
+        """
+        Checks whether calls to an endpoint are hedged.
+
+        Args:
+            url (str): The endpoint URL
+
+        Returns:
+            bool: True if the endpoint is hedged
+        """
+        return self.endpoints is None or url in self.endpoints
+
+    def hedge_delay(self, url: str) -> Optional[float]:
+        """
+        Returns the delay after which a call to an endpoint is hedged.
+
+        Args:
+            url (str): The endpoint URL
+
+        Returns:
+            Optional[float]: The delay in seconds, or None if no delay is known yet
+        """
+        with self._lock:
+            latencies = self._latencies.get(url)
+            if latencies is None or len(latencies) < self.min_samples:
+                return self.delay
+            ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns how often hedges were sent and won.
+
+        Returns:
+            Dict[str, int]: A dictionary containing calls, hedges and hedge_wins
+        """
+        with self._lock:
+            return {"calls": self.calls, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+    def close(self) -> None:
+        """Stops the threads used for hedged sync requests."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def call(self, url: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Runs a sync request, hedging it if it is slow.
+
+        Args:
+            url (str): The endpoint URL
+            send (Callable[[], httpx.Response]): Sends the request
+
+        Returns:
+            httpx.Response: The first successful response
+        """
+        delay = self._start_call(url)
+        if delay is None or not self._free_workers.acquire(blocking=False):
+            return self._timed(url, send)
+
+        pool = self._executor()
+        primary = self._submit(pool, url, send)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._free_workers.acquire(blocking=False):
+            return primary.result()
+        if not self._allow_hedge():
+            self._free_workers.release()
+            return primary.result()
+
+        hedge = self._submit(pool, url, send)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                if future is hedge:
+                    self._count_win()
+                for loser in pending:
+                    if not loser.cancel():
+                        loser.add_done_callback(_close_response)
+                return future.result()
+        raise error
+
+    async def call_async(self, url: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Runs an async request, hedging it if it is slow.
+
+        Args:
+            url (str): The endpoint URL
+            send (Callable[[], Awaitable[httpx.Response]]): Sends the request
+
+        Returns:
+            httpx.Response: The first successful response
+        """
+        delay = self._start_call(url)
+        if delay is None:
+            return await self._timed_async(url, send)
+
+        primary = asyncio.ensure_future(self._timed_async(url, send))
+        try:
+            done, _ = await asyncio.wait([primary], timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done or not self._allow_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(self._timed_async(url, send))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    if task is hedge:
+                        self._count_win()
+                    return task.result()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _start_call(self, url: str) -> Optional[float]:
+        with self._lock:
+            self.calls += 1
+        return self.hedge_delay(url)
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.max_ratio * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def _count_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def _record(self, url: str, latency: float) -> None:
+        with self._lock:
+            latencies = self._latencies.get(url)
+            if latencies is None:
+                latencies = self._latencies[url] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def _timed(self, url: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+        start = time.monotonic()
+        response = send()
+        self._record(url, time.monotonic() - start)
+        return response
+
+    async def _timed_async(self, url: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        start = time.monotonic()
+        response = await send()
+        self._record(url, time.monotonic() - start)
+        return response
+
+    def _submit(self, pool: ThreadPoolExecutor, url: str, send: Callable[[], httpx.Response]) -> Future:
+        # The caller has taken a free worker, which is handed back once the request completes.
+        future = pool.submit(self._timed, url, send)
+        future.add_done_callback(lambda _: self._free_workers.release())
+        return future
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hyper-sdk-hedge")
+            return self._pool
+
+
+def _close_response(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
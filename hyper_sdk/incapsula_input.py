@@ -1,13 +1,19 @@
 from typing import List
 
+from .wire import WireInput
+
+
+class UtmvcInput(WireInput):
+    __slots__ = ('user_agent', 'session_ids', 'script')
 
-class UtmvcInput:
     def __init__(self, user_agent: str, session_ids: List[str], script: str):
         self.user_agent = user_agent
         self.session_ids = session_ids
         self.script = script
 
-class ReeseInput:
+class ReeseInput(WireInput):
+    __slots__ = ('user_agent', 'accept_language', 'ip', 'script_url', 'pow', 'script', 'pageUrl')
+
     def __init__(self, user_agent: str, accept_language: str, ip: str, pageUrl: str, script: str, script_url: str, pow: str = ""):
         self.user_agent = user_agent
         self.accept_language = accept_language
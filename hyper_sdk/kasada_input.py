@@ -1,4 +1,9 @@
-class KasadaPowInput:
+from .wire import WireInput
+
+
+class KasadaPowInput(WireInput):
+    __slots__ = ('st', 'ct', 'fc', 'work_time', 'domain')
+
     def __init__(self, st: int, ct: str, domain: str, fc: str = "", work_time: int = None):
         # St is the x-kpsdk-st value returned by the /tl POST request
         self.st = st
@@ -19,7 +24,9 @@ class KasadaPowInput:
         return result
 
 
-class KasadaPayloadInput:
+class KasadaPayloadInput(WireInput):
+    __slots__ = ('user_agent', 'ips_link', 'script', 'accept_language', 'ip')
+
     def __init__(self, user_agent: str, ips_link: str, script: str, accept_language: str, ip: str):
         # UserAgent must be a Chrome Windows User-Agent.
         self.user_agent = user_agent
@@ -44,7 +51,9 @@ class KasadaPayloadInput:
         }
         return result
 
-class BotIDHeaderInput:
+class BotIDHeaderInput(WireInput):
+    __slots__ = ('script', 'user_agent', 'ip', 'accept_language')
+
     def __init__(self, script: str, user_agent: str, ip: str, accept_language: str):
         # Script is the c.js script retrieved from the BotID script endpoint
         self.script = script
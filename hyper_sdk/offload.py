@@ -0,0 +1,131 @@
+"""Moves CPU-heavy request work off the event loop and measures the event loop lag."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+import asyncio
+import collections
+import os
+import threading
+
+# Requests whose input or response is at least this many bytes are prepared and parsed off the event loop.
+OFFLOAD_THRESHOLD = 64 * 1024
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def offload_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool shared by all sessions for serialization and compression work.
+
+    The pool is dedicated to this work, so it does not compete with other users of the event loop's default executor.
+    gzip and zlib release the GIL while compressing, so the event loop keeps running. A new pool is created in a
+    forked child process.
+
+    Returns:
+        ThreadPoolExecutor: The pool
+    """
+    global _executor, _executor_pid
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                           thread_name_prefix="hyper-sdk-offload")
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def input_size(input_data: Any) -> int:
+    """
+    Estimates the serialized size of an input object from the length of its string fields.
+
+    Args:
+        input_data (Any): The input object of a generate method
+
+    Returns:
+        int: The total length of the string and bytes fields
+    """
+    fields = getattr(input_data, '__dict__', None)
+    if fields is not None:
+        values = fields.values()
+    else:
+        values = (getattr(input_data, name, None) for name in getattr(type(input_data), '__slots__', ()))
+    return sum(len(value) for value in values if isinstance(value, (str, bytes)))
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop runs a callback that is scheduled at a fixed interval.
+
+    The lag is the time other coroutines kept the loop busy, so it shows the blocking work of the running code:
+
+        async with LoopLagMonitor() as monitor:
+            await asyncio.gather(*tasks)
+        print(monitor.stats())
+    """
+
+    def __init__(self, interval: float = 0.01, window: int = 4096) -> None:
+        """
+        Creates a new LoopLagMonitor.
+
+        Args:
+            interval (float, optional): Seconds between two measurements
+            window (int, optional): Number of recent measurements the statistics are computed from
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self.interval = interval
+        self._samples: 'collections.deque[float]' = collections.deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> 'LoopLagMonitor':
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def start(self) -> None:
+        """Starts measuring on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops measuring, the collected statistics are kept."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self) -> None:
+        """Discards the collected measurements."""
+        self._samples.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the lag statistics of the recent measurements.
+
+        Returns:
+            Dict[str, float]: A dictionary containing the number of samples and the mean, p99 and max lag in seconds
+        """
+        samples: List[float] = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "mean": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "samples": len(samples),
+            "mean": sum(samples) / len(samples),
+            "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+            "max": samples[-1],
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._samples.append(max(0.0, loop.time() - expected))
@@ -0,0 +1,275 @@
+"""Client-side rate and concurrency limiting shared by the sync and async Session classes."""
+
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+import asyncio
+import threading
+import time
+
+import httpx
+
+from .retry import parse_retry_after
+
+
+class _Waiter:
+    __slots__ = ('event', 'loop', 'future', 'granted')
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+        self.granted = False
+
+
+class _Bucket:
+    """A token bucket (as a FIFO reservation schedule) combined with a FIFO concurrency limit."""
+
+    def __init__(self, rate: float, burst: int, max_concurrency: Optional[int]) -> None:
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        # Theoretical arrival time of the next request, see the generic cell rate algorithm.
+        self._tat = 0.0
+        self._waiters: Deque[_Waiter] = deque()
+
+    def reserve(self) -> float:
+        """Reserves the next token and returns the seconds to wait for it, reservations are served in FIFO order."""
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / self.rate
+            tolerance = (self.burst - 1) * interval
+            tat = max(self._tat, now)
+            self._tat = tat + interval
+            return max(0.0, tat - tolerance - now)
+
+    def try_enter(self, waiter: _Waiter) -> bool:
+        with self._lock:
+            if self.max_concurrency is None or (self.in_flight < self.max_concurrency and not self._waiters):
+                self.in_flight += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    def abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+                return
+        self.leave()
+
+    def leave(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter.loop is None:
+                    waiter.granted = True
+                    waiter.event.set()
+                    return
+                if not waiter.future.done():
+                    waiter.granted = True
+                    waiter.loop.call_soon_threadsafe(_grant, waiter.future)
+                    return
+            self.in_flight -= 1
+
+    def throttle(self, retry_after: Optional[float], decrease: float, min_rate: float) -> None:
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(min_rate, self.rate * decrease)
+            if retry_after is not None:
+                # Push back the whole schedule, including the burst allowance, until the server accepts requests again.
+                tolerance = (self.burst - 1) / self.rate
+                self._tat = max(self._tat, time.monotonic() + retry_after + tolerance)
+
+    def recover(self, increase: float) -> None:
+        with self._lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + increase * self.base_rate)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "throttled": self.throttled,
+            }
+
+
+def _grant(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimiter:
+    """
+    Token bucket rate limit and concurrency limit per API key, and optionally per product host.
+
+    Callers are queued in FIFO order instead of failing: rate tokens are handed out as reservations on a schedule, and
+    free concurrency slots go to the longest waiting caller. A limiter is thread-safe and can be shared by any number
+    of sync and async sessions in the same process. A 429 response lowers the rate of its bucket multiplicatively and
+    pauses it for the Retry-After duration, successful responses restore the configured rate additively.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_concurrency: Optional[int] = None, per_host: bool = False,
+                 decrease: float = 0.5, increase: float = 0.05, min_rate_ratio: float = 0.1) -> None:
+        """
+        Creates a new RateLimiter.
+
+        Args:
+            rate (float): Requests per second allowed per bucket
+            burst (int, optional): Number of requests that may be sent at once after an idle period
+            max_concurrency (int, optional): Maximum requests in flight per bucket, unlimited if omitted
+            per_host (bool, optional): Whether every product host of an API key gets its own bucket
+            decrease (float, optional): Factor applied to the rate after a 429 response
+            increase (float, optional): Fraction of the configured rate restored after every successful response
+            min_rate_ratio (float, optional): Lower bound of the rate as a fraction of the configured rate
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.decrease = decrease
+        self.increase = increase
+        self.min_rate_ratio = min_rate_ratio
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, Optional[str]], _Bucket] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Buckets are per process, a copy starts with full buckets and enforces its limits independently.
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+            "per_host": self.per_host,
+            "decrease": self.decrease,
+            "increase": self.increase,
+            "min_rate_ratio": self.min_rate_ratio,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def acquire(self, api_key: str, url: str) -> None:
+        """
+        Blocks until a request to the URL may be sent. Every acquire must be paired with release.
+
+        Args:
+            api_key (str): The API key of the session
+            url (str): The endpoint URL
+        """
+        bucket = self._bucket(api_key, url)
+        delay = bucket.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+        waiter = _Waiter()
+        if not bucket.try_enter(waiter):
+            waiter.event.wait()
+
+    async def acquire_async(self, api_key: str, url: str) -> None:
+        """
+        Waits until a request to the URL may be sent without blocking the event loop. Every acquire must be paired
+        with release.
+
+        Args:
+            api_key (str): The API key of the session
+            url (str): The endpoint URL
+        """
+        bucket = self._bucket(api_key, url)
+        delay = bucket.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        waiter = _Waiter(asyncio.get_running_loop())
+        if bucket.try_enter(waiter):
+            return
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            bucket.abandon(waiter)
+            raise
+
+    def release(self, api_key: str, url: str, response: Optional[httpx.Response] = None) -> None:
+        """
+        Frees the concurrency slot of a request and adapts the rate to its response.
+
+        Args:
+            api_key (str): The API key of the session
+            url (str): The endpoint URL
+            response (httpx.Response, optional): The response, None if the request failed
+        """
+        bucket = self._bucket(api_key, url)
+        if response is not None:
+            if response.status_code == 429:
+                bucket.throttle(parse_retry_after(response), self.decrease, self.rate * self.min_rate_ratio)
+            elif response.status_code < 400:
+                bucket.recover(self.increase)
+        bucket.leave()
+
+    @contextmanager
+    def limit(self, api_key: str, url: str) -> Iterator[None]:
+        """
+        Context manager that acquires and releases a request slot, without response feedback.
+
+        Args:
+            api_key (str): The API key of the session
+            url (str): The endpoint URL
+        """
+        self.acquire(api_key, url)
+        try:
+            yield
+        finally:
+            self.release(api_key, url)
+
+    @asynccontextmanager
+    async def limit_async(self, api_key: str, url: str) -> AsyncIterator[None]:
+        """
+        Async context manager that acquires and releases a request slot, without response feedback.
+
+        Args:
+            api_key (str): The API key of the session
+            url (str): The endpoint URL
+        """
+        await self.acquire_async(api_key, url)
+        try:
+            yield
+        finally:
+            self.release(api_key, url)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the current rate, requests in flight, queued callers and 429 count of every bucket.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The statistics keyed by bucket, "<api key prefix>" or "<api key prefix>@<host>"
+        """
+        with self._lock:
+            buckets = list(self._buckets.items())
+        return {_bucket_name(key): bucket.stats() for key, bucket in buckets}
+
+    def _bucket(self, api_key: str, url: str) -> _Bucket:
+        key = (api_key, url.split('/', 3)[2] if self.per_host else None)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = _Bucket(self.rate, self.burst, self.max_concurrency)
+        return bucket
+
+
+def _bucket_name(key: Tuple[str, Optional[str]]) -> str:
+    # Only a prefix of the API key is exposed in statistics.
+    api_key, host = key
+    name = api_key[:8]
+    return name if host is None else f"{name}@{host}"
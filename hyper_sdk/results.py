@@ -0,0 +1,44 @@
+"""Result types of the generate methods that return several values.
+
+The results are named tuples, so existing code unpacking them as tuples keeps working.
+"""
+
+from typing import Dict, NamedTuple
+
+
+class SensorResult(NamedTuple):
+    """Result of generate_sensor_data."""
+
+    # The sensor data to post to the Akamai script endpoint
+    payload: str
+    # The context to pass to the next sensor request
+    context: str
+
+
+class UtmvcResult(NamedTuple):
+    """Result of generate_utmvc_cookie."""
+
+    # The utmvc cookie value
+    payload: str
+    # The swhanedl parameter
+    swhanedl: str
+
+
+class KasadaPayloadResult(NamedTuple):
+    """Result of generate_kasada_payload."""
+
+    # The base64 encoded payload to POST to /tl
+    payload: str
+    # The headers to send with the payload
+    headers: Dict[str, str]
+
+
+class TrustDecisionPayloadResult(NamedTuple):
+    """Result of generate_trustdecision_payload."""
+
+    # The payload to post to the fingerprinting endpoint
+    payload: str
+    # The timezone to use in the tz header of subsequent requests
+    time_zone: str
+    # The client ID required for generating session signatures
+    client_id: str
@@ -0,0 +1,262 @@
+"""Retry policy with exponential backoff, full jitter and deadline budgets for the Session classes."""
+
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Collection, Dict, Optional
+import asyncio
+import random
+import threading
+import time
+
+import httpx
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the deadline of a call runs out before a request could be completed."""
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Parses the Retry-After header of a response.
+
+    Args:
+        response (httpx.Response): The HTTP response
+
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if the header is missing or invalid
+    """
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def cap_timeout(timeout: Any, remaining: float) -> httpx.Timeout:
+    """
+    Limits every phase of a timeout to the remaining deadline budget.
+
+    Args:
+        timeout (Any): A number of seconds, an httpx.Timeout or None
+        remaining (float): The remaining budget in seconds
+
+    Returns:
+        httpx.Timeout: The capped timeout
+    """
+    if not isinstance(timeout, httpx.Timeout):
+        timeout = httpx.Timeout(timeout)
+
+    def cap(value: Optional[float]) -> float:
+        return remaining if value is None else min(value, remaining)
+
+    return httpx.Timeout(connect=cap(timeout.connect), read=cap(timeout.read), write=cap(timeout.write),
+                         pool=cap(timeout.pool))
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with exponential backoff and full jitter, bounded by an optional deadline.
+
+    Transport errors (connection resets, timeouts, protocol errors) and responses with a retryable status code are
+    retried. The deadline bounds the whole call including backoff sleeps, and the timeout of every attempt is reduced
+    to the remaining budget. Attempt and retry counts are recorded per endpoint. A policy may be shared between
+    sessions.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, max_delay: float = 2.0,
+                 deadline: Optional[float] = None, retry_statuses: Collection[int] = (429, 500, 502, 503, 504),
+                 classifier: Optional[Callable[[BaseException], bool]] = None) -> None:
+        """
+        Creates a new RetryPolicy.
+
+        Args:
+            max_attempts (int, optional): Maximum number of attempts per call, including the first one
+            base_delay (float, optional): Backoff cap of the first retry in seconds, doubled for every further retry
+            max_delay (float, optional): Upper bound of the backoff cap in seconds
+            deadline (float, optional): Total budget of a call in seconds, unbounded if omitted
+            retry_statuses (Collection[int], optional): HTTP status codes that are retried
+            classifier (Callable[[BaseException], bool], optional): Decides whether an exception is retryable,
+                defaults to retrying httpx transport errors
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("deadline must be positive")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.classifier = classifier
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The per-endpoint statistics stay in the process they were recorded in.
+        return {
+            "max_attempts": self.max_attempts,
+            "base_delay": self.base_delay,
+            "max_delay": self.max_delay,
+            "deadline": self.deadline,
+            "retry_statuses": self.retry_statuses,
+            "classifier": self.classifier,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """
+        Checks whether an exception raised by an attempt should be retried.
+
+        Args:
+            error (BaseException): The exception
+
+        Returns:
+            bool: True if the call should be retried
+        """
+        if self.classifier is not None:
+            return self.classifier(error)
+        return isinstance(error, httpx.TransportError)
+
+    def backoff(self, retry: int) -> float:
+        """
+        Returns the full jitter backoff before the given retry.
+
+        Args:
+            retry (int): The number of the retry, starting at 1
+
+        Returns:
+            float: The delay in seconds
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (retry - 1))))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the attempt, retry and failure counts per endpoint.
+
+        Returns:
+            Dict[str, Dict[str, int]]: The counters keyed by endpoint URL
+        """
+        with self._lock:
+            return {url: dict(counters) for url, counters in self._stats.items()}
+
+    def call(self, url: str, send: Callable[[Any], httpx.Response], timeout: Any) -> httpx.Response:
+        """
+        Runs a request with retries.
+
+        Args:
+            url (str): The endpoint URL, used for the statistics
+            send (Callable[[Any], httpx.Response]): Sends one attempt with the given timeout
+            timeout (Any): The timeout configured for the endpoint
+
+        Returns:
+            httpx.Response: The response of the last attempt
+
+        Raises:
+            DeadlineExceeded: If the deadline ran out before any attempt could be made
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_timeout = self._attempt_timeout(started, timeout)
+            self._count(url, "attempts")
+            try:
+                response = send(attempt_timeout)
+            except Exception as e:
+                delay = self._retry_delay(url, started, attempt, e, None)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(url, started, attempt, None, response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+
+    async def call_async(self, url: str, send: Callable[[Any], Awaitable[httpx.Response]],
+                         timeout: Any) -> httpx.Response:
+        """
+        Async version of call.
+
+        Args:
+            url (str): The endpoint URL, used for the statistics
+            send (Callable[[Any], Awaitable[httpx.Response]]): Sends one attempt with the given timeout
+            timeout (Any): The timeout configured for the endpoint
+
+        Returns:
+            httpx.Response: The response of the last attempt
+
+        Raises:
+            DeadlineExceeded: If the deadline ran out before any attempt could be made
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_timeout = self._attempt_timeout(started, timeout)
+            self._count(url, "attempts")
+            try:
+                response = await send(attempt_timeout)
+            except Exception as e:
+                delay = self._retry_delay(url, started, attempt, e, None)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(url, started, attempt, None, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    def _attempt_timeout(self, started: float, timeout: Any) -> Any:
+        if self.deadline is None:
+            return timeout
+        remaining = self.deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            raise DeadlineExceeded(f"hyper-sdk: Deadline of {self.deadline}s exceeded.")
+        return cap_timeout(timeout, remaining)
+
+    def _retry_delay(self, url: str, started: float, attempt: int, error: Optional[BaseException],
+                     response: Optional[httpx.Response]) -> Optional[float]:
+        if error is not None:
+            retryable = self.is_retryable(error)
+        else:
+            retryable = response.status_code in self.retry_statuses
+
+        if not retryable:
+            return None
+        if attempt >= self.max_attempts:
+            self._count(url, "failures")
+            return None
+
+        delay = self.backoff(attempt)
+        if response is not None:
+            retry_after = parse_retry_after(response)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+        if self.deadline is not None and time.monotonic() - started + delay >= self.deadline:
+            self._count(url, "failures")
+            return None
+
+        self._count(url, "retries")
+        return delay
+
+    def _count(self, url: str, counter: str) -> None:
+        with self._lock:
+            counters = self._stats.get(url)
+            if counters is None:
+                counters = self._stats[url] = {"attempts": 0, "retries": 0, "failures": 0}
+            counters[counter] += 1
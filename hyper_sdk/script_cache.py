@@ -0,0 +1,372 @@
+"""Script upload and serialization caches shared by the sync and async Session classes."""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import gzip
+import hashlib
+import threading
+
+from .compression import COMPRESSION_THRESHOLD
+from .serialization import JsonBackend, json_backend
+from .streaming import StreamingBody
+from .wire import WireData
+
+# Error returned by the API when a request references a script hash it does not know.
+SCRIPT_HASH_MISS = "unknown script hash"
+
+_FRAGMENT_PREFIX = b'{"script": '
+
+
+def script_hash(script: str) -> str:
+    """
+    Returns the content hash used to reference a script on the API.
+
+    Args:
+        script (str): The script source code
+
+    Returns:
+        str: The hex encoded SHA-256 digest of the UTF-8 encoded script
+    """
+    return hashlib.sha256(script.encode('utf-8')).hexdigest()
+
+
+def is_script_miss(response_data: Dict[str, Any]) -> bool:
+    """
+    Checks whether the API rejected a request because it does not know the referenced script hash.
+
+    Args:
+        response_data (Dict[str, Any]): The parsed JSON response
+
+    Returns:
+        bool: True if the script has to be uploaded in full
+    """
+    return response_data.get("error") == SCRIPT_HASH_MISS
+
+
+class ScriptCache:
+    """
+    Tracks which scripts are known to be stored on the API so requests can reference them by hash.
+
+    When a session is created with a ScriptCache, the first request carrying a script uploads it in full together with
+    its hash. Later requests with the same script only send the hash, and fall back to a full upload if the API reports
+    a miss. Both the hash memo and the set of uploaded hashes are bounded LRUs. A cache may be shared between sessions
+    that use the same API key.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """
+        Creates a new ScriptCache.
+
+        Args:
+            max_entries (int, optional): Maximum number of scripts remembered as uploaded
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Memoizes the hash of recently seen scripts, str objects cache their own hash so lookups are cheap.
+        self._digests: 'OrderedDict[str, str]' = OrderedDict()
+        self._uploaded: 'OrderedDict[str, None]' = OrderedDict()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the configuration is pickled, a copy starts empty.
+        return {"max_entries": self.max_entries}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def digest(self, script: str) -> str:
+        """
+        Returns the content hash of a script, reusing the memoized value when the script was seen recently.
+
+        Args:
+            script (str): The script source code
+
+        Returns:
+            str: The hex encoded SHA-256 digest of the script
+        """
+        with self._lock:
+            digest = self._digests.get(script)
+            if digest is not None:
+                self._digests.move_to_end(script)
+                return digest
+
+        digest = script_hash(script)
+        with self._lock:
+            self._digests[script] = digest
+            if len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+        return digest
+
+    def is_uploaded(self, digest: str) -> bool:
+        """
+        Checks whether a script hash is believed to be stored on the API.
+
+        Args:
+            digest (str): The script hash
+
+        Returns:
+            bool: True if the script can be referenced by hash
+        """
+        with self._lock:
+            if digest in self._uploaded:
+                self._uploaded.move_to_end(digest)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def mark_uploaded(self, digest: str) -> None:
+        """
+        Records that the API has stored the script with the given hash.
+
+        Args:
+            digest (str): The script hash
+        """
+        with self._lock:
+            self._uploaded[digest] = None
+            self._uploaded.move_to_end(digest)
+            if len(self._uploaded) > self.max_entries:
+                self._uploaded.popitem(last=False)
+
+    def forget(self, digest: str) -> None:
+        """
+        Removes a script hash after the API reported that it no longer knows it.
+
+        Args:
+            digest (str): The script hash
+        """
+        with self._lock:
+            self._uploaded.pop(digest, None)
+
+    def clear(self) -> None:
+        """Forgets all uploaded scripts."""
+        with self._lock:
+            self._digests.clear()
+            self._uploaded.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit and miss counters of the cache.
+
+        Returns:
+            Dict[str, int]: A dictionary containing the hits, misses and number of tracked uploads
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._uploaded)}
+
+
+class _Fragment:
+    __slots__ = ('json', 'compressed', 'size')
+
+    def __init__(self, json_bytes: bytes, size: int) -> None:
+        self.json = json_bytes
+        self.compressed: Optional[bytes] = None
+        self.size = size
+
+
+class ScriptFragmentCache:
+    """
+    Memoizes the JSON-escaped and gzip-compressed form of scripts across requests.
+
+    Request bodies that carry a script are built by joining the cached script fragment with the JSON of the remaining
+    small per-call fields, so the multi-hundred-KB script is escaped and encoded only once. With reuse_compressed the
+    compressed body is also assembled from separately compressed gzip members (RFC 1952 allows concatenation), so only
+    the per-call fields are compressed on every request. Entries are evicted least recently used once either limit is
+    exceeded, the accounted size of an entry covers the script itself and its cached fragments.
+
+    Sessions created without a cache share default_fragment_cache, so the memory it holds is bounded once per process
+    (64 scripts and 64 MiB by default) rather than once per session.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024, reuse_compressed: bool = False,
+                 compresslevel: int = 6) -> None:
+        """
+        Creates a new ScriptFragmentCache.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached scripts
+            max_bytes (int, optional): Maximum accounted size of all cached entries in bytes
+            reuse_compressed (bool, optional): Whether compressed bodies reuse the cached compressed script member
+            compresslevel (int, optional): The gzip level used for the cached members
+        """
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.reuse_compressed = reuse_compressed
+        self.compresslevel = compresslevel
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, _Fragment]' = OrderedDict()
+        self._prefix_member = gzip.compress(_FRAGMENT_PREFIX, compresslevel=compresslevel)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "reuse_compressed": self.reuse_compressed,
+            "compresslevel": self.compresslevel,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def fragment(self, script: str) -> bytes:
+        """
+        Returns the JSON-escaped, UTF-8 encoded form of a script.
+
+        Args:
+            script (str): The script source code
+
+        Returns:
+            bytes: The script as a JSON string literal
+        """
+        return self._entry(script).json
+
+    def compressed(self, script: str) -> bytes:
+        """
+        Returns the JSON fragment of a script compressed as a standalone gzip member.
+
+        Args:
+            script (str): The script source code
+
+        Returns:
+            bytes: The gzip member of the script fragment
+        """
+        entry = self._entry(script)
+        if entry.compressed is None:
+            compressed = gzip.compress(entry.json, compresslevel=self.compresslevel)
+            with self._lock:
+                if entry.compressed is None:
+                    entry.compressed = compressed
+                    entry.size += len(compressed)
+                    if script in self._entries:
+                        self.current_bytes += len(compressed)
+                        self._evict()
+        return entry.compressed
+
+    def encode_stream(self, input_data: Dict[str, Any], backend: Optional[JsonBackend] = None,
+                      compressor: Optional[Callable[[], Any]] = None) -> StreamingBody:
+        """
+        Builds a streaming request body for request data that contains a script.
+
+        The cached fragment of the script is streamed if there is one, otherwise the script is escaped chunk by chunk
+        while the body is sent, without being added to the cache.
+
+        Args:
+            input_data (Dict[str, Any]): The request data, its 'script' value must be a string
+            backend (JsonBackend, optional): The JSON backend to serialize with, the default backend if omitted
+            compressor (Callable, optional): Creates the incremental compressor of the body, uncompressed if omitted
+
+        Returns:
+            StreamingBody: The request body
+        """
+        backend = json_backend(backend)
+        script = input_data['script']
+        suffix = _suffix(input_data, backend)
+        with self._lock:
+            entry = self._entries.get(script)
+            if entry is not None:
+                self._entries.move_to_end(script)
+                self.hits += 1
+        return StreamingBody([_FRAGMENT_PREFIX, script if entry is None else entry.json, suffix], backend, compressor)
+
+    def encode(self, input_data: Dict[str, Any], compression: bool,
+               backend: Optional[JsonBackend] = None) -> Tuple[bytes, bool]:
+        """
+        Builds the request body for request data that contains a script.
+
+        Args:
+            input_data (Dict[str, Any]): The request data, its 'script' value must be a string
+            compression (bool): Whether the body may be gzip compressed
+            backend (JsonBackend, optional): The JSON backend to serialize with, the default backend if omitted
+
+        Returns:
+            Tuple[bytes, bool]: The request body and whether it is gzip compressed
+        """
+        backend = json_backend(backend)
+        script = input_data['script']
+        suffix = _suffix(input_data, backend)
+        fragment = self._entry(script, backend).json
+
+        if not compression or len(_FRAGMENT_PREFIX) + len(fragment) + len(suffix) <= COMPRESSION_THRESHOLD:
+            return b''.join((_FRAGMENT_PREFIX, fragment, suffix)), False
+
+        if self.reuse_compressed:
+            parts: List[bytes] = [self._prefix_member, self.compressed(script),
+                                  gzip.compress(suffix, compresslevel=self.compresslevel)]
+            return b''.join(parts), True
+
+        body = b''.join((_FRAGMENT_PREFIX, fragment, suffix))
+        return gzip.compress(body, compresslevel=self.compresslevel), True
+
+    def clear(self) -> None:
+        """Removes all cached fragments."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the counters and byte accounting of the cache.
+
+        Returns:
+            Dict[str, int]: A dictionary containing hits, misses, evictions, entries and bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+            }
+
+    def _entry(self, script: str, backend: Optional[JsonBackend] = None) -> _Fragment:
+        with self._lock:
+            entry = self._entries.get(script)
+            if entry is not None:
+                self._entries.move_to_end(script)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        json_bytes = json_backend(backend).dumps(script)
+        entry = _Fragment(json_bytes, len(script) + len(json_bytes))
+        with self._lock:
+            existing = self._entries.get(script)
+            if existing is not None:
+                return existing
+            self._entries[script] = entry
+            self.current_bytes += entry.size
+            self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        # Never evict the most recent entry, a single oversized script is still served from the cache once.
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or
+                                          self.current_bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self.current_bytes -= entry.size
+            self.evictions += 1
+
+
+# The fragment cache of sessions created without one, shared by every session of the process.
+default_fragment_cache = ScriptFragmentCache()
+
+
+def _suffix(input_data: Dict[str, Any], backend: JsonBackend) -> bytes:
+    # The fields after the script fragment, serialized once per input if it is built from a WireInput.
+    if isinstance(input_data, WireData):
+        fields = input_data.fields_json(backend)
+    else:
+        fields = backend.dumps({key: value for key, value in input_data.items() if key != 'script'})
+    return (b', ' + fields[1:]) if len(fields) > 2 else b'}'
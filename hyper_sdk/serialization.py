@@ -0,0 +1,138 @@
+"""JSON encoding backends used to build request bodies and parse responses."""
+
+from typing import Any, Optional, Union
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class JsonBackend:
+    """
+    Interface of a JSON backend. Documents are encoded to UTF-8 bytes and decoded from bytes or str.
+
+    Decoding errors are raised as ValueError subclasses, like json.JSONDecodeError.
+    """
+
+    name = ""
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Encodes a document.
+
+        Args:
+            data (Any): The document, made of dicts, lists, strings, numbers, booleans and None
+
+        Returns:
+            bytes: The UTF-8 encoded JSON
+        """
+        raise NotImplementedError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decodes a document.
+
+        Args:
+            data (Union[bytes, str]): The JSON
+
+        Returns:
+            Any: The decoded document
+
+        Raises:
+            ValueError: If the data is not valid JSON
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class StdlibJsonBackend(JsonBackend):
+    """Backend based on the json module of the standard library."""
+
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonBackend(JsonBackend):
+    """Backend based on orjson, which encodes straight to bytes."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("hyper-sdk: The orjson JSON backend requires the orjson package.")
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecBackend(JsonBackend):
+    """Backend based on msgspec, which encodes straight to bytes."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        if msgspec is None:
+            raise ImportError("hyper-sdk: The msgspec JSON backend requires the msgspec package.")
+
+    def dumps(self, data: Any) -> bytes:
+        return msgspec.json.encode(data)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return msgspec.json.decode(data)
+
+
+_BACKENDS = {
+    StdlibJsonBackend.name: StdlibJsonBackend,
+    OrjsonBackend.name: OrjsonBackend,
+    MsgspecBackend.name: MsgspecBackend,
+}
+
+
+def json_backend(backend: Optional[Union[str, JsonBackend]] = None) -> JsonBackend:
+    """
+    Returns a JSON backend.
+
+    Args:
+        backend (Union[str, JsonBackend], optional): A backend, or one of "orjson", "msgspec", "json" and "auto". The
+            default backend is returned if omitted, and "auto" picks the fastest installed one
+
+    Returns:
+        JsonBackend: The backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If the package of the named backend is not installed
+    """
+    if backend is None:
+        return default_json_backend
+    if isinstance(backend, JsonBackend):
+        return backend
+    if backend == "auto":
+        if orjson is not None:
+            return OrjsonBackend()
+        if msgspec is not None:
+            return MsgspecBackend()
+        return StdlibJsonBackend()
+    if backend not in _BACKENDS:
+        raise ValueError(f"hyper-sdk: Unknown JSON backend {backend!r}, expected one of {sorted(_BACKENDS)} or 'auto'.")
+    return _BACKENDS[backend]()
+
+
+default_json_backend: JsonBackend = json_backend("auto")
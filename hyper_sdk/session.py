@@ -1,11 +1,24 @@
 """Session class for Hyper Solutions API."""
 
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Union, Iterable
+import os
 import httpx
-import json
-import gzip
 
-from .shared import generate_signature, build_headers, validate_response
+from .shared import generate_signature, HeaderCache, resolve_timeout
+from .core import SessionCore, RequestFlow
+from .retry import RetryPolicy
+from .hedge import HedgePolicy
+from .rate_limit import RateLimiter
+from .circuit_breaker import CircuitBreaker
+from .client_registry import ClientRegistry, default_client_registry, ssl_context
+from .serialization import JsonBackend
+from .compression import CompressionPolicy
+from .streaming import Body
+from .transport import Transport
+from .executor import SessionExecutor
+from .results import SensorResult, UtmvcResult, KasadaPayloadResult, TrustDecisionPayloadResult
+from .warmup import WarmupHook, IdleTracker, resolve_hosts, warmup_hosts, KeepWarmThread
+from .script_cache import ScriptCache, ScriptFragmentCache, default_fragment_cache
 from .akamai_input import SensorInput, PixelInput, SbsdInput
 from .kasada_input import KasadaPowInput, KasadaPayloadInput, BotIDHeaderInput
 from .datadome_input import DataDomeSliderInput, DataDomeInterstitialInput, DataDomeTagsInput
@@ -13,71 +26,222 @@ from .incapsula_input import UtmvcInput, ReeseInput
 from .trustdecision_input import PayloadInput, DecodeInput, SignatureInput
 
 
-class Session:
+class Session(SessionCore):
     def __init__(self, api_key: str, jwt_key: Optional[str] = None, app_key: Optional[str] = None,
                  app_secret: Optional[str] = None, client: Optional[httpx.Client] = None,
-                 compression: bool = True) -> None:
-        self.api_key = api_key
-        self.jwt_key = jwt_key
-        self.app_key = app_key
-        self.app_secret = app_secret
-        self.client = httpx.Client() if client is None else client
+                 compression: bool = True, header_cache: Optional[HeaderCache] = None,
+                 script_cache: Optional[ScriptCache] = None,
+                 fragment_cache: Optional[ScriptFragmentCache] = None, http2: bool = False,
+                 limits: Optional[httpx.Limits] = None,
+                 timeouts: Optional[Dict[str, Union[float, httpx.Timeout]]] = None,
+                 retry_policy: Optional[RetryPolicy] = None, hedge_policy: Optional[HedgePolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 shared_client: Union[bool, ClientRegistry] = False,
+                 transport: Optional[Transport] = None,
+                 json_backend: Optional[Union[str, JsonBackend]] = None,
+                 compression_policy: Optional[CompressionPolicy] = None,
+                 stream_threshold: Optional[int] = None) -> None:
+        """
+        Creates a new session.
+
+        Args:
+            api_key (str): The API key for authentication
+            jwt_key (str, optional): The JWT key for signature generation
+            app_key (str, optional): The application key
+            app_secret (str, optional): The application secret
+            client (httpx.Client, optional): A custom client, the session creates and owns one if omitted
+            compression (bool, optional): Whether to compress large request bodies
+            header_cache (HeaderCache, optional): Cache of the signed authentication headers
+            script_cache (ScriptCache, optional): Enables referencing uploaded scripts by hash
+            fragment_cache (ScriptFragmentCache, optional): Cache of serialized script fragments, the process-wide
+                default_fragment_cache if omitted
+            http2 (bool, optional): Whether the owned client negotiates HTTP/2, off by default since httpx's sync
+                HTTP/2 connection can fail requests when many threads open streams on it at once
+            limits (httpx.Limits, optional): Connection pool limits of the owned client (max_connections,
+                max_keepalive_connections, keepalive_expiry)
+            timeouts (Dict[str, Union[float, httpx.Timeout]], optional): Request timeouts keyed by full endpoint URL,
+                such as "https://akm.hypersolutions.co/v2/sensor", or by host, such as "kasada.hypersolutions.co"
+            retry_policy (RetryPolicy, optional): Retries transient failures, every request is sent once if omitted
+            hedge_policy (HedgePolicy, optional): Sends a duplicate of slow requests to latency-critical endpoints
+            rate_limiter (RateLimiter, optional): Rate and concurrency limits, usually shared by all sessions
+            circuit_breaker (CircuitBreaker, optional): Fails fast while the backend of a product host is failing
+            shared_client (Union[bool, ClientRegistry], optional): Whether the session uses a client shared with other
+                sessions instead of creating its own, True uses the process-wide registry; ignored if client is given
+            transport (Transport, optional): Posts the requests instead of the client, such as a Urllib3Transport;
+                the client is still used for warm-up
+            json_backend (Union[str, JsonBackend], optional): The JSON backend, or one of "orjson", "msgspec", "json"
+                and "auto", the fastest installed backend is used if omitted
+            compression_policy (CompressionPolicy, optional): Chooses the content coding and level of request bodies
+                by size, gzip by default
+            stream_threshold (int, optional): Length of a script from which its request body is serialized and
+                compressed while it is sent, capping the memory held by every request; never streamed if omitted
+        """
+        super().__init__(api_key, jwt_key, app_key, app_secret, compression, header_cache, script_cache,
+                         fragment_cache, json_backend, compression_policy,
+                         stream_threshold)
+        self.http2 = http2
+        self.limits = limits
+        self.timeouts = timeouts
+        self.retry_policy = retry_policy
+        self.hedge_policy = hedge_policy
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.transport = transport
+        self._idle = IdleTracker()
+        self._keep_warm = None
+        self._registry: Optional[ClientRegistry] = None
+        if client is None and shared_client:
+            self._registry = shared_client if isinstance(shared_client, ClientRegistry) else default_client_registry
+        self.client = self._create_client() if client is None else client
         self._owns_client = client is None
-        self.compression = compression
+
+    @property
+    def client(self) -> Optional[httpx.Client]:
+        """The HTTP client, rebuilt on first use in a forked child process if the session created it."""
+        if self._pid != os.getpid():
+            self._after_fork()
+        return self._client
+
+    @client.setter
+    def client(self, client: Optional[httpx.Client]) -> None:
+        self._client = client
+        self._pid = os.getpid()
+
+    def _after_fork(self) -> None:
+        """Replaces the state inherited from the parent process, whose connections must not be used or closed."""
+        self._pid = os.getpid()
+        self._idle = IdleTracker()
+        self._keep_warm = None
+        if self._client is not None and (self._owns_client or self._registry is not None):
+            self._client = self._create_client()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only credentials and configuration are pickled, the copy creates its own client. A custom client is not
+        # carried over.
+        return {
+            "api_key": self.api_key,
+            "jwt_key": self.jwt_key,
+            "app_key": self.app_key,
+            "app_secret": self.app_secret,
+            "compression": self.compression,
+            "header_cache": self.header_cache,
+            "script_cache": self.script_cache,
+            # The shared default cache is not pickled, the copy uses the default cache of its process.
+            "fragment_cache": None if self.fragment_cache is default_fragment_cache else self.fragment_cache,
+            "json_backend": self.json_backend,
+            "compression_policy": self.compression_policy,
+            "stream_threshold": self.stream_threshold,
+            "http2": self.http2,
+            "limits": self.limits,
+            "timeouts": self.timeouts,
+            "retry_policy": self.retry_policy,
+            "hedge_policy": self.hedge_policy,
+            "rate_limiter": self.rate_limiter,
+            "circuit_breaker": self.circuit_breaker,
+            "shared_client": self._registry is not None,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def _create_client(self) -> httpx.Client:
+        """Creates the client owned by this session, or acquires the shared one."""
+        if self._registry is not None:
+            return self._registry.acquire(self.http2, self.limits)
+        if self.limits is None:
+            return httpx.Client(http2=self.http2, verify=ssl_context())
+        return httpx.Client(http2=self.http2, verify=ssl_context(), limits=self.limits)
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self._owns_client and self.client:
-            self.client.close()
+        self.close()
 
     def close(self):
-        """Close the client if we own it."""
-        if self._owns_client and self.client:
+        """Close the client if we own it, or release the shared one."""
+        self.stop_keep_warm()
+        if self._registry is not None:
+            if self.client is not None:
+                self._registry.release(self.client)
+                self.client = None
+        elif self._owns_client and self.client:
             self.client.close()
 
-    def generate_sensor_data(self, input_data: SensorInput) -> Tuple[str, str]:
+    def warmup(self, hosts: Optional[Iterable[str]] = None, hook: Optional[WarmupHook] = None,
+               timeout: float = 10.0) -> Dict[str, float]:
         """
-        Returns the sensor data required to generate valid akamai cookies using the Hyper Solutions API.
+        Opens and verifies pooled connections to the API hosts concurrently, so the first real requests do not pay
+        for DNS, TCP and TLS setup.
 
         Args:
-            input_data (SensorInput): An instance of SensorInput containing the necessary data for generating the sensor data.
+            hosts (Iterable[str], optional): Product names ("akamai", "incapsula", "kasada", "datadome",
+                "trustdecision") or hostnames, all product hosts if omitted
+            hook (WarmupHook, optional): Called with the host, the warm-up time in seconds and the error, if any
+            timeout (float, optional): Timeout of every warm-up request
 
         Returns:
-            str: Sensor data as a string.
-            str: Context data as a string.
+            Dict[str, float]: The warm-up time in seconds of every host that could be reached
         """
-        sensor_endpoint = "https://akm.hypersolutions.co/v2/sensor"
-
-        headers = self._build_headers()
-        payload_data = {
-            'userAgent': input_data.user_agent,
-            'abck': input_data.abck,
-            'bmsz': input_data.bmsz,
-            'version': input_data.version,
-            'pageUrl': input_data.page_url,
-            'script': input_data.script,
-            'scriptUrl': input_data.script_url,
-            'context': input_data.context,
-            'ip': input_data.ip,
-            'acceptLanguage': input_data.accept_language,
-        }
-        payload = json.dumps(payload_data).encode('utf-8')
+        results = warmup_hosts(self.client, resolve_hosts(hosts), hook, timeout)
+        for host in results:
+            self._idle.touch(f"https://{host}/")
+        return results
 
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
+    def keep_warm(self, interval: float = 30.0, hosts: Optional[Iterable[str]] = None,
+                  hook: Optional[WarmupHook] = None) -> None:
+        """
+        Starts a background thread that sends a cheap request to every host that has been idle for the given
+        interval, so its pooled connection does not go cold between bursts. Stopped by stop_keep_warm() or close().
 
-        response = self.client.post(sensor_endpoint, headers=headers, content=payload)
+        Args:
+            interval (float, optional): Seconds of idleness after which a host is warmed
+            hosts (Iterable[str], optional): Product names or hostnames, all product hosts if omitted
+            hook (WarmupHook, optional): Called with the host, the warm-up time in seconds and the error, if any
+        """
+        self.stop_keep_warm()
+        self._keep_warm = KeepWarmThread(self.client, resolve_hosts(hosts), interval, self._idle, hook)
+        self._keep_warm.start()
 
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
+    def stop_keep_warm(self) -> None:
+        """Stops the keep-warm thread if it is running."""
+        if self._keep_warm is not None:
+            self._keep_warm.stop()
+            self._keep_warm = None
 
-        return response_data["payload"], response_data.get("context", "")
+    def executor(self, max_workers: Optional[int] = None) -> SessionExecutor:
+        """
+        Returns an executor that runs the generate methods of this session on a pool of worker threads.
+
+        A Session can be used from many threads at once: the httpx client, the header cache and the script caches are
+        thread-safe, so all workers share one connection pool and one set of signed headers.
+
+        Example:
+            with session.executor(max_workers=16) as executor:
+                future = executor.submit_sensor_data(sensor_input)
+                sensor_data, context = future.result()
+
+        Args:
+            max_workers (int, optional): Number of worker threads
+
+        Returns:
+            SessionExecutor: The executor, use it as a context manager or call shutdown() when done
+        """
+        return SessionExecutor(self, max_workers=max_workers)
+
+    def generate_sensor_data(self, input_data: SensorInput) -> SensorResult:
+        """
+        Returns the sensor data required to generate valid akamai cookies using the Hyper Solutions API.
+
+        Args:
+            input_data (SensorInput): An instance of SensorInput containing the necessary data for generating the sensor data.
+
+        Returns:
+            str: Sensor data as a string.
+            str: Context data as a string.
+        """
+        return self._call("generate_sensor_data", input_data)
 
     def generate_sbsd_data(self, input_data: SbsdInput) -> str:
         """
@@ -89,17 +253,7 @@ class Session:
         Returns:
             str: Sensor data as a string.
         """
-        sensor_endpoint = "https://akm.hypersolutions.co/sbsd"
-        return self._send_request(sensor_endpoint, {
-            'userAgent': input_data.user_agent,
-            'uuid': input_data.uuid,
-            'pageUrl': input_data.page_url,
-            'o': input_data.o_cookie,
-            'script': input_data.script,
-            'acceptLanguage': input_data.accept_language,
-            'ip': input_data.ip,
-            'index': input_data.index,
-        })
+        return self._call("generate_sbsd_data", input_data)
 
     def generate_pixel_data(self, input_data: PixelInput) -> str:
         """
@@ -111,14 +265,7 @@ class Session:
         Returns:
             str: Pixel data as a string.
         """
-        pixel_endpoint = "https://akm.hypersolutions.co/pixel"
-        return self._send_request(pixel_endpoint, {
-            'userAgent': input_data.user_agent,
-            'htmlVar': input_data.html_var,
-            'scriptVar': input_data.script_var,
-            'ip': input_data.ip,
-            'acceptLanguage': input_data.accept_language,
-        })
+        return self._call("generate_pixel_data", input_data)
 
     def generate_reese84_sensor(self, input_data: ReeseInput) -> str:
         """
@@ -135,17 +282,9 @@ class Session:
         Raises:
             ValueError: If the script attribute in input_data is empty.
         """
-        return self._send_request("https://incapsula.hypersolutions.co/reese84", {
-            'userAgent': input_data.user_agent,
-            'acceptLanguage': input_data.accept_language,
-            'ip': input_data.ip,
-            'scriptUrl': input_data.script_url,
-            'pageUrl': input_data.pageUrl,
-            'pow': input_data.pow,
-            'script': input_data.script,
-        })
+        return self._call("generate_reese84_sensor", input_data)
 
-    def generate_utmvc_cookie(self, input_data: UtmvcInput) -> Tuple[str, str]:
+    def generate_utmvc_cookie(self, input_data: UtmvcInput) -> UtmvcResult:
         """
         Returns the utmvc cookie using the Hyper Solutions API.
 
@@ -162,27 +301,7 @@ class Session:
         Raises:
             ValueError: If the script attribute or session IDs in input_data are empty.
         """
-        headers = self._build_headers()
-        payload_data = {
-            'userAgent': input_data.user_agent,
-            'sessionIds': input_data.session_ids,
-            'script': input_data.script,
-        }
-        payload = json.dumps(payload_data).encode('utf-8')
-
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
-
-        response = self.client.post("https://incapsula.hypersolutions.co/utmvc", headers=headers, content=payload)
-
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-
-        return response_data["payload"], response_data["swhanedl"]
+        return self._call("generate_utmvc_cookie", input_data)
 
     def generate_kasada_pow(self, input_data: KasadaPowInput) -> str:
         """
@@ -194,9 +313,9 @@ class Session:
         Returns:
             str: The x-kpsdk-cd value as a string.
         """
-        return self._send_request("https://kasada.hypersolutions.co/cd", input_data.to_dict())
+        return self._call("generate_kasada_pow", input_data)
 
-    def generate_kasada_payload(self, input_data: KasadaPayloadInput) -> Tuple[str, dict]:
+    def generate_kasada_payload(self, input_data: KasadaPayloadInput) -> KasadaPayloadResult:
         """
         Returns a base64 encoded payload and headers using the Hyper Solutions API.
 
@@ -205,26 +324,10 @@ class Session:
             ipsLink and script.
 
         Returns:
-            tuple[str, dict]: A tuple containing the base64 encoded payload (to POST to /tl) as a string and a
-            dictionary of headers.
+            KasadaPayloadResult: A named tuple containing the base64 encoded payload (to POST to /tl) as a string and
+            a dictionary of headers.
         """
-        headers = self._build_headers()
-        payload_data = input_data.to_dict()
-        payload = json.dumps(payload_data).encode('utf-8')
-
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
-
-        response = self.client.post("https://kasada.hypersolutions.co/payload", headers=headers, content=payload)
-
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-
-        return response_data["payload"], response_data["headers"]
+        return self._call("generate_kasada_payload", input_data)
 
     def generate_botid_header(self, input_data: BotIDHeaderInput) -> str:
         """
@@ -237,7 +340,7 @@ class Session:
         Returns:
             str: The x-is-human header value as a string.
         """
-        return self._send_request("https://kasada.hypersolutions.co/botid", input_data.to_dict())
+        return self._call("generate_botid_header", input_data)
 
     def generate_interstitial_payload(self, input_data: DataDomeInterstitialInput) -> Dict[str, Any]:
         """
@@ -251,7 +354,7 @@ class Session:
                 - payload (str): The payload to post to /interstitial/
                 - headers (Dict[str, str]): The response headers
         """
-        return self._send_request_with_headers("https://datadome.hypersolutions.co/interstitial", input_data.to_dict())
+        return self._call("generate_interstitial_payload", input_data)
 
     def generate_slider_payload(self, input_data: DataDomeSliderInput) -> Dict[str, Any]:
         """
@@ -265,7 +368,7 @@ class Session:
                 - payload (str): The URL to make a GET request to for a solved datadome cookie
                 - headers (Dict[str, str]): The response headers
         """
-        return self._send_request_with_headers("https://datadome.hypersolutions.co/slider", input_data.to_dict())
+        return self._call("generate_slider_payload", input_data)
 
     def generate_tags_payload(self, input_data: DataDomeTagsInput) -> str:
         """
@@ -277,9 +380,9 @@ class Session:
         Returns:
             str: The tags payload.
         """
-        return self._send_request("https://datadome.hypersolutions.co/tags", input_data.to_dict())
+        return self._call("generate_tags_payload", input_data)
 
-    def generate_trustdecision_payload(self, input_data: PayloadInput) -> Tuple[str, str, str]:
+    def generate_trustdecision_payload(self, input_data: PayloadInput) -> TrustDecisionPayloadResult:
         """
         Generates TrustDecision payload that should be posted to TrustDecision's fingerprinting endpoint.
         Also returns timezone and clientId required for subsequent operations.
@@ -288,35 +391,12 @@ class Session:
             input_data (PayloadInput): An instance of PayloadInput containing the necessary data for generating the payload.
 
         Returns:
-            Tuple[str, str, str]: A tuple containing:
+            TrustDecisionPayloadResult: A named tuple containing:
                 - payload (str): The generated TrustDecision payload for posting to the fingerprinting endpoint
-                - timeZone (str): The timezone to use in the tz header for subsequent requests
-                - clientId (str): The client ID required for generating session signatures
-        """
-        headers = self._build_headers()
-        payload_data = {
-            'userAgent': input_data.user_agent,
-            'pageUrl': input_data.page_url,
-            'fpUrl': input_data.fp_url,
-            'ip': input_data.ip,
-            'acceptLanguage': input_data.accept_language,
-            'script': input_data.script,
-        }
-        payload = json.dumps(payload_data).encode('utf-8')
-
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
-
-        response = self.client.post("https://trustdecision.hypersolutions.co/payload", headers=headers, content=payload)
-
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-
-        return response_data["payload"], response_data["timeZone"], response_data["clientId"]
+                - time_zone (str): The timezone to use in the tz header for subsequent requests
+                - client_id (str): The client ID required for generating session signatures
+        """
+        return self._call("generate_trustdecision_payload", input_data)
 
     def decode_trustdecision_session_key(self, input_data: DecodeInput) -> str:
         """
@@ -329,10 +409,7 @@ class Session:
         Returns:
             str: The decoded session key value for use in the td-session-key header
         """
-        return self._send_request("https://trustdecision.hypersolutions.co/decode", {
-            'result': input_data.result,
-            'requestId': input_data.request_id,
-        })
+        return self._call("decode_trustdecision_session_key", input_data)
 
     def generate_trustdecision_signature(self, input_data: SignatureInput) -> str:
         """
@@ -345,10 +422,7 @@ class Session:
         Returns:
             str: The generated signature value for use in the td-session-sign header (single-use only)
         """
-        return self._send_request("https://trustdecision.hypersolutions.co/sign", {
-            'clientId': input_data.client_id,
-            'path': input_data.path,
-        })
+        return self._call("generate_trustdecision_signature", input_data)
 
     def generate_signature(self, key: str, secret: str) -> str:
         """
@@ -363,114 +437,113 @@ class Session:
         """
         return generate_signature(key, secret)
 
-    def _build_headers(self) -> Dict[str, str]:
+    def _call(self, name: str, input_data: Any) -> Any:
         """
-        Builds the headers dictionary including organization credentials if available.
+        Runs a generate method of the core.
+
+        Args:
+            name (str): The name of the method
+            input_data (Any): The input object of the method
 
         Returns:
-            Dict[str, str]: Headers dictionary with all required authentication headers
+            Any: The parsed result
         """
-        headers = build_headers(self.api_key, self.jwt_key, self.app_key, self.app_secret)
-        # Add compression headers
-        if self.compression:
-            headers["accept-encoding"] = "gzip"
-        return headers
+        return self._drive(self.call_flow(name, input_data))
 
-    def _compress_payload(self, payload: bytes) -> Tuple[bytes, bool]:
+    def _drive(self, flow: RequestFlow) -> Any:
         """
-        Compresses the payload using gzip if enabled and payload is large enough.
+        Runs a request flow of the core, posting every request it prepares.
 
         Args:
-            payload (bytes): The payload to potentially compress
+            flow (RequestFlow): The request flow
 
         Returns:
-            Tuple[bytes, bool]: The (potentially compressed) payload and whether compression was used
+            Any: The value returned by the flow
         """
-        if not self.compression or len(payload) <= 1000:
-            return payload, False
-
-        try:
-            compressed = gzip.compress(payload, compresslevel=6)
-            return compressed, True
-        except Exception:
-            # Fall back to uncompressed if compression fails
-            return payload, False
+        request = next(flow)
+        while True:
+            response = self._send(request.url, request.headers, request.body)
+            try:
+                request = flow.send(self.parse_response(response))
+            except StopIteration as done:
+                return done.value
 
-    def _decompress_response(self, response: httpx.Response) -> bytes:
+    def _send(self, url: str, headers: Dict[str, str], payload: Body) -> httpx.Response:
         """
-        Decompresses the response body if it's compressed with gzip.
+        Posts a prepared request, hedging, retrying and rate limiting it if the corresponding policies are
+        configured.
 
         Args:
-            response (httpx.Response): The HTTP response
+            url (str): The endpoint URL
+            headers (Dict[str, str]): The request headers
+            payload (Body): The request body
 
         Returns:
-            bytes: The decompressed response body
+            httpx.Response: The HTTP response
         """
-        content = response.content
-        content_encoding = response.headers.get("content-encoding", "").lower()
+        self._idle.touch(url)
+        timeout = resolve_timeout(self.timeouts, url)
+        hedged = self.hedge_policy is not None and self.hedge_policy.applies(url)
 
-        if content_encoding == "gzip" and self.compression:
-            try:
-                return gzip.decompress(content)
-            except Exception:
-                # Fall back to original content if decompression fails
-                pass
+        def attempt(attempt_timeout: Any) -> httpx.Response:
+            if hedged:
+                return self.hedge_policy.call(
+                    url, lambda: self._post_once(url, headers, payload, attempt_timeout))
+            return self._post_once(url, headers, payload, attempt_timeout)
+
+        if self.retry_policy is None:
+            return attempt(timeout)
 
-        return content
+        if timeout is httpx.USE_CLIENT_DEFAULT:
+            timeout = self.client.timeout
+        return self.retry_policy.call(url, attempt, timeout)
 
-    def _send_request(self, url: str, input_data: Dict[str, Any]) -> str:
+    def _post_once(self, url: str, headers: Dict[str, str], payload: Body, timeout: Any) -> httpx.Response:
         """
-        Sends a request and returns the payload.
+        Posts a prepared request exactly once, within the limits of the rate limiter if one is configured.
 
         Args:
             url (str): The endpoint URL
-            input_data (Dict[str, Any]): The request data
+            headers (Dict[str, str]): The request headers
+            payload (Body): The request body
+            timeout (Any): The request timeout
 
         Returns:
-            str: The response payload
-        """
-        headers = self._build_headers()
-        payload = json.dumps(input_data).encode('utf-8')
+            httpx.Response: The HTTP response
 
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
+        Raises:
+            CircuitOpenError: If the circuit breaker of the endpoint host is open
+        """
+        if self.circuit_breaker is not None:
+            # Fail fast before waiting for a rate limit token.
+            self.circuit_breaker.check(url)
 
-        response = self.client.post(url, headers=headers, content=payload)
+        if self.rate_limiter is None:
+            return self._post_guarded(url, headers, payload, timeout)
 
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-        return response_data["payload"]
+        self.rate_limiter.acquire(self.api_key, url)
+        response = None
+        try:
+            response = self._post_guarded(url, headers, payload, timeout)
+            return response
+        finally:
+            self.rate_limiter.release(self.api_key, url, response)
 
-    def _send_request_with_headers(self, url: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _post_guarded(self, url: str, headers: Dict[str, str], payload: Body, timeout: Any) -> httpx.Response:
         """
-        Sends a request and returns the payload with headers.
+        Posts a prepared request through the circuit breaker of its host, if one is configured.
 
         Args:
             url (str): The endpoint URL
-            input_data (Dict[str, Any]): The request data
+            headers (Dict[str, str]): The request headers
+            payload (Body): The request body
+            timeout (Any): The request timeout
 
         Returns:
-            Dict[str, Any]: Dictionary containing payload and headers
+            httpx.Response: The HTTP response
         """
-        headers = self._build_headers()
-        payload = json.dumps(input_data).encode('utf-8')
-
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
-
-        response = self.client.post(url, headers=headers, content=payload)
-
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-        return {
-            "payload": response_data["payload"],
-            "headers": response_data["headers"]
-        }
\ No newline at end of file
+        transport = self.client if self.transport is None else self.transport
+        if self.circuit_breaker is None:
+            return transport.post(url, headers=headers, content=payload, timeout=timeout)
+        return self.circuit_breaker.call(
+            url, lambda: transport.post(url, headers=headers, content=payload, timeout=timeout))
\ No newline at end of file
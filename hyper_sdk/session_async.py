@@ -1,11 +1,30 @@
 """Async version of the Session class for Hyper Solutions API."""
 
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Union, Callable, Awaitable, Iterable, AsyncIterable, AsyncIterator
+from concurrent.futures import Executor
+import asyncio
+import time
+import os
 import httpx
-import json
-import gzip
 
-from .shared import generate_signature, build_headers, validate_response
+from .shared import generate_signature, HeaderCache, resolve_timeout
+from .core import SessionCore, RequestFlow
+from .retry import RetryPolicy
+from .hedge import HedgePolicy
+from .rate_limit import RateLimiter
+from .circuit_breaker import CircuitBreaker
+from .client_registry import ClientRegistry, default_client_registry, ssl_context
+from .serialization import JsonBackend
+from .compression import CompressionPolicy
+from .streaming import Body, StreamingBody
+from .transport import AsyncTransport
+from .offload import OFFLOAD_THRESHOLD, input_size, offload_executor
+from .dispatcher import PriorityDispatcher, with_priority
+from .concurrency import AdaptiveConcurrency
+from .results import SensorResult, UtmvcResult, KasadaPayloadResult, TrustDecisionPayloadResult
+from .batch import BatchResult, map_async
+from .warmup import WarmupHook, IdleTracker, resolve_hosts, warmup_hosts_async, keep_warm_async
+from .script_cache import ScriptCache, ScriptFragmentCache, default_fragment_cache
 from .akamai_input import SensorInput, PixelInput, SbsdInput
 from .kasada_input import KasadaPowInput, KasadaPayloadInput, BotIDHeaderInput
 from .datadome_input import DataDomeSliderInput, DataDomeInterstitialInput, DataDomeTagsInput
@@ -13,75 +32,270 @@ from .incapsula_input import UtmvcInput, ReeseInput
 from .trustdecision_input import PayloadInput, DecodeInput, SignatureInput
 
 
-class SessionAsync:
+class SessionAsync(SessionCore):
     def __init__(self, api_key: str, jwt_key: Optional[str] = None, app_key: Optional[str] = None,
                  app_secret: Optional[str] = None, client: Optional[httpx.AsyncClient] = None,
-                 compression: bool = True) -> None:
-        self.api_key = api_key
-        self.jwt_key = jwt_key
-        self.app_key = app_key
-        self.app_secret = app_secret
+                 compression: bool = True, header_cache: Optional[HeaderCache] = None,
+                 script_cache: Optional[ScriptCache] = None,
+                 fragment_cache: Optional[ScriptFragmentCache] = None, http2: bool = True,
+                 limits: Optional[httpx.Limits] = None,
+                 timeouts: Optional[Dict[str, Union[float, httpx.Timeout]]] = None,
+                 retry_policy: Optional[RetryPolicy] = None, hedge_policy: Optional[HedgePolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_controller: Optional[AdaptiveConcurrency] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 dispatcher: Optional[PriorityDispatcher] = None,
+                 shared_client: Union[bool, ClientRegistry] = False,
+                 transport: Optional[AsyncTransport] = None,
+                 json_backend: Optional[Union[str, JsonBackend]] = None,
+                 compression_policy: Optional[CompressionPolicy] = None,
+                 stream_threshold: Optional[int] = None,
+                 offload_threshold: Optional[int] = OFFLOAD_THRESHOLD,
+                 offload_executor: Optional[Executor] = None) -> None:
+        """
+        Creates a new session.
+
+        Args:
+            api_key (str): The API key for authentication
+            jwt_key (str, optional): The JWT key for signature generation
+            app_key (str, optional): The application key
+            app_secret (str, optional): The application secret
+            client (httpx.AsyncClient, optional): A custom client, the session creates and owns one if omitted
+            compression (bool, optional): Whether to compress large request bodies
+            header_cache (HeaderCache, optional): Cache of the signed authentication headers
+            script_cache (ScriptCache, optional): Enables referencing uploaded scripts by hash
+            fragment_cache (ScriptFragmentCache, optional): Cache of serialized script fragments, the process-wide
+                default_fragment_cache if omitted
+            http2 (bool, optional): Whether the owned client negotiates HTTP/2
+            limits (httpx.Limits, optional): Connection pool limits of the owned client (max_connections,
+                max_keepalive_connections, keepalive_expiry)
+            timeouts (Dict[str, Union[float, httpx.Timeout]], optional): Request timeouts keyed by full endpoint URL,
+                such as "https://akm.hypersolutions.co/v2/sensor", or by host, such as "kasada.hypersolutions.co"
+            retry_policy (RetryPolicy, optional): Retries transient failures, every request is sent once if omitted
+            hedge_policy (HedgePolicy, optional): Sends a duplicate of slow requests to latency-critical endpoints
+            rate_limiter (RateLimiter, optional): Rate and concurrency limits, usually shared by all sessions
+            concurrency_controller (AdaptiveConcurrency, optional): Adapts the requests in flight per host (AIMD)
+            circuit_breaker (CircuitBreaker, optional): Fails fast while the backend of a product host is failing
+            dispatcher (PriorityDispatcher, optional): Shares request slots between priority classes
+            shared_client (Union[bool, ClientRegistry], optional): Whether the session uses a client shared with other
+                sessions instead of creating its own, True uses the process-wide registry; ignored if client is given
+            transport (AsyncTransport, optional): Posts the requests instead of the client, such as an
+                httpx.AsyncClient with its own settings; the client is still used for warm-up
+            json_backend (Union[str, JsonBackend], optional): The JSON backend, or one of "orjson", "msgspec", "json"
+                and "auto", the fastest installed backend is used if omitted
+            compression_policy (CompressionPolicy, optional): Chooses the content coding and level of request bodies
+                by size, gzip by default
+            stream_threshold (int, optional): Length of a script from which its request body is serialized and
+                compressed while it is sent, capping the memory held by every request; never streamed if omitted
+            offload_threshold (int, optional): Size in bytes of the input or response above which serialization,
+                compression and parsing run on a worker thread instead of the event loop, None keeps them on the loop
+            offload_executor (Executor, optional): The thread pool to offload to, a pool shared by all sessions if
+                omitted
+        """
+        super().__init__(api_key, jwt_key, app_key, app_secret, compression, header_cache, script_cache,
+                         fragment_cache, json_backend, compression_policy,
+                         stream_threshold)
         self.client = client
         self._owns_client = client is None
-        self.compression = compression
+        self._registry: Optional[ClientRegistry] = None
+        if client is None and shared_client:
+            self._registry = shared_client if isinstance(shared_client, ClientRegistry) else default_client_registry
+        self.http2 = http2
+        self.limits = limits
+        self.timeouts = timeouts
+        self.retry_policy = retry_policy
+        self.hedge_policy = hedge_policy
+        self.rate_limiter = rate_limiter
+        self.concurrency_controller = concurrency_controller
+        self.circuit_breaker = circuit_breaker
+        self.transport = transport
+        self.dispatcher = dispatcher
+        self.offload_threshold = offload_threshold
+        self.offload_executor = offload_executor
+        self._idle = IdleTracker()
+        self._keep_warm = None
 
     async def __aenter__(self):
-        if self._owns_client:
-            self.client = httpx.AsyncClient(http2=True)
+        if self._owns_client and (self._registry is None or self.client is None):
+            self.client = self._create_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._owns_client and self.client:
-            await self.client.aclose()
+        await self.close()
+
+    @property
+    def client(self) -> Optional[httpx.AsyncClient]:
+        """The HTTP client, rebuilt on first use in a forked child process if the session created it."""
+        if self._pid != os.getpid():
+            self._after_fork()
+        return self._client
+
+    @client.setter
+    def client(self, client: Optional[httpx.AsyncClient]) -> None:
+        self._client = client
+        self._pid = os.getpid()
+
+    def _after_fork(self) -> None:
+        """Replaces the state inherited from the parent process, whose connections must not be used or closed."""
+        self._pid = os.getpid()
+        self._idle = IdleTracker()
+        self._keep_warm = None
+        if self._client is not None and (self._owns_client or self._registry is not None):
+            self._client = self._create_client()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only credentials and configuration are pickled, the copy creates its own client. A custom client is not
+        # carried over.
+        return {
+            "api_key": self.api_key,
+            "jwt_key": self.jwt_key,
+            "app_key": self.app_key,
+            "app_secret": self.app_secret,
+            "compression": self.compression,
+            "header_cache": self.header_cache,
+            "script_cache": self.script_cache,
+            # The shared default cache is not pickled, the copy uses the default cache of its process.
+            "fragment_cache": None if self.fragment_cache is default_fragment_cache else self.fragment_cache,
+            "json_backend": self.json_backend,
+            "compression_policy": self.compression_policy,
+            "stream_threshold": self.stream_threshold,
+            "http2": self.http2,
+            "limits": self.limits,
+            "timeouts": self.timeouts,
+            "retry_policy": self.retry_policy,
+            "hedge_policy": self.hedge_policy,
+            "rate_limiter": self.rate_limiter,
+            "concurrency_controller": self.concurrency_controller,
+            "circuit_breaker": self.circuit_breaker,
+            "dispatcher": self.dispatcher,
+            "shared_client": self._registry is not None,
+            "offload_threshold": self.offload_threshold,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Creates the client owned by this session, or acquires the shared one."""
+        if self._registry is not None:
+            return self._registry.acquire_async(self.http2, self.limits)
+        if self.limits is None:
+            return httpx.AsyncClient(http2=self.http2, verify=ssl_context())
+        return httpx.AsyncClient(http2=self.http2, verify=ssl_context(), limits=self.limits)
 
     async def ensure_client(self):
         """Ensure we have an active client session."""
         if self.client is None:
-            self.client = httpx.AsyncClient(http2=True)
+            self.client = self._create_client()
             self._owns_client = True
 
-    async def generate_sensor_data(self, input_data: SensorInput) -> Tuple[str, str]:
+    async def warmup(self, hosts: Optional[Iterable[str]] = None, hook: Optional[WarmupHook] = None,
+                     timeout: float = 10.0) -> Dict[str, float]:
         """
-        Returns the sensor data required to generate valid akamai cookies using the Hyper Solutions API.
+        Opens and verifies pooled connections to the API hosts concurrently, so the first real requests do not pay
+        for DNS, TCP and TLS setup.
 
         Args:
-            input_data (SensorInput): An instance of SensorInput containing the necessary data for generating the sensor data.
+            hosts (Iterable[str], optional): Product names ("akamai", "incapsula", "kasada", "datadome",
+                "trustdecision") or hostnames, all product hosts if omitted
+            hook (WarmupHook, optional): Called with the host, the warm-up time in seconds and the error, if any
+            timeout (float, optional): Timeout of every warm-up request
 
         Returns:
-            str: Sensor data as a string.
-            str: Context data as a string.
+            Dict[str, float]: The warm-up time in seconds of every host that could be reached
         """
         await self.ensure_client()
-        sensor_endpoint = "https://akm.hypersolutions.co/v2/sensor"
-
-        headers = self._build_headers()
-        payload_data = {
-            'userAgent': input_data.user_agent,
-            'abck': input_data.abck,
-            'bmsz': input_data.bmsz,
-            'version': input_data.version,
-            'pageUrl': input_data.page_url,
-            'script': input_data.script,
-            'scriptUrl': input_data.script_url,
-            'context': input_data.context,
-            'ip': input_data.ip,
-            'acceptLanguage': input_data.accept_language,
-        }
-        payload = json.dumps(payload_data).encode('utf-8')
+        results = await warmup_hosts_async(self.client, resolve_hosts(hosts), hook, timeout)
+        for host in results:
+            self._idle.touch(f"https://{host}/")
+        return results
+
+    async def keep_warm(self, interval: float = 30.0, hosts: Optional[Iterable[str]] = None,
+                        hook: Optional[WarmupHook] = None) -> None:
+        """
+        Starts a background task that sends a cheap request to every host that has been idle for the given
+        interval, so its pooled connection does not go cold between bursts. Stopped by stop_keep_warm() or close().
+
+        Args:
+            interval (float, optional): Seconds of idleness after which a host is warmed
+            hosts (Iterable[str], optional): Product names or hostnames, all product hosts if omitted
+            hook (WarmupHook, optional): Called with the host, the warm-up time in seconds and the error, if any
+        """
+        await self.stop_keep_warm()
+        await self.ensure_client()
+        self._keep_warm = asyncio.ensure_future(
+            keep_warm_async(self.client, resolve_hosts(hosts), interval, self._idle, hook))
+
+    async def stop_keep_warm(self) -> None:
+        """Stops the keep-warm task if it is running."""
+        if self._keep_warm is not None:
+            self._keep_warm.cancel()
+            try:
+                await self._keep_warm
+            except asyncio.CancelledError:
+                pass
+            self._keep_warm = None
+
+    def map(self, method: Union[str, Callable[[Any], Awaitable[Any]]],
+            inputs: Union[Iterable[Any], AsyncIterable[Any]], concurrency: int = 16,
+            ordered: bool = True, priority: Optional[int] = None) -> AsyncIterator[BatchResult]:
+        """
+        Calls a generate method for every input with a bounded number of requests in flight.
+
+        Inputs are pulled lazily from the (async) iterable and results are streamed as they become available, so
+        arbitrarily long inputs can be processed with flat memory. A failing item yields a BatchResult carrying the
+        error instead of failing the whole batch.
+
+        Example:
+            async for item in session.map(session.generate_sensor_data, inputs, concurrency=32):
+                sensor_data, context = item.unwrap()
+
+        Args:
+            method (Union[str, Callable]): The method to call, either bound or by name such as "generate_pixel_data"
+            inputs (Union[Iterable, AsyncIterable]): The input objects
+            concurrency (int, optional): Maximum number of requests in flight
+            ordered (bool, optional): Whether results are yielded in input order instead of completion order
+            priority (int, optional): Priority class of the requests, such as PRIORITY_BULK, if a dispatcher is
+                configured
+
+        Returns:
+            AsyncIterator[BatchResult]: The result of every input
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        if priority is not None:
+            method = with_priority(method, priority)
+        return map_async(method, inputs, concurrency=concurrency, ordered=ordered)
 
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
+    def as_completed(self, method: Union[str, Callable[[Any], Awaitable[Any]]],
+                     inputs: Union[Iterable[Any], AsyncIterable[Any]],
+                     concurrency: int = 16, priority: Optional[int] = None) -> AsyncIterator[BatchResult]:
+        """
+        Like map, but yields results as soon as they complete. Use BatchResult.index to match them to their input.
 
-        response = await self.client.post(sensor_endpoint, headers=headers, content=payload)
+        Args:
+            method (Union[str, Callable]): The method to call, either bound or by name such as "generate_pixel_data"
+            inputs (Union[Iterable, AsyncIterable]): The input objects
+            concurrency (int, optional): Maximum number of requests in flight
+            priority (int, optional): Priority class of the requests, if a dispatcher is configured
+
+        Returns:
+            AsyncIterator[BatchResult]: The result of every input in completion order
+        """
+        return self.map(method, inputs, concurrency=concurrency, ordered=False, priority=priority)
 
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
+    async def generate_sensor_data(self, input_data: SensorInput) -> SensorResult:
+        """
+        Returns the sensor data required to generate valid akamai cookies using the Hyper Solutions API.
 
-        return response_data["payload"], response_data.get("context", "")
+        Args:
+            input_data (SensorInput): An instance of SensorInput containing the necessary data for generating the sensor data.
+
+        Returns:
+            str: Sensor data as a string.
+            str: Context data as a string.
+        """
+        return await self._call("generate_sensor_data", input_data)
 
     async def generate_sbsd_data(self, input_data: SbsdInput) -> str:
         """
@@ -93,17 +307,7 @@ class SessionAsync:
         Returns:
             str: Sensor data as a string.
         """
-        sensor_endpoint = "https://akm.hypersolutions.co/sbsd"
-        return await self._send_request(sensor_endpoint, {
-            'userAgent': input_data.user_agent,
-            'uuid': input_data.uuid,
-            'pageUrl': input_data.page_url,
-            'o': input_data.o_cookie,
-            'script': input_data.script,
-            'acceptLanguage': input_data.accept_language,
-            'ip': input_data.ip,
-            'index': input_data.index,
-        })
+        return await self._call("generate_sbsd_data", input_data)
 
     async def generate_pixel_data(self, input_data: PixelInput) -> str:
         """
@@ -115,14 +319,7 @@ class SessionAsync:
         Returns:
             str: Pixel data as a string.
         """
-        pixel_endpoint = "https://akm.hypersolutions.co/pixel"
-        return await self._send_request(pixel_endpoint, {
-            'userAgent': input_data.user_agent,
-            'htmlVar': input_data.html_var,
-            'scriptVar': input_data.script_var,
-            'ip': input_data.ip,
-            'acceptLanguage': input_data.accept_language,
-        })
+        return await self._call("generate_pixel_data", input_data)
 
     async def generate_reese84_sensor(self, input_data: ReeseInput) -> str:
         """
@@ -139,17 +336,9 @@ class SessionAsync:
         Raises:
             ValueError: If the script attribute in input_data is empty.
         """
-        return await self._send_request("https://incapsula.hypersolutions.co/reese84", {
-            'userAgent': input_data.user_agent,
-            'acceptLanguage': input_data.accept_language,
-            'ip': input_data.ip,
-            'scriptUrl': input_data.script_url,
-            'pageUrl': input_data.pageUrl,
-            'pow': input_data.pow,
-            'script': input_data.script,
-        })
+        return await self._call("generate_reese84_sensor", input_data)
 
-    async def generate_utmvc_cookie(self, input_data: UtmvcInput) -> Tuple[str, str]:
+    async def generate_utmvc_cookie(self, input_data: UtmvcInput) -> UtmvcResult:
         """
         Returns the utmvc cookie using the Hyper Solutions API.
 
@@ -166,28 +355,7 @@ class SessionAsync:
         Raises:
             ValueError: If the script attribute or session IDs in input_data are empty.
         """
-        await self.ensure_client()
-        headers = self._build_headers()
-        payload_data = {
-            'userAgent': input_data.user_agent,
-            'sessionIds': input_data.session_ids,
-            'script': input_data.script,
-        }
-        payload = json.dumps(payload_data).encode('utf-8')
-
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
-
-        response = await self.client.post("https://incapsula.hypersolutions.co/utmvc", headers=headers, content=payload)
-
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-
-        return response_data["payload"], response_data["swhanedl"]
+        return await self._call("generate_utmvc_cookie", input_data)
 
     async def generate_kasada_pow(self, input_data: KasadaPowInput) -> str:
         """
@@ -199,9 +367,9 @@ class SessionAsync:
         Returns:
             str: The x-kpsdk-cd value as a string.
         """
-        return await self._send_request("https://kasada.hypersolutions.co/cd", input_data.to_dict())
+        return await self._call("generate_kasada_pow", input_data)
 
-    async def generate_kasada_payload(self, input_data: KasadaPayloadInput) -> Tuple[str, dict]:
+    async def generate_kasada_payload(self, input_data: KasadaPayloadInput) -> KasadaPayloadResult:
         """
         Returns a base64 encoded payload and headers using the Hyper Solutions API.
 
@@ -210,27 +378,10 @@ class SessionAsync:
                 ipsLink and script.
 
         Returns:
-            tuple[str, dict]: A tuple containing the base64 encoded payload (to POST to /tl) as a string and a
-            dictionary of headers.
+            KasadaPayloadResult: A named tuple containing the base64 encoded payload (to POST to /tl) as a string and
+            a dictionary of headers.
         """
-        await self.ensure_client()
-        headers = self._build_headers()
-        payload_data = input_data.to_dict()
-        payload = json.dumps(payload_data).encode('utf-8')
-
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
-
-        response = await self.client.post("https://kasada.hypersolutions.co/payload", headers=headers, content=payload)
-
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-
-        return response_data["payload"], response_data["headers"]
+        return await self._call("generate_kasada_payload", input_data)
 
     async def generate_botid_header(self, input_data: BotIDHeaderInput) -> str:
         """
@@ -243,7 +394,7 @@ class SessionAsync:
         Returns:
             str: The x-is-human header value as a string.
         """
-        return await self._send_request("https://kasada.hypersolutions.co/botid", input_data.to_dict())
+        return await self._call("generate_botid_header", input_data)
 
     async def generate_interstitial_payload(self, input_data: DataDomeInterstitialInput) -> Dict[str, Any]:
         """
@@ -257,8 +408,7 @@ class SessionAsync:
                 - payload (str): The payload to post to /interstitial/
                 - headers (Dict[str, str]): The response headers
         """
-        return await self._send_request_with_headers("https://datadome.hypersolutions.co/interstitial",
-                                                     input_data.to_dict())
+        return await self._call("generate_interstitial_payload", input_data)
 
     async def generate_slider_payload(self, input_data: DataDomeSliderInput) -> Dict[str, Any]:
         """
@@ -272,8 +422,7 @@ class SessionAsync:
                 - payload (str): The URL to make a GET request to for a solved datadome cookie
                 - headers (Dict[str, str]): The response headers
         """
-        return await self._send_request_with_headers("https://datadome.hypersolutions.co/slider",
-                                                     input_data.to_dict())
+        return await self._call("generate_slider_payload", input_data)
 
     async def generate_tags_payload(self, input_data: DataDomeTagsInput) -> str:
         """
@@ -285,9 +434,9 @@ class SessionAsync:
         Returns:
             str: The tags payload.
         """
-        return await self._send_request("https://datadome.hypersolutions.co/tags", input_data.to_dict())
+        return await self._call("generate_tags_payload", input_data)
 
-    async def generate_trustdecision_payload(self, input_data: PayloadInput) -> Tuple[str, str, str]:
+    async def generate_trustdecision_payload(self, input_data: PayloadInput) -> TrustDecisionPayloadResult:
         """
         Generates TrustDecision payload that should be posted to TrustDecision's fingerprinting endpoint.
         Also returns timezone and clientId required for subsequent operations.
@@ -296,36 +445,12 @@ class SessionAsync:
             input_data (PayloadInput): An instance of PayloadInput containing the necessary data for generating the payload.
 
         Returns:
-            Tuple[str, str, str]: A tuple containing:
+            TrustDecisionPayloadResult: A named tuple containing:
                 - payload (str): The generated TrustDecision payload for posting to the fingerprinting endpoint
-                - timeZone (str): The timezone to use in the tz header for subsequent requests
-                - clientId (str): The client ID required for generating session signatures
+                - time_zone (str): The timezone to use in the tz header for subsequent requests
+                - client_id (str): The client ID required for generating session signatures
         """
-        await self.ensure_client()
-        headers = self._build_headers()
-        payload_data = {
-            'userAgent': input_data.user_agent,
-            'pageUrl': input_data.page_url,
-            'fpUrl': input_data.fp_url,
-            'ip': input_data.ip,
-            'acceptLanguage': input_data.accept_language,
-            'script': input_data.script,
-        }
-        payload = json.dumps(payload_data).encode('utf-8')
-
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
-
-        response = await self.client.post("https://trustdecision.hypersolutions.co/payload", headers=headers, content=payload)
-
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-
-        return response_data["payload"], response_data["timeZone"], response_data["clientId"]
+        return await self._call("generate_trustdecision_payload", input_data)
 
     async def decode_trustdecision_session_key(self, input_data: DecodeInput) -> str:
         """
@@ -338,10 +463,7 @@ class SessionAsync:
         Returns:
             str: The decoded session key value for use in the td-session-key header
         """
-        return await self._send_request("https://trustdecision.hypersolutions.co/decode", {
-            'result': input_data.result,
-            'requestId': input_data.request_id,
-        })
+        return await self._call("decode_trustdecision_session_key", input_data)
 
     async def generate_trustdecision_signature(self, input_data: SignatureInput) -> str:
         """
@@ -354,10 +476,7 @@ class SessionAsync:
         Returns:
             str: The generated signature value for use in the td-session-sign header (single-use only)
         """
-        return await self._send_request("https://trustdecision.hypersolutions.co/sign", {
-            'clientId': input_data.client_id,
-            'path': input_data.path,
-        })
+        return await self._call("generate_trustdecision_signature", input_data)
 
     def generate_signature(self, key: str, secret: str) -> str:
         """
@@ -372,121 +491,219 @@ class SessionAsync:
         """
         return generate_signature(key, secret)
 
-    def _build_headers(self) -> Dict[str, str]:
+    async def _call(self, name: str, input_data: Any) -> Any:
         """
-        Builds the headers dictionary including organization credentials if available.
+        Runs a generate method of the core.
+
+        Args:
+            name (str): The name of the method
+            input_data (Any): The input object of the method
 
         Returns:
-            Dict[str, str]: Headers dictionary with all required authentication headers
+            Any: The parsed result
         """
-        headers = build_headers(self.api_key, self.jwt_key, self.app_key, self.app_secret)
-        # Add compression headers
-        if self.compression:
-            headers["accept-encoding"] = "gzip"
-        return headers
+        return await self._drive(self.call_flow(name, input_data), input_size(input_data))
 
-    def _compress_payload(self, payload: bytes) -> Tuple[bytes, bool]:
+    async def _drive(self, flow: RequestFlow, size_hint: int = 0) -> Any:
         """
-        Compresses the payload using gzip if enabled and payload is large enough.
+        Runs a request flow of the core, posting every request it prepares.
+
+        Steps of the flow that handle at least offload_threshold bytes, judged by the size hint or the response, run on
+        the offload executor so serialization, compression and parsing do not block the event loop.
 
         Args:
-            payload (bytes): The payload to potentially compress
+            flow (RequestFlow): The request flow
+            size_hint (int, optional): The estimated size of the request data
 
         Returns:
-            Tuple[bytes, bool]: The (potentially compressed) payload and whether compression was used
+            Any: The value returned by the flow
         """
-        if not self.compression or len(payload) <= 1000:
-            return payload, False
+        await self.ensure_client()
+        done, value = await self._advance(flow, None, size_hint)
+        while not done:
+            response = await self._send(value.url, value.headers, value.body)
+            done, value = await self._advance(flow, response, max(size_hint, len(response.content)))
+        return value
+
+    async def _advance(self, flow: RequestFlow, response: Any, size: int) -> Tuple[bool, Any]:
+        """
+        Runs the next step of a request flow, on the offload executor if it handles enough data.
+
+        Args:
+            flow (RequestFlow): The request flow
+            response (Any): The response to parse and send to the flow, None for the first step
+            size (int): The size of the data handled by the step
 
+        Returns:
+            Tuple[bool, Any]: Whether the flow finished, and its return value or the next prepared request
+        """
+        if self.offload_threshold is None or size < self.offload_threshold:
+            return self._step(flow, response)
+        executor = offload_executor() if self.offload_executor is None else self.offload_executor
+        return await asyncio.get_running_loop().run_in_executor(executor, self._step, flow, response)
+
+    def _stream_executor(self, body: StreamingBody) -> Optional[Executor]:
+        """
+        Returns the executor producing the chunks of a streamed body, None if it is small enough for the event loop.
+
+        Args:
+            body (StreamingBody): The streamed request body
+
+        Returns:
+            Optional[Executor]: The offload executor, or None
+        """
+        if self.offload_threshold is None or len(body) < self.offload_threshold:
+            return None
+        return offload_executor() if self.offload_executor is None else self.offload_executor
+
+    def _step(self, flow: RequestFlow, response: Any) -> Tuple[bool, Any]:
+        # StopIteration cannot be passed through a future, so the end of the flow is returned as a flag.
         try:
-            compressed = gzip.compress(payload, compresslevel=6)
-            return compressed, True
-        except Exception:
-            # Fall back to uncompressed if compression fails
-            return payload, False
+            return False, next(flow) if response is None else flow.send(self.parse_response(response))
+        except StopIteration as done:
+            return True, done.value
 
-    def _decompress_response(self, response: httpx.Response) -> bytes:
+    async def _send(self, url: str, headers: Dict[str, str], payload: Body) -> httpx.Response:
         """
-        Decompresses the response body if it's compressed with gzip.
+        Posts a prepared request, hedging, retrying and rate limiting it if the corresponding policies are
+        configured.
 
         Args:
-            response (httpx.Response): The HTTP response
+            url (str): The endpoint URL
+            headers (Dict[str, str]): The request headers
+            payload (Body): The request body
 
         Returns:
-            bytes: The decompressed response body
+            httpx.Response: The HTTP response
         """
-        content = response.content
-        content_encoding = response.headers.get("content-encoding", "").lower()
+        self._idle.touch(url)
+        timeout = resolve_timeout(self.timeouts, url)
+        hedged = self.hedge_policy is not None and self.hedge_policy.applies(url)
 
-        if content_encoding == "gzip" and self.compression:
-            try:
-                return gzip.decompress(content)
-            except Exception:
-                # Fall back to original content if decompression fails
-                pass
+        async def attempt(attempt_timeout: Any) -> httpx.Response:
+            if hedged:
+                return await self.hedge_policy.call_async(
+                    url, lambda: self._post_once(url, headers, payload, attempt_timeout))
+            return await self._post_once(url, headers, payload, attempt_timeout)
+
+        if self.retry_policy is None:
+            return await attempt(timeout)
 
-        return content
+        if timeout is httpx.USE_CLIENT_DEFAULT:
+            timeout = self.client.timeout
+        return await self.retry_policy.call_async(url, attempt, timeout)
 
-    async def _send_request(self, url: str, input_data: Dict[str, Any]) -> str:
+    async def _post_once(self, url: str, headers: Dict[str, str], payload: Body, timeout: Any) -> httpx.Response:
         """
-        Sends an async request and returns the payload.
+        Posts a prepared request exactly once, after a slot of its priority class was granted if a dispatcher is
+        configured.
 
         Args:
             url (str): The endpoint URL
-            input_data (Dict[str, Any]): The request data
+            headers (Dict[str, str]): The request headers
+            payload (Body): The request body
+            timeout (Any): The request timeout
 
         Returns:
-            str: The response payload
+            httpx.Response: The HTTP response
+
+        Raises:
+            CircuitOpenError: If the circuit breaker of the endpoint host is open
         """
-        await self.ensure_client()
-        headers = self._build_headers()
-        payload = json.dumps(input_data).encode('utf-8')
+        if self.circuit_breaker is not None:
+            # Fail fast before waiting for a rate limit token or a concurrency slot.
+            self.circuit_breaker.check(url)
+
+        if self.dispatcher is None:
+            return await self._post_limited(url, headers, payload, timeout)
 
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
+        slot = await self.dispatcher.acquire(url)
+        try:
+            return await self._post_limited(url, headers, payload, timeout)
+        finally:
+            self.dispatcher.release(slot)
 
-        response = await self.client.post(url, headers=headers, content=payload)
+    async def _post_limited(self, url: str, headers: Dict[str, str], payload: Body, timeout: Any) -> httpx.Response:
+        """
+        Posts a prepared request within the limits of the rate limiter, if one is configured.
+
+        Args:
+            url (str): The endpoint URL
+            headers (Dict[str, str]): The request headers
+            payload (Body): The request body
+            timeout (Any): The request timeout
+
+        Returns:
+            httpx.Response: The HTTP response
+        """
+        if self.rate_limiter is None:
+            return await self._post_adaptive(url, headers, payload, timeout)
 
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-        return response_data["payload"]
+        await self.rate_limiter.acquire_async(self.api_key, url)
+        response = None
+        try:
+            response = await self._post_adaptive(url, headers, payload, timeout)
+            return response
+        finally:
+            self.rate_limiter.release(self.api_key, url, response)
 
-    async def _send_request_with_headers(self, url: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _post_adaptive(self, url: str, headers: Dict[str, str], payload: Body, timeout: Any) -> httpx.Response:
         """
-        Sends an async request and returns the payload with headers.
+        Posts a prepared request within the adaptive concurrency limit of its host, if a controller is configured.
 
         Args:
             url (str): The endpoint URL
-            input_data (Dict[str, Any]): The request data
+            headers (Dict[str, str]): The request headers
+            payload (Body): The request body
+            timeout (Any): The request timeout
 
         Returns:
-            Dict[str, Any]: Dictionary containing payload and headers
+            httpx.Response: The HTTP response
         """
-        await self.ensure_client()
-        headers = self._build_headers()
-        payload = json.dumps(input_data).encode('utf-8')
+        controller = self.concurrency_controller
+        if controller is None:
+            return await self._post_guarded(url, headers, payload, timeout)
 
-        # Compress payload if large enough
-        payload, use_compression = self._compress_payload(payload)
-        if use_compression:
-            headers["content-encoding"] = "gzip"
+        await controller.acquire(url)
+        started = time.monotonic()
+        try:
+            response = await self._post_guarded(url, headers, payload, timeout)
+        except asyncio.CancelledError:
+            controller.release(url)
+            raise
+        except Exception:
+            controller.release(url, failed=True)
+            raise
+        controller.release(url, response.status_code, time.monotonic() - started)
+        return response
 
-        response = await self.client.post(url, headers=headers, content=payload)
+    async def _post_guarded(self, url: str, headers: Dict[str, str], payload: Body, timeout: Any) -> httpx.Response:
+        """
+        Posts a prepared request through the circuit breaker of its host, if one is configured.
 
-        # Decompress response if needed
-        response_content = self._decompress_response(response)
-        response_data = json.loads(response_content)
-        validate_response(response_data, response.status_code)
-        return {
-            "payload": response_data["payload"],
-            "headers": response_data["headers"]
-        }
+        Args:
+            url (str): The endpoint URL
+            headers (Dict[str, str]): The request headers
+            payload (Body): The request body
+            timeout (Any): The request timeout
+
+        Returns:
+            httpx.Response: The HTTP response
+        """
+        transport = self.client if self.transport is None else self.transport
+        if isinstance(payload, StreamingBody):
+            payload = payload.async_stream(self._stream_executor(payload))
+        if self.circuit_breaker is None:
+            return await transport.post(url, headers=headers, content=payload, timeout=timeout)
+        return await self.circuit_breaker.call_async(
+            url, lambda: transport.post(url, headers=headers, content=payload, timeout=timeout))
 
     async def close(self):
-        """Close the client session if we own it."""
-        if self._owns_client and self.client:
+        """Close the client session if we own it, or release the shared one."""
+        await self.stop_keep_warm()
+        if self._registry is not None:
+            if self.client is not None:
+                await self._registry.release_async(self.client)
+                self.client = None
+        elif self._owns_client and self.client:
             await self.client.aclose()
\ No newline at end of file
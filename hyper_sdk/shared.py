@@ -1,24 +1,40 @@
 """Shared utility functions for both sync and async Session classes."""
 
-from typing import Dict
+from typing import Any, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+import threading
+import time
+import httpx
 import jwt
 
+SIGNATURE_LIFETIME = 60
 
-def generate_signature(key: str, secret: str) -> str:
+# API hosts of every product, keyed by product name.
+PRODUCT_HOSTS = {
+    "akamai": "akm.hypersolutions.co",
+    "incapsula": "incapsula.hypersolutions.co",
+    "kasada": "kasada.hypersolutions.co",
+    "datadome": "datadome.hypersolutions.co",
+    "trustdecision": "trustdecision.hypersolutions.co",
+}
+
+
+def generate_signature(key: str, secret: str, lifetime: int = SIGNATURE_LIFETIME) -> str:
     """
     Generates a JWT signature using the provided key and secret.
 
     Args:
         key (str): The key to include in the JWT claims
         secret (str): The secret used to sign the JWT
+        lifetime (int, optional): Number of seconds until the JWT expires
 
     Returns:
         str: The generated JWT token
     """
     claims = {
         "key": key,
-        "exp": datetime.now(timezone.utc) + timedelta(seconds=60)
+        "exp": datetime.now(timezone.utc) + timedelta(seconds=lifetime)
     }
     token = jwt.encode(claims, secret, algorithm='HS256')
     return token.decode('utf-8') if type(token) == bytes else token
@@ -60,6 +76,144 @@ def build_headers(api_key: str, jwt_key: str = None, app_key: str = None, app_se
     return headers
 
 
+class HeaderCache:
+    """
+    Caches the authentication headers of a session and reuses the signed JWTs until shortly before they expire.
+
+    The static part of the headers (Content-Type, X-Api-Key, X-App-Key and accept-encoding) is built once per set of
+    credentials, the X-Signature and X-App-Signature tokens are re-signed once they come within the refresh margin of
+    their expiry. The cache is safe to share between threads and asyncio tasks.
+    """
+
+    def __init__(self, refresh_margin: float = 10.0, clock_skew: float = 5.0,
+                 lifetime: int = SIGNATURE_LIFETIME) -> None:
+        """
+        Creates a new HeaderCache.
+
+        Args:
+            refresh_margin (float, optional): Seconds before expiry at which the tokens are re-signed
+            clock_skew (float, optional): Seconds the API clock may run ahead of the local clock
+            lifetime (int, optional): Lifetime of the signed tokens in seconds
+
+        Raises:
+            ValueError: If the margin and skew leave no usable token lifetime
+        """
+        if refresh_margin < 0 or clock_skew < 0:
+            raise ValueError("refresh_margin and clock_skew must not be negative")
+        if refresh_margin + clock_skew >= lifetime:
+            raise ValueError("refresh_margin and clock_skew must be smaller than the token lifetime")
+
+        self.refresh_margin = refresh_margin
+        self.clock_skew = clock_skew
+        self.lifetime = lifetime
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._credentials: Optional[Tuple] = None
+        self._headers: Dict[str, str] = {}
+        self._valid_until = 0.0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the configuration is pickled, a copy signs its own tokens.
+        return {"refresh_margin": self.refresh_margin, "clock_skew": self.clock_skew, "lifetime": self.lifetime}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def get(self, api_key: str, jwt_key: str = None, app_key: str = None, app_secret: str = None,
+            compression: bool = True) -> Dict[str, str]:
+        """
+        Returns the headers for the given credentials, re-signing the tokens only when required.
+
+        Args:
+            api_key (str): The API key for authentication
+            jwt_key (str, optional): The JWT key for signature generation
+            app_key (str, optional): The application key
+            app_secret (str, optional): The application secret
+            compression (bool, optional): Whether to advertise gzip support
+
+        Returns:
+            Dict[str, str]: A copy of the cached headers which the caller is free to modify
+
+        Raises:
+            ValueError: If api_key is not provided
+        """
+        if not api_key:
+            raise ValueError("Missing API key")
+
+        credentials = (api_key, jwt_key, app_key, app_secret, compression)
+        with self._lock:
+            # The monotonic clock keeps wall clock jumps from extending the reuse window.
+            now = time.monotonic()
+            if credentials == self._credentials and now < self._valid_until:
+                self.hits += 1
+                return dict(self._headers)
+
+            self.misses += 1
+            headers = build_headers(api_key, jwt_key, app_key, app_secret)
+            if compression:
+                headers["accept-encoding"] = "gzip"
+
+            self._credentials = credentials
+            self._headers = headers
+            if jwt_key or (app_key and app_secret):
+                self._valid_until = now + self.lifetime - self.refresh_margin - self.clock_skew
+            else:
+                # Nothing is signed, so the headers never expire.
+                self._valid_until = float("inf")
+            return dict(headers)
+
+    def invalidate(self) -> None:
+        """Forces the tokens to be re-signed on the next call."""
+        with self._lock:
+            self._credentials = None
+            self._valid_until = 0.0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit and miss counters of the cache.
+
+        Returns:
+            Dict[str, int]: A dictionary containing the hits and misses
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def resolve_timeout(timeouts: Optional[Dict[str, Union[float, httpx.Timeout]]],
+                    url: str) -> Any:
+    """
+    Looks up the timeout configured for an endpoint.
+
+    Args:
+        timeouts (Dict[str, Union[float, httpx.Timeout]], optional): Timeouts keyed by full endpoint URL or by host
+        url (str): The endpoint URL
+
+    Returns:
+        Any: The configured timeout, or httpx.USE_CLIENT_DEFAULT if none applies
+    """
+    if not timeouts:
+        return httpx.USE_CLIENT_DEFAULT
+    if url in timeouts:
+        return timeouts[url]
+    return timeouts.get(urlsplit(url).hostname, httpx.USE_CLIENT_DEFAULT)
+
+
+class ApiError(Exception):
+    """
+    Raised when the API returns an error or a non-200 status code.
+
+    Attributes:
+        status_code (int): The HTTP status code
+        error (str): The error message returned by the API, if any
+    """
+
+    def __init__(self, message: str, status_code: int, error: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.error = error
+
+
 def validate_response(response_data: dict, status_code: int) -> None:
     """
     Validates the API response and raises exceptions if there are errors.
@@ -69,10 +223,10 @@ def validate_response(response_data: dict, status_code: int) -> None:
         status_code (int): The HTTP status code
 
     Raises:
-        Exception: If there's an error in the response or status code is not 200
+        ApiError: If there's an error in the response or status code is not 200
     """
     if "error" in response_data and response_data["error"]:
-        raise Exception(f"API returned with error: {response_data['error']}")
+        raise ApiError(f"API returned with error: {response_data['error']}", status_code, response_data["error"])
 
     if status_code != 200:
-        raise Exception(f"API returned with status code: {status_code}")
\ No newline at end of file
+        raise ApiError(f"API returned with status code: {status_code}", status_code)
@@ -0,0 +1,122 @@
+"""Request bodies produced chunk by chunk while they are sent."""
+
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Sequence, Union
+import asyncio
+
+from .serialization import JsonBackend, json_backend
+
+# Number of bytes, or characters of a script, serialized and compressed at a time.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class StreamingBody:
+    """
+    A request body that is serialized and compressed chunk by chunk while it is sent, so a request never holds a full
+    copy of its escaped or compressed body.
+
+    The body is made of parts: bytes parts are sent as is, str parts are sent as JSON string literals, escaped one
+    chunk at a time. Every iteration produces the body anew, so retried and hedged requests can send it again. httpx
+    posts it with chunked transfer encoding on HTTP/1.1 and as a stream of DATA frames on HTTP/2.
+    """
+
+    def __init__(self, parts: Sequence[Union[bytes, str]], backend: Optional[JsonBackend] = None,
+                 compressor: Optional[Callable[[], Any]] = None, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        """
+        Creates a new StreamingBody.
+
+        Args:
+            parts (Sequence[Union[bytes, str]]): The parts of the body, bytes are sent as is and str as a JSON string
+            backend (JsonBackend, optional): The JSON backend escaping the str parts, the default backend if omitted
+            compressor (Callable, optional): Creates the incremental compressor of an iteration, such as
+                functools.partial(compressor, "gzip", 6), the body is sent uncompressed if omitted
+            chunk_size (int, optional): Number of bytes or characters processed at a time
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.parts = parts
+        self.backend = json_backend(backend)
+        self.compressor = compressor
+        self.chunk_size = chunk_size
+
+    def __repr__(self) -> str:
+        return f"StreamingBody(parts={len(self.parts)}, compressed={self.compressor is not None})"
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.compressor is None:
+            yield from self._chunks()
+            return
+
+        compressor = self.compressor()
+        for chunk in self._chunks():
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        tail = compressor.flush()
+        if tail:
+            yield tail
+
+    def __len__(self) -> int:
+        # The unescaped, uncompressed length, an estimate of the work of producing the body.
+        return sum(len(part) for part in self.parts)
+
+    def async_stream(self, executor: Optional[Executor] = None) -> 'AsyncStreamingBody':
+        """
+        Returns the body as an async iterable, for httpx.AsyncClient.
+
+        Args:
+            executor (Executor, optional): Produces the chunks off the event loop, they are produced on it if omitted
+
+        Returns:
+            AsyncStreamingBody: The async iterable
+        """
+        return AsyncStreamingBody(self, executor)
+
+    def _chunks(self) -> Iterator[bytes]:
+        size = self.chunk_size
+        for part in self.parts:
+            if isinstance(part, str):
+                yield b'"'
+                for start in range(0, len(part), size):
+                    # Escaping is per character, so a string escapes to the concatenation of its escaped chunks.
+                    yield self.backend.dumps(part[start:start + size])[1:-1]
+                yield b'"'
+            elif len(part) <= size:
+                yield part
+            else:
+                view = memoryview(part)
+                for start in range(0, len(part), size):
+                    yield bytes(view[start:start + size])
+
+
+class AsyncStreamingBody:
+    """
+    Async iterable of a StreamingBody.
+
+    httpx picks the sync or the async stream by the interface of the content, so this wrapper only offers the async
+    one. With an executor every chunk is escaped and compressed on it, so the event loop only hands the chunks to the
+    connection. Without one the chunks are produced on the event loop, which is blocked for one chunk at a time.
+    """
+
+    def __init__(self, body: StreamingBody, executor: Optional[Executor] = None) -> None:
+        self.body = body
+        self.executor = executor
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if self.executor is None:
+            for chunk in self.body:
+                yield chunk
+            return
+
+        loop = asyncio.get_running_loop()
+        chunks = iter(self.body)
+        while True:
+            chunk = await loop.run_in_executor(self.executor, next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+
+# A request body, complete or streamed.
+Body = Union[bytes, StreamingBody]
@@ -0,0 +1,103 @@
+"""Helpers for testing code that uses the SDK without network access."""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+import json
+
+import httpx
+
+from .compression import decompress
+from .compression_dictionary import CompressionDictionary
+from .script_cache import SCRIPT_HASH_MISS, script_hash
+
+
+class ScriptCacheStandIn:
+    """
+    Local stand-in for the API's script store, for exercising the hash negotiation without network access.
+
+    Instances are request handlers for httpx.MockTransport and work with both the sync and async clients:
+
+        stand_in = ScriptCacheStandIn()
+        session = Session("api-key", client=httpx.Client(transport=httpx.MockTransport(stand_in)),
+                          script_cache=ScriptCache())
+    """
+
+    def __init__(self, responder: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None,
+                 max_scripts: Optional[int] = None, dictionaries: Iterable[CompressionDictionary] = ()) -> None:
+        """
+        Creates a new ScriptCacheStandIn.
+
+        Args:
+            responder (Callable, optional): Builds the response body from the request path and the resolved request
+                data, by default every field the SDK reads is answered with an empty value
+            max_scripts (int, optional): Maximum number of stored scripts, older scripts are evicted to simulate misses
+            dictionaries (Iterable[CompressionDictionary], optional): The dictionaries the stand-in knows, bodies
+                compressed against another dictionary or with an unavailable coding are answered with 415
+        """
+        self.responder = responder
+        self.max_scripts = max_scripts
+        self.scripts: 'OrderedDict[str, str]' = OrderedDict()
+        self.requests = 0
+        self.full_uploads = 0
+        self.hash_hits = 0
+        self.hash_misses = 0
+        self.bytes_received = 0
+        self.dictionaries = list(dictionaries)
+        self.unsupported_encodings = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        self.requests += 1
+        self.bytes_received += len(body)
+        encoding = request.headers.get("content-encoding", "").lower()
+        if encoding:
+            try:
+                body = decompress(body, encoding, self.dictionaries)
+            except ValueError:
+                self.unsupported_encodings += 1
+                return httpx.Response(415, json={"error": f"unsupported content encoding {encoding}"})
+        data = json.loads(body)
+
+        digest = data.pop("scriptHash", None)
+        if "script" in data:
+            self.full_uploads += 1
+            if digest is not None:
+                if digest != script_hash(data["script"]):
+                    return httpx.Response(400, json={"error": "script hash mismatch"})
+                self._store(digest, data["script"])
+        elif digest is not None:
+            if digest not in self.scripts:
+                self.hash_misses += 1
+                return httpx.Response(409, json={"error": SCRIPT_HASH_MISS})
+            self.hash_hits += 1
+            self.scripts.move_to_end(digest)
+            data["script"] = self.scripts[digest]
+
+        if self.responder is not None:
+            return httpx.Response(200, json=self.responder(request.url.path, data))
+        return httpx.Response(200, json={
+            "payload": "",
+            "context": "",
+            "headers": {},
+            "swhanedl": "",
+            "timeZone": "",
+            "clientId": "",
+        })
+
+    def evict(self, digest: Optional[str] = None) -> None:
+        """
+        Drops a stored script, or every stored script, so the next reference to it misses.
+
+        Args:
+            digest (str, optional): The script hash to drop
+        """
+        if digest is None:
+            self.scripts.clear()
+        else:
+            self.scripts.pop(digest, None)
+
+    def _store(self, digest: str, script: str) -> None:
+        self.scripts[digest] = script
+        self.scripts.move_to_end(digest)
+        if self.max_scripts is not None and len(self.scripts) > self.max_scripts:
+            self.scripts.popitem(last=False)
@@ -0,0 +1,140 @@
+"""Pluggable HTTP transports for the Session classes."""
+
+from typing import Any, AsyncIterable, Dict, Iterable, Optional, Union
+import abc
+import socket
+
+import httpx
+import urllib3
+
+from .client_registry import ssl_context
+
+
+class Transport(abc.ABC):
+    """
+    Interface of the transport that posts the prepared requests of a Session.
+
+    httpx.Client satisfies it as is. The response must provide status_code, headers (a case-insensitive mapping),
+    content with the content-encoding already undone, and close(). Transport failures should be raised as
+    httpx.TransportError subclasses so the retry policy and the other policies of the session recognize them.
+    """
+
+    @abc.abstractmethod
+    def post(self, url: str, headers: Dict[str, str], content: Union[bytes, Iterable[bytes]], timeout: Any) -> Any:
+        """
+        Posts a request.
+
+        Args:
+            url (str): The endpoint URL
+            headers (Dict[str, str]): The request headers
+            content (Union[bytes, Iterable[bytes]]): The request body, or its chunks if it is streamed
+            timeout (Any): A number of seconds, an httpx.Timeout, None or httpx.USE_CLIENT_DEFAULT
+
+        Returns:
+            Any: The response
+        """
+
+    def close(self) -> None:
+        """Closes the connections of the transport."""
+
+
+class AsyncTransport(abc.ABC):
+    """Interface of the transport that posts the prepared requests of a SessionAsync, satisfied by httpx.AsyncClient."""
+
+    @abc.abstractmethod
+    async def post(self, url: str, headers: Dict[str, str], content: Union[bytes, AsyncIterable[bytes]],
+                   timeout: Any) -> Any:
+        """
+        Posts a request.
+
+        Args:
+            url (str): The endpoint URL
+            headers (Dict[str, str]): The request headers
+            content (Union[bytes, AsyncIterable[bytes]]): The request body, or its chunks if it is streamed
+            timeout (Any): A number of seconds, an httpx.Timeout, None or httpx.USE_CLIENT_DEFAULT
+
+        Returns:
+            Any: The response
+        """
+
+    async def aclose(self) -> None:
+        """Closes the connections of the transport."""
+
+
+# httpx's clients implement the interfaces as is.
+Transport.register(httpx.Client)
+AsyncTransport.register(httpx.AsyncClient)
+
+
+class TransportResponse:
+    """A fully read response of a transport that is not based on httpx."""
+
+    __slots__ = ('status_code', 'headers', 'content')
+
+    def __init__(self, status_code: int, headers: Any, content: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport backed by a urllib3 connection pool, speaking HTTP/1.1.
+
+    urllib3 decodes gzip bodies while reading them, and its errors are raised as the equivalent httpx exceptions.
+    """
+
+    def __init__(self, pool: Optional[urllib3.PoolManager] = None, timeout: float = 5.0,
+                 maxsize: int = 10) -> None:
+        """
+        Creates a new Urllib3Transport.
+
+        Args:
+            pool (urllib3.PoolManager, optional): The pool to send requests with, one sharing the SDK's SSL context is
+                created if omitted
+            timeout (float, optional): Connect and read timeout used when the session has no timeout for an endpoint
+            maxsize (int, optional): Number of connections kept per host of the created pool
+        """
+        self.pool = urllib3.PoolManager(maxsize=maxsize, ssl_context=ssl_context()) if pool is None else pool
+        self.timeout = timeout
+
+    def post(self, url: str, headers: Dict[str, str], content: Union[bytes, Iterable[bytes]],
+             timeout: Any) -> TransportResponse:
+        try:
+            response = self.pool.request("POST", url, body=content, headers=headers, timeout=self._timeout(timeout),
+                                         retries=False, preload_content=True)
+        except urllib3.exceptions.HTTPError as e:
+            raise _translate(e) from e
+        return TransportResponse(response.status, response.headers, response.data)
+
+    def close(self) -> None:
+        self.pool.clear()
+
+    def _timeout(self, timeout: Any) -> urllib3.Timeout:
+        if timeout is httpx.USE_CLIENT_DEFAULT:
+            return urllib3.Timeout(connect=self.timeout, read=self.timeout)
+        if isinstance(timeout, httpx.Timeout):
+            return urllib3.Timeout(connect=timeout.connect, read=timeout.read)
+        return urllib3.Timeout(connect=timeout, read=timeout)
+
+
+def _translate(error: urllib3.exceptions.HTTPError) -> httpx.TransportError:
+    if isinstance(error, urllib3.exceptions.MaxRetryError) and error.reason is not None:
+        error = error.reason
+    message = str(error)
+    # NewConnectionError subclasses ConnectTimeoutError, so it is checked first.
+    if isinstance(error, (urllib3.exceptions.NewConnectionError, urllib3.exceptions.SSLError)):
+        return httpx.ConnectError(message)
+    if isinstance(error, urllib3.exceptions.ConnectTimeoutError):
+        return httpx.ConnectTimeout(message)
+    if isinstance(error, (urllib3.exceptions.ReadTimeoutError, socket.timeout)):
+        return httpx.ReadTimeout(message)
+    if isinstance(error, urllib3.exceptions.ProtocolError):
+        return httpx.RemoteProtocolError(message)
+    return httpx.TransportError(message)
@@ -1,4 +1,9 @@
-class PayloadInput:
+from .wire import WireInput
+
+
+class PayloadInput(WireInput):
+    __slots__ = ('user_agent', 'page_url', 'fp_url', 'ip', 'accept_language', 'script')
+
     def __init__(self, user_agent: str, page_url: str, fp_url: str, ip: str, accept_language: str, script: str):
         """
         Creates a new PayloadInput instance for generating TrustDecision payloads.
@@ -19,7 +24,9 @@ class PayloadInput:
         self.script = script
 
 
-class DecodeInput:
+class DecodeInput(WireInput):
+    __slots__ = ('result', 'request_id')
+
     def __init__(self, result: str, request_id: str):
         """
         Creates a new DecodeInput instance for decoding TrustDecision session keys.
@@ -32,7 +39,9 @@ class DecodeInput:
         self.request_id = request_id
 
 
-class SignatureInput:
+class SignatureInput(WireInput):
+    __slots__ = ('client_id', 'path')
+
     def __init__(self, client_id: str, path: str):
         """
         Creates a new SignatureInput instance for generating TrustDecision session signatures.
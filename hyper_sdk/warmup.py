@@ -0,0 +1,175 @@
+"""Connection warm-up and keep-warm helpers shared by the sync and async Session classes."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+import asyncio
+import threading
+import time
+
+import httpx
+
+from .shared import PRODUCT_HOSTS
+
+# Called with the host, the seconds the warm-up request took and the error if it failed.
+WarmupHook = Callable[[str, float, Optional[BaseException]], None]
+
+
+def resolve_hosts(hosts: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Resolves product names such as "akamai" to their API host, hostnames are passed through.
+
+    Args:
+        hosts (Iterable[str], optional): Product names or hostnames, all product hosts if omitted
+
+    Returns:
+        List[str]: The hostnames
+    """
+    if hosts is None:
+        return list(PRODUCT_HOSTS.values())
+    return [PRODUCT_HOSTS.get(host, host) for host in hosts]
+
+
+def _report(hook: Optional[WarmupHook], host: str, elapsed: float, error: Optional[BaseException]) -> None:
+    if hook is not None:
+        hook(host, elapsed, error)
+
+
+def warmup_hosts(client: httpx.Client, hosts: Iterable[str], hook: Optional[WarmupHook] = None,
+                 timeout: float = 10.0) -> Dict[str, float]:
+    """
+    Opens a pooled connection to every host concurrently by sending a HEAD request to it.
+
+    Any HTTP response counts as a verified connection, since only DNS, TCP and TLS setup are of interest.
+
+    Args:
+        client (httpx.Client): The client whose pool is warmed
+        hosts (Iterable[str]): The hostnames
+        hook (WarmupHook, optional): Receives the warm-up time of every host
+        timeout (float, optional): Timeout of every warm-up request
+
+    Returns:
+        Dict[str, float]: The warm-up time in seconds of every host that could be reached
+    """
+    def warm(host: str):
+        start = time.perf_counter()
+        try:
+            client.head(f"https://{host}/", timeout=timeout)
+        except httpx.HTTPError as e:
+            _report(hook, host, time.perf_counter() - start, e)
+            return host, None
+        elapsed = time.perf_counter() - start
+        _report(hook, host, elapsed, None)
+        return host, elapsed
+
+    hosts = list(hosts)
+    if not hosts:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(hosts), thread_name_prefix="hyper-sdk-warmup") as pool:
+        results = list(pool.map(warm, hosts))
+    return {host: elapsed for host, elapsed in results if elapsed is not None}
+
+
+async def warmup_hosts_async(client: httpx.AsyncClient, hosts: Iterable[str], hook: Optional[WarmupHook] = None,
+                             timeout: float = 10.0) -> Dict[str, float]:
+    """
+    Async version of warmup_hosts.
+
+    Args:
+        client (httpx.AsyncClient): The client whose pool is warmed
+        hosts (Iterable[str]): The hostnames
+        hook (WarmupHook, optional): Receives the warm-up time of every host
+        timeout (float, optional): Timeout of every warm-up request
+
+    Returns:
+        Dict[str, float]: The warm-up time in seconds of every host that could be reached
+    """
+    async def warm(host: str):
+        start = time.perf_counter()
+        try:
+            await client.head(f"https://{host}/", timeout=timeout)
+        except httpx.HTTPError as e:
+            _report(hook, host, time.perf_counter() - start, e)
+            return host, None
+        elapsed = time.perf_counter() - start
+        _report(hook, host, elapsed, None)
+        return host, elapsed
+
+    results = await asyncio.gather(*(warm(host) for host in hosts))
+    return {host: elapsed for host, elapsed in results if elapsed is not None}
+
+
+class IdleTracker:
+    """Records when each host was last used, so keep-warm only touches idle connections."""
+
+    def __init__(self) -> None:
+        self._last_used: Dict[str, float] = {}
+
+    def touch(self, url: str) -> None:
+        """
+        Marks the host of a URL as used now.
+
+        Args:
+            url (str): The request URL
+        """
+        self._last_used[url.split('/', 3)[2]] = time.monotonic()
+
+    def idle(self, hosts: Iterable[str], interval: float) -> List[str]:
+        """
+        Returns the hosts that have not been used for at least the given interval.
+
+        Args:
+            hosts (Iterable[str]): The hostnames
+            interval (float): The idle interval in seconds
+
+        Returns:
+            List[str]: The idle hostnames
+        """
+        now = time.monotonic()
+        return [host for host in hosts if now - self._last_used.get(host, 0.0) >= interval]
+
+
+class KeepWarmThread(threading.Thread):
+    """Background thread that periodically warms idle hosts of a sync client."""
+
+    def __init__(self, client: httpx.Client, hosts: List[str], interval: float, tracker: IdleTracker,
+                 hook: Optional[WarmupHook] = None) -> None:
+        super().__init__(name="hyper-sdk-keep-warm", daemon=True)
+        self.client = client
+        self.hosts = hosts
+        self.interval = interval
+        self.tracker = tracker
+        self.hook = hook
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            idle = self.tracker.idle(self.hosts, self.interval)
+            if idle:
+                for host in warmup_hosts(self.client, idle, self.hook):
+                    self.tracker.touch(f"https://{host}/")
+
+    def stop(self) -> None:
+        """Stops the thread and waits for it to finish."""
+        self._stopped.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+
+async def keep_warm_async(client: httpx.AsyncClient, hosts: List[str], interval: float, tracker: IdleTracker,
+                          hook: Optional[WarmupHook] = None) -> None:
+    """
+    Periodically warms idle hosts of an async client until cancelled.
+
+    Args:
+        client (httpx.AsyncClient): The client whose pool is kept warm
+        hosts (List[str]): The hostnames
+        interval (float): Seconds between checks, hosts idle for this long are warmed
+        tracker (IdleTracker): The idle tracker of the session
+        hook (WarmupHook, optional): Receives the warm-up time of every host
+    """
+    while True:
+        await asyncio.sleep(interval)
+        idle = tracker.idle(hosts, interval)
+        if idle:
+            for host in await warmup_hosts_async(client, idle, hook):
+                tracker.touch(f"https://{host}/")
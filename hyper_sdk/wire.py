@@ -0,0 +1,117 @@
+"""Base class of the input types: slotted, with the request data built from an input cached on it."""
+
+from typing import Any, Callable, Dict, Tuple
+import operator
+
+from .serialization import JsonBackend
+
+
+class WireInput:
+    """
+    Base class of the input types.
+
+    Inputs are slotted, so a queued input holds its fields only. The request data of an input, and the JSON of its
+    fields, are built on its first request and reused by retries and repeated calls until a field changes, whether it
+    is assigned anew or, for lists such as UtmvcInput.session_ids, changed in place.
+    """
+
+    __slots__ = ('_wire',)
+
+    # Names of the fields of the input, and a getter returning their values, set for every subclass.
+    _field_names: Tuple[str, ...] = ()
+    _field_values: Callable[[Any], Any] = staticmethod(lambda input_data: ())
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._field_names = tuple(
+            name for klass in reversed(cls.__mro__) for name in klass.__dict__.get('__slots__', ()) if name != '_wire'
+        )
+        if len(cls._field_names) > 1:
+            cls._field_values = operator.attrgetter(*cls._field_names)
+        elif cls._field_names:
+            getter = operator.attrgetter(cls._field_names[0])
+            cls._field_values = staticmethod(lambda input_data: (getter(input_data),))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The cached request data is not pickled, the copy builds its own.
+        return {name: getattr(self, name) for name in self._field_names if hasattr(self, name)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def wire(self, build: Callable[[Any], Dict[str, Any]]) -> 'WireData':
+        """
+        Returns the request data of the input, building it on first use.
+
+        The returned dictionary is shared by all requests of the input and must not be modified.
+
+        Args:
+            build (Callable[[Any], Dict[str, Any]]): Builds the request data from the input
+
+        Returns:
+            WireData: The request data
+        """
+        # The cache is checked against the field values rather than invalidated on assignment, so that constructing
+        # an input does not go through a Python-level __setattr__. Unchanged fields hold the same objects, which
+        # compare by identity without looking at their content. Containers are copied into the key, as they can be
+        # changed in place.
+        values = self._field_values(self)
+        cached = getattr(self, '_wire', None)
+        if cached is not None and cached[0] is build and cached[1] == _freeze_fields(values, cached[2]):
+            return cached[3]
+        containers = tuple(index for index, value in enumerate(values) if isinstance(value, (list, dict)))
+        data = WireData(build(self))
+        self._wire = (build, _freeze_fields(values, containers), containers, data)
+        return data
+
+
+class WireData(dict):
+    """
+    Request data built from an input, caching the JSON of its fields other than the script.
+
+    The script, the largest field by far, is serialized by the ScriptFragmentCache and shared between inputs; the
+    other fields are serialized once per input and JSON backend.
+    """
+
+    __slots__ = ('_json',)
+
+    def fields_json(self, backend: JsonBackend) -> bytes:
+        """
+        Returns the JSON object of the fields, without the script if it is a non-empty string.
+
+        Args:
+            backend (JsonBackend): The JSON backend to serialize with
+
+        Returns:
+            bytes: The serialized fields
+        """
+        cached = getattr(self, '_json', None)
+        if cached is not None and cached[0] is backend:
+            return cached[1]
+        script = self.get('script')
+        if isinstance(script, str) and script:
+            fields = {key: value for key, value in self.items() if key != 'script'}
+        else:
+            fields = dict(self)
+        data = backend.dumps(fields)
+        self._json = (backend, data)
+        return data
+
+
+def _freeze_fields(values: Tuple[Any, ...], containers: Tuple[int, ...]) -> Tuple[Any, ...]:
+    # Replaces the fields at the given indices by immutable copies of their content.
+    if not containers:
+        return values
+    frozen = list(values)
+    for index in containers:
+        frozen[index] = _freeze(frozen[index])
+    return tuple(frozen)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, list):
+        return list, tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return dict, tuple((key, _freeze(item)) for key, item in value.items())
+    return value
@@ -0,0 +1,49 @@
+"""Per-process Session helpers for pre-fork servers and multiprocessing pools."""
+
+from typing import Callable, Iterable, Optional, Union
+
+from .session import Session
+from .session_async import SessionAsync
+
+_worker_session: Optional[Union[Session, SessionAsync]] = None
+
+
+def init_worker(session: Union[Session, SessionAsync, Callable[[], Union[Session, SessionAsync]]],
+                warmup: bool = True, hosts: Optional[Iterable[str]] = None) -> None:
+    """
+    Initializes the Session of the current worker process, so every process has its own connection pool.
+
+    Pass it as the initializer of a multiprocessing pool, or call it from the post-fork hook of a pre-fork server. A
+    session received from the parent, pickled or inherited through fork, creates its own client in the worker.
+
+    Example:
+        pool = multiprocessing.Pool(4, initializer=init_worker, initargs=(Session("your-api-key"),))
+        pool.map(solve, inputs)  # solve() calls worker_session()
+
+    Args:
+        session (Union[Session, SessionAsync, Callable]): The session, or a function creating it in the worker
+        warmup (bool, optional): Whether to open connections to the API hosts right away, sync sessions only
+        hosts (Iterable[str], optional): Product names or hostnames to warm up, all product hosts if omitted
+    """
+    global _worker_session
+
+    if callable(session) and not isinstance(session, (Session, SessionAsync)):
+        session = session()
+    _worker_session = session
+    if warmup and isinstance(session, Session):
+        session.warmup(hosts=hosts)
+
+
+def worker_session() -> Union[Session, SessionAsync]:
+    """
+    Returns the Session of the current worker process.
+
+    Returns:
+        Union[Session, SessionAsync]: The session passed to init_worker
+
+    Raises:
+        RuntimeError: If init_worker was not called in this process
+    """
+    if _worker_session is None:
+        raise RuntimeError("hyper-sdk: init_worker was not called in this process.")
+    return _worker_session
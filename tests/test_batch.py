@@ -0,0 +1,111 @@
+import asyncio
+
+import httpx
+import pytest
+
+from hyper_sdk import BatchResult, PixelInput, SessionAsync
+from hyper_sdk.batch import map_async
+
+
+class _Tracker:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def call(self, delay):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        if delay < 0:
+            raise ValueError(delay)
+        return delay * 1000
+
+
+async def _collect(results):
+    return [item async for item in results]
+
+
+def test_ordered_results_keep_input_order_and_bound_concurrency():
+    tracker = _Tracker()
+    delays = [0.03, 0.01, 0.02, 0.0, 0.01, 0.02, 0.0]
+
+    results = asyncio.run(_collect(map_async(tracker.call, delays, concurrency=3)))
+
+    assert [item.index for item in results] == list(range(len(delays)))
+    assert [item.unwrap() for item in results] == [delay * 1000 for delay in delays]
+    assert tracker.max_in_flight == 3
+
+
+def test_unordered_results_are_yielded_as_they_complete():
+    tracker = _Tracker()
+
+    results = asyncio.run(_collect(map_async(tracker.call, [0.05, 0.0], concurrency=2, ordered=False)))
+
+    assert [item.index for item in results] == [1, 0]
+
+
+def test_failed_item_carries_its_error():
+    tracker = _Tracker()
+
+    results = asyncio.run(_collect(map_async(tracker.call, [0.0, -1, 0.0], concurrency=2)))
+
+    assert [item.ok for item in results] == [True, False, True]
+    assert isinstance(results[1].error, ValueError)
+    with pytest.raises(ValueError):
+        results[1].unwrap()
+
+
+def test_inputs_are_pulled_lazily():
+    pulled = []
+
+    async def inputs():
+        for index in range(1000):
+            pulled.append(index)
+            yield 0.0
+
+    async def run():
+        results = map_async(_Tracker().call, inputs(), concurrency=4)
+        first = await results.__anext__()
+        await results.aclose()
+        return first
+
+    assert asyncio.run(run()).index == 0
+    assert len(pulled) <= 8
+
+
+def test_closing_early_cancels_the_calls_in_flight():
+    tracker = _Tracker()
+
+    async def run():
+        results = map_async(tracker.call, [0.0] + [10] * 5, concurrency=3)
+        await results.__anext__()
+        await results.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert tracker.cancelled == 2
+    assert tracker.in_flight == 0
+
+
+def test_session_map_calls_the_method_by_name():
+    def handler(request):
+        return httpx.Response(200, json={"payload": "pixel-data"})
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with SessionAsync("api-key", client=client) as session:
+            inputs = [PixelInput("ua", "html", "script", "en", "1.1.1.1") for _ in range(5)]
+            return await _collect(session.map("generate_pixel_data", inputs, concurrency=2))
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(item, BatchResult) for item in results)
+    assert [item.unwrap() for item in results] == ["pixel-data"] * 5
@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+import pytest
+
+from hyper_sdk import CircuitBreaker, CircuitOpenError, PixelInput, Session
+from hyper_sdk import circuit_breaker
+
+URL = "https://datadome.hypersolutions.co/slider"
+HOST = "datadome.hypersolutions.co"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def _send(status_code):
+    return lambda: httpx.Response(status_code, request=httpx.Request("POST", URL))
+
+
+def _fail():
+    raise httpx.ConnectError("refused")
+
+
+def _tripped(transitions):
+    breaker = CircuitBreaker(failure_threshold=0.5, window=4, min_calls=4, open_duration=10,
+                             hooks=[lambda *transition: transitions.append(transition)])
+    for send in (_send(200), _send(503), _send(200)):
+        breaker.call(URL, send)
+    assert breaker.state(HOST) == "closed"
+    with pytest.raises(httpx.ConnectError):
+        breaker.call(URL, _fail)
+    return breaker
+
+
+def test_failure_ratio_opens_the_circuit_and_requests_fail_fast(clock):
+    transitions = []
+    breaker = _tripped(transitions)
+
+    assert breaker.state(HOST) == "open"
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.call(URL, _send(200))
+    assert error.value.host == HOST and error.value.retry_after == 10
+    with pytest.raises(CircuitOpenError):
+        breaker.check(URL)
+    assert transitions == [(HOST, "closed", "open")]
+    assert breaker.stats()[HOST]["rejected"] == 2
+
+
+def test_successful_probe_closes_the_circuit(clock):
+    transitions = []
+    breaker = _tripped(transitions)
+
+    clock.now += 10
+    breaker.check(URL)
+    breaker.call(URL, _send(200))
+
+    assert breaker.state(HOST) == "closed"
+    assert transitions[1:] == [(HOST, "open", "half_open"), (HOST, "half_open", "closed")]
+
+
+def test_failed_probe_opens_the_circuit_again(clock):
+    transitions = []
+    breaker = _tripped(transitions)
+
+    clock.now += 10
+    breaker.call(URL, _send(502))
+
+    assert breaker.state(HOST) == "open"
+    assert transitions[-1] == (HOST, "half_open", "open")
+    assert breaker.stats()[HOST]["trips"] == 2
+
+
+def test_only_one_probe_is_let_through():
+    breaker = _tripped([])
+    breaker._circuits[HOST].opened_at -= 10
+
+    async def run():
+        async def slow_probe():
+            await asyncio.sleep(0.01)
+            return _send(200)()
+
+        probe = asyncio.ensure_future(breaker.call_async(URL, slow_probe))
+        await asyncio.sleep(0)
+        assert breaker.state(HOST) == "half_open"
+        with pytest.raises(CircuitOpenError):
+            await breaker.call_async(URL, slow_probe)
+        await probe
+
+    asyncio.run(run())
+
+    assert breaker.state(HOST) == "closed"
+
+
+def test_slow_calls_open_the_circuit(clock):
+    breaker = CircuitBreaker(slow_call_duration=0.5, slow_call_threshold=0.5, window=2, min_calls=2)
+
+    def slow():
+        clock.now += 1
+        return _send(200)()
+
+    breaker.call(URL, slow)
+    breaker.call(URL, slow)
+
+    assert breaker.state(HOST) == "open"
+
+
+def test_session_rejects_requests_while_open(clock):
+    posted = []
+
+    def handler(request):
+        posted.append(request)
+        return httpx.Response(503, json={"error": "down"})
+
+    breaker = CircuitBreaker(window=2, min_calls=2)
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with Session("api-key", client=client, circuit_breaker=breaker) as session:
+        for _ in range(2):
+            with pytest.raises(Exception):
+                session.generate_pixel_data(PixelInput("ua", "html", "script", "en", "1.1.1.1"))
+        with pytest.raises(CircuitOpenError):
+            session.generate_pixel_data(PixelInput("ua", "html", "script", "en", "1.1.1.1"))
+
+    assert len(posted) == 2
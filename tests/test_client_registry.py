@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from hyper_sdk import ClientRegistry, Session, SessionAsync, ssl_context
+
+
+def test_ssl_context_is_created_once():
+    assert ssl_context() is ssl_context()
+
+
+def test_clients_are_shared_per_settings_and_reference_counted():
+    registry = ClientRegistry()
+    first = registry.acquire()
+    second = registry.acquire()
+    other = registry.acquire(limits=httpx.Limits(max_connections=4))
+
+    assert first is second
+    assert other is not first
+    assert registry.stats() == {"clients": 2, "references": 3}
+
+    registry.release(first)
+    assert not first.is_closed
+    registry.release(second)
+    assert first.is_closed
+    assert registry.stats() == {"clients": 1, "references": 1}
+
+    registry.release(other)
+    with pytest.raises(ValueError):
+        registry.release(other)
+
+
+def test_sessions_share_one_client_until_the_last_is_closed():
+    registry = ClientRegistry()
+    first = Session("api-key-1", shared_client=registry)
+    second = Session("api-key-2", shared_client=registry)
+
+    assert first.client is second.client
+    client = first.client
+
+    first.close()
+    first.close()
+    assert not client.is_closed
+    assert registry.stats()["references"] == 1
+
+    second.close()
+    assert client.is_closed
+    assert registry.stats() == {"clients": 0, "references": 0}
+
+
+def test_supplied_client_is_never_registered():
+    registry = ClientRegistry()
+    client = httpx.Client()
+    with Session("api-key", client=client, shared_client=registry) as session:
+        assert session.client is client
+
+    assert registry.stats() == {"clients": 0, "references": 0}
+    assert not client.is_closed
+    client.close()
+
+
+def test_async_sessions_share_one_client():
+    registry = ClientRegistry()
+
+    async def run():
+        async with SessionAsync("api-key-1", shared_client=registry) as first:
+            async with SessionAsync("api-key-2", shared_client=registry) as second:
+                assert first.client is second.client
+                client = first.client
+            assert not client.is_closed
+        return client
+
+    client = asyncio.run(run())
+
+    assert client.is_closed
+    assert registry.stats() == {"clients": 0, "references": 0}
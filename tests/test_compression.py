@@ -0,0 +1,83 @@
+import json
+import pickle
+
+import httpx
+import pytest
+
+from hyper_sdk import CompressionPolicy, Session, UtmvcInput, available_encodings
+from hyper_sdk.compression import compress, decompress
+
+HOST = "akm.hypersolutions.co"
+SCRIPT = "var a = 1;" * 1000
+
+
+def test_default_policy_uses_gzip():
+    policy = CompressionPolicy()
+    assert policy.encodings == ("gzip",)
+    assert policy.select("akm.hypersolutions.co", 100 * 1024)[0] == "gzip"
+
+
+def test_explicit_encodings_are_preferred_in_order():
+    policy = CompressionPolicy(encodings=available_encodings())
+    assert policy.select("akm.hypersolutions.co", 100 * 1024)[0] == available_encodings()[0]
+    policy.reject("akm.hypersolutions.co", available_encodings()[0])
+    assert policy.select("akm.hypersolutions.co", 100 * 1024)[0] == (available_encodings() + ["gzip"])[1]
+
+
+def test_level_depends_on_the_size_class():
+    policy = CompressionPolicy()
+
+    assert policy.select(HOST, 1000) == (None, 0)
+    assert policy.select(HOST, 10 * 1024) == ("gzip", 1)
+    assert policy.select(HOST, 1024 * 1024) == ("gzip", 6)
+
+
+@pytest.mark.parametrize("encoding", available_encodings())
+def test_codings_round_trip(encoding):
+    data = SCRIPT.encode()
+
+    assert decompress(compress(data, encoding, 1), encoding) == data
+
+
+def test_unavailable_codings_are_refused():
+    with pytest.raises(ValueError):
+        CompressionPolicy(encodings=["lz4"])
+
+
+def test_gzip_is_never_rejected():
+    policy = CompressionPolicy()
+
+    assert not policy.reject(HOST, "gzip")
+    assert policy.select(HOST, 10 * 1024) == ("gzip", 1)
+
+
+def test_415_falls_back_to_the_next_coding_for_the_host():
+    encoding = next((encoding for encoding in available_encodings() if encoding != "gzip"), None)
+    if encoding is None:
+        pytest.skip("neither zstandard nor brotli is installed")
+    received = []
+
+    def handler(request):
+        received.append(request.headers.get("content-encoding"))
+        if request.headers.get("content-encoding") != "gzip":
+            return httpx.Response(415)
+        assert json.loads(decompress(request.read(), "gzip"))["script"] == SCRIPT
+        return httpx.Response(200, json={"payload": "utmvc-cookie", "swhanedl": "value"})
+
+    policy = CompressionPolicy(encodings=[encoding, "gzip"])
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with Session("api-key", client=client, compression_policy=policy) as session:
+        assert session.generate_utmvc_cookie(UtmvcInput("ua", ["session-id"], SCRIPT)) == ("utmvc-cookie", "value")
+        session.generate_utmvc_cookie(UtmvcInput("ua", ["session-id"], SCRIPT))
+
+    assert received == [encoding, "gzip", "gzip"]
+
+
+def test_pickled_policy_forgets_rejections():
+    policy = CompressionPolicy(encodings=available_encodings())
+    policy.reject(HOST, available_encodings()[0])
+
+    copy = pickle.loads(pickle.dumps(policy))
+
+    assert copy.encodings == policy.encodings
+    assert copy.select(HOST, 1024 * 1024)[0] == available_encodings()[0]
@@ -0,0 +1,100 @@
+import json
+
+import httpx
+import pytest
+
+from hyper_sdk import CompressionDictionary, CompressionPolicy, Session, UtmvcInput, train_dictionary
+from hyper_sdk.compression import compress, decompress
+from hyper_sdk import compression_dictionary
+from hyper_sdk.compression_dictionary import dictionary_encodings
+from hyper_sdk.testing import ScriptCacheStandIn
+
+SCRIPT = "".join(f"var v{index} = {index * 7919 % 1000};\n" for index in range(2000))
+# Scripts appear JSON-escaped in request bodies, like the dictionaries trained from them.
+BODY = json.dumps(SCRIPT).encode()
+DICTIONARY = CompressionDictionary(json.dumps(SCRIPT.replace("var v1", "var w1")).encode())
+OTHER = CompressionDictionary(b"function unrelated() { return 42; }" * 100)
+
+
+@pytest.mark.parametrize("encoding", dictionary_encodings())
+def test_dictionary_codings_round_trip(encoding):
+    compressed = DICTIONARY.compress(BODY, encoding, 3)
+
+    assert DICTIONARY.matches(compressed, encoding)
+    assert DICTIONARY.decompress(compressed, encoding) == BODY
+    assert decompress(compressed, encoding, [OTHER, DICTIONARY]) == BODY
+
+
+@pytest.mark.parametrize("encoding", dictionary_encodings())
+def test_foreign_dictionary_is_rejected(encoding):
+    compressed = DICTIONARY.compress(BODY, encoding, 3)
+
+    assert not OTHER.matches(compressed, encoding)
+    with pytest.raises(ValueError):
+        OTHER.decompress(compressed, encoding)
+    with pytest.raises(ValueError):
+        decompress(compressed, encoding, [OTHER])
+
+
+def test_dcz_beats_plain_zstd_on_a_similar_script():
+    if "dcz" not in dictionary_encodings():
+        pytest.skip("zstandard is not installed")
+
+    assert len(DICTIONARY.compress(BODY, "dcz", 3)) * 4 < len(compress(BODY, "zstd", 3))
+
+
+def test_dictionaries_are_saved_and_trained(tmp_path):
+    path = str(tmp_path / "scripts.dict")
+    DICTIONARY.save(path)
+
+    assert CompressionDictionary.load(path).id == DICTIONARY.id
+    # A single sample is too little for zstd's trainer, its escaped content is used as is.
+    assert train_dictionary([SCRIPT], size=1024).data == BODY[-1024:]
+    with pytest.raises(ValueError):
+        train_dictionary([])
+
+
+def test_policy_prefers_the_dictionary_codings():
+    if "dcz" not in dictionary_encodings():
+        pytest.skip("zstandard is not installed")
+    policy = CompressionPolicy(dictionary=DICTIONARY)
+
+    assert policy.encodings == ("dcz", "gzip")
+    assert policy.select("akm.hypersolutions.co", 1024 * 1024)[0] == "dcz"
+
+
+def test_dictionary_is_unused_without_zstandard(monkeypatch):
+    monkeypatch.setattr(compression_dictionary, "zstandard", None)
+    policy = CompressionPolicy(dictionary=DICTIONARY)
+
+    assert policy.encodings == ("gzip",)
+    assert policy.select("akm.hypersolutions.co", 1024 * 1024)[0] == "gzip"
+
+
+def _post(stand_in, policy):
+    client = httpx.Client(transport=httpx.MockTransport(stand_in))
+    with Session("api-key", client=client, compression_policy=policy) as session:
+        session.generate_utmvc_cookie(UtmvcInput("ua", ["session-id"], SCRIPT))
+
+
+def test_unknown_dictionary_falls_back_through_415():
+    stand_in = ScriptCacheStandIn()
+    policy = CompressionPolicy(dictionary=DICTIONARY)
+
+    _post(stand_in, policy)
+    _post(stand_in, policy)
+
+    # Every dictionary coding is rejected once, later requests go straight to gzip.
+    assert stand_in.unsupported_encodings == len(dictionary_encodings())
+    assert stand_in.requests == 2 + len(dictionary_encodings())
+
+
+def test_known_dictionary_is_accepted():
+    if "dcz" not in dictionary_encodings():
+        pytest.skip("zstandard is not installed")
+    stand_in = ScriptCacheStandIn(dictionaries=[DICTIONARY])
+
+    _post(stand_in, CompressionPolicy(dictionary=DICTIONARY))
+
+    assert stand_in.unsupported_encodings == 0
+    assert stand_in.bytes_received < len(BODY) // 10
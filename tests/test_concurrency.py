@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from hyper_sdk import AdaptiveConcurrency
+from hyper_sdk import concurrency
+
+URL = "https://akm.hypersolutions.co/v2/sensor"
+HOST = "akm.hypersolutions.co"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(concurrency.time, "monotonic", clock)
+    return clock
+
+
+def _complete(controller, status_code=200, latency=0.1, failed=False):
+    async def run():
+        await controller.acquire(URL)
+        controller.release(URL, status_code=None if failed else status_code, latency=latency, failed=failed)
+
+    asyncio.run(run())
+
+
+def test_limit_grows_by_about_one_per_round_trip(clock):
+    controller = AdaptiveConcurrency(initial=4)
+
+    for _ in range(5):
+        _complete(controller)
+
+    assert controller.stats()[HOST]["limit"] == 5
+    assert [(entry["reason"], entry["old_limit"], entry["new_limit"]) for entry in controller.history()] == [
+        ("increase", 4, 5)]
+
+
+def test_errors_cut_the_limit_once_per_round_trip(clock):
+    controller = AdaptiveConcurrency(initial=10, decrease=0.5)
+    _complete(controller, latency=1.0)
+
+    _complete(controller, status_code=503)
+    _complete(controller, failed=True)
+    assert controller.stats()[HOST]["limit"] == 5
+
+    clock.now += 1.0
+    _complete(controller, status_code=429)
+    assert controller.stats()[HOST]["limit"] == 2
+    assert [entry["reason"] for entry in controller.history()][-2:] == ["status 503", "status 429"]
+
+
+def test_rising_latency_cuts_the_limit(clock):
+    controller = AdaptiveConcurrency(initial=20, decrease=0.5, tolerance=1.5)
+    for _ in range(5):
+        _complete(controller, latency=0.1)
+
+    clock.now += 1.0
+    for _ in range(3):
+        _complete(controller, latency=1.0)
+
+    assert controller.stats()[HOST]["limit"] == 10
+    assert controller.history()[-1]["reason"] == "latency"
+
+
+def test_requests_above_the_limit_queue_in_fifo_order():
+    controller = AdaptiveConcurrency(initial=1, max_limit=1)
+    order = []
+
+    async def worker(name):
+        await controller.acquire(URL)
+        order.append(name)
+        await asyncio.sleep(0)
+        controller.release(URL)
+
+    async def run():
+        await controller.acquire(URL)
+        tasks = [asyncio.ensure_future(worker(name)) for name in range(3)]
+        await asyncio.sleep(0)
+        assert controller.stats()[HOST]["queue_depth"] == 3
+        controller.release(URL)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(asyncio.wait_for(run(), 2))
+
+    assert order == [0, 1, 2]
+    assert controller.stats()[HOST]["in_flight"] == 0
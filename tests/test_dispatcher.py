@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+import pytest
+
+from hyper_sdk import (PRIORITY_BULK, PRIORITY_CRITICAL, PRIORITY_NORMAL, PixelInput, PriorityDispatcher,
+                       SessionAsync, priority)
+
+SENSOR_URL = "https://akm.hypersolutions.co/v2/sensor"
+CD_URL = "https://kasada.hypersolutions.co/cd"
+PIXEL_URL = "https://incapsula.hypersolutions.co/utmvc"
+
+
+def test_priority_comes_from_the_context_or_the_endpoint():
+    dispatcher = PriorityDispatcher()
+
+    assert dispatcher.priority_of(CD_URL) == PRIORITY_CRITICAL
+    assert dispatcher.priority_of(SENSOR_URL) == PRIORITY_BULK
+    assert dispatcher.priority_of(PIXEL_URL) == PRIORITY_NORMAL
+    with priority(PRIORITY_CRITICAL):
+        assert dispatcher.priority_of(SENSOR_URL) == PRIORITY_CRITICAL
+
+
+def test_waiters_are_dispatched_by_class_then_in_fifo_order():
+    dispatcher = PriorityDispatcher(max_concurrency=1, reserved={})
+    order = []
+
+    async def worker(name, value):
+        with priority(value):
+            granted = await dispatcher.acquire(PIXEL_URL)
+        order.append(name)
+        await asyncio.sleep(0)
+        dispatcher.release(granted)
+
+    async def run():
+        held = await dispatcher.acquire(PIXEL_URL)
+        tasks = []
+        for name, value in [("bulk-1", PRIORITY_BULK), ("normal-1", PRIORITY_NORMAL), ("bulk-2", PRIORITY_BULK),
+                            ("critical", PRIORITY_CRITICAL), ("normal-2", PRIORITY_NORMAL)]:
+            tasks.append(asyncio.ensure_future(worker(name, value)))
+            await asyncio.sleep(0)
+        assert dispatcher.stats()["bulk"]["queued"] == 2
+        dispatcher.release(held)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(asyncio.wait_for(run(), 2))
+
+    assert order == ["critical", "normal-1", "normal-2", "bulk-1", "bulk-2"]
+    assert dispatcher.in_flight == 0
+
+
+def test_reserved_slots_are_kept_for_critical_requests():
+    dispatcher = PriorityDispatcher(max_concurrency=4, reserved={PRIORITY_CRITICAL: 1})
+
+    async def run():
+        for _ in range(3):
+            await dispatcher.acquire(SENSOR_URL)
+        queued = asyncio.ensure_future(dispatcher.acquire(SENSOR_URL))
+        await asyncio.sleep(0)
+        assert not queued.done()
+
+        await asyncio.wait_for(dispatcher.acquire(CD_URL), 1)
+        assert dispatcher.stats()["critical"]["in_flight"] == 1
+
+        dispatcher.release(PRIORITY_BULK)
+        await asyncio.sleep(0)
+        assert not queued.done()
+
+        dispatcher.release(PRIORITY_CRITICAL)
+        assert await asyncio.wait_for(queued, 1) == PRIORITY_BULK
+
+    asyncio.run(run())
+
+    assert dispatcher.stats()["bulk"]["dispatched"] == 4
+    assert dispatcher.in_flight == 3
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    dispatcher = PriorityDispatcher(max_concurrency=1, reserved={})
+
+    async def run():
+        held = await dispatcher.acquire(PIXEL_URL)
+        waiter = asyncio.ensure_future(dispatcher.acquire(PIXEL_URL))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        dispatcher.release(held)
+
+    asyncio.run(run())
+
+    assert dispatcher.stats()["normal"]["queued"] == 0
+    assert dispatcher.in_flight == 0
+
+
+def test_reserved_slots_must_leave_a_shared_slot():
+    with pytest.raises(ValueError):
+        PriorityDispatcher(max_concurrency=2, reserved={PRIORITY_CRITICAL: 2})
+
+
+def test_session_map_sends_requests_in_the_given_class():
+    def handler(request):
+        return httpx.Response(200, json={"payload": "pixel-data"})
+
+    dispatcher = PriorityDispatcher(max_concurrency=2, reserved={PRIORITY_CRITICAL: 1})
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with SessionAsync("api-key", client=client, dispatcher=dispatcher) as session:
+            inputs = [PixelInput("ua", "html", "script", "en", "1.1.1.1") for _ in range(3)]
+            return [item.unwrap() async for item in session.map("generate_pixel_data", inputs,
+                                                                 priority=PRIORITY_BULK)]
+
+    assert asyncio.run(run()) == ["pixel-data"] * 3
+    assert dispatcher.stats()["bulk"]["dispatched"] == 3
+    assert dispatcher.in_flight == 0
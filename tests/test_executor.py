@@ -0,0 +1,81 @@
+import json
+import threading
+
+import httpx
+
+from hyper_sdk import PixelInput, Session
+
+
+def _session(handler):
+    return Session("api-key", client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def _pixel(html_var):
+    return PixelInput("ua", html_var, "script", "en", "1.1.1.1")
+
+
+def _echo(request):
+    html_var = json.loads(request.read())["htmlVar"]
+    if html_var == "fail":
+        return httpx.Response(400, json={"error": "bad input"})
+    return httpx.Response(200, json={"payload": html_var})
+
+
+def test_submit_runs_on_the_workers():
+    threads = set()
+
+    def handler(request):
+        threads.add(threading.current_thread().name)
+        return _echo(request)
+
+    with _session(handler) as session, session.executor(max_workers=2) as executor:
+        futures = [executor.submit_pixel_data(_pixel(str(index))) for index in range(4)]
+        futures.append(executor.submit("generate_pixel_data", _pixel("by-name")))
+
+        assert [future.result() for future in futures] == ["0", "1", "2", "3", "by-name"]
+
+    assert all(name.startswith("hyper-sdk") for name in threads)
+
+
+def test_map_yields_every_input_in_order_with_errors_per_item():
+    with _session(_echo) as session, session.executor(max_workers=3) as executor:
+        inputs = [_pixel(value) for value in ("a", "fail", "c", "d")]
+        results = list(executor.map(session.generate_pixel_data, inputs, max_pending=2))
+
+    assert [item.index for item in results] == [0, 1, 2, 3]
+    assert [item.result for item in results if item.ok] == ["a", "c", "d"]
+    assert not results[1].ok
+
+
+def test_map_submits_at_most_max_pending_calls():
+    pulled = []
+
+    def inputs():
+        for index in range(100):
+            pulled.append(index)
+            yield _pixel(str(index))
+
+    with _session(_echo) as session, session.executor(max_workers=2) as executor:
+        results = executor.map("generate_pixel_data", inputs(), max_pending=3)
+        assert next(results).result == "0"
+        results.close()
+
+    assert len(pulled) <= 4
+
+
+def test_default_pool_size_and_backlog_follow_max_workers(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 2)
+    pulled = []
+
+    def inputs():
+        for index in range(100):
+            pulled.append(index)
+            yield _pixel(str(index))
+
+    with _session(_echo) as session, session.executor() as executor:
+        assert executor.max_workers == 6
+        results = executor.map("generate_pixel_data", inputs())
+        assert next(results).result == "0"
+        results.close()
+
+    assert len(pulled) <= 2 * 6 + 1
@@ -0,0 +1,86 @@
+import os
+import pickle
+
+import httpx
+import pytest
+
+from hyper_sdk import ClientRegistry, RateLimiter, RetryPolicy, Session, init_worker, worker_session
+from hyper_sdk import worker
+
+
+@pytest.fixture
+def forked(monkeypatch):
+    """Makes the current process look like a forked child of itself."""
+    parent = os.getpid()
+
+    def fork():
+        monkeypatch.setattr(os, "getpid", lambda: parent + 1)
+
+    return fork
+
+
+def test_owned_client_is_replaced_in_a_forked_child(forked):
+    session = Session("api-key")
+    inherited = session.client
+
+    forked()
+    client = session.client
+
+    assert client is not inherited
+    assert session.client is client
+    assert not inherited.is_closed
+    session.close()
+    inherited.close()
+
+
+def test_custom_client_is_kept_in_a_forked_child(forked):
+    custom = httpx.Client()
+    session = Session("api-key", client=custom)
+
+    forked()
+
+    assert session.client is custom
+    custom.close()
+
+
+def test_registry_starts_empty_in_a_forked_child(forked):
+    registry = ClientRegistry()
+    inherited = registry.acquire()
+
+    forked()
+    client = registry.acquire()
+
+    assert client is not inherited
+    assert registry.stats() == {"clients": 1, "references": 1}
+    assert not inherited.is_closed
+    registry.release(client)
+    inherited.close()
+
+
+def test_pickled_session_carries_configuration_but_not_state():
+    retry_policy = RetryPolicy(max_attempts=5)
+    retry_policy._stats["url"] = {"attempts": 3}
+    custom = httpx.Client()
+    session = Session("api-key", jwt_key="jwt-key", client=custom, retry_policy=retry_policy,
+                      rate_limiter=RateLimiter(rate=7, burst=2))
+
+    copy = pickle.loads(pickle.dumps(session))
+
+    assert (copy.api_key, copy.jwt_key) == ("api-key", "jwt-key")
+    assert copy.client is not None and copy.client is not custom
+    assert copy.retry_policy.max_attempts == 5 and copy.retry_policy._stats == {}
+    assert (copy.rate_limiter.rate, copy.rate_limiter.burst) == (7, 2)
+    copy.close()
+    custom.close()
+
+
+def test_worker_session_is_set_up_per_process(monkeypatch):
+    monkeypatch.setattr(worker, "_worker_session", None)
+    with pytest.raises(RuntimeError):
+        worker_session()
+
+    init_worker(lambda: Session("api-key"), warmup=False)
+    session = worker_session()
+
+    assert isinstance(session, Session) and session.api_key == "api-key"
+    session.close()
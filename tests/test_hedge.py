@@ -0,0 +1,128 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from hyper_sdk import HedgePolicy
+
+URL = "https://kasada.hypersolutions.co/cd"
+
+
+def _response(body):
+    return httpx.Response(200, text=body, request=httpx.Request("POST", URL))
+
+
+def test_learned_delay_is_the_latency_percentile():
+    policy = HedgePolicy(delay=0.5, percentile=0.9, min_samples=10)
+    for latency in range(1, 10):
+        policy._record(URL, latency / 100)
+
+    assert policy.hedge_delay(URL) == 0.5
+
+    policy._record(URL, 0.10)
+    assert policy.hedge_delay(URL) == 0.09
+
+
+def test_only_configured_endpoints_are_hedged():
+    policy = HedgePolicy()
+
+    assert policy.applies(URL)
+    assert not policy.applies("https://akm.hypersolutions.co/v2/sensor")
+    assert HedgePolicy(endpoints=None).applies("https://akm.hypersolutions.co/v2/sensor")
+
+
+def test_slow_async_call_is_hedged_and_the_loser_cancelled():
+    policy = HedgePolicy(delay=0.02, max_ratio=1)
+    attempts = []
+    cancelled = []
+
+    async def send():
+        attempt = len(attempts)
+        attempts.append(attempt)
+        try:
+            await asyncio.sleep(10 if attempt == 0 else 0)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return _response(f"attempt {attempt}")
+
+    async def run():
+        response = await policy.call_async(URL, send)
+        await asyncio.sleep(0)
+        return response
+
+    response = asyncio.run(asyncio.wait_for(run(), 2))
+
+    assert response.text == "attempt 1"
+    assert cancelled == [0]
+    assert policy.stats() == {"calls": 1, "hedges": 1, "hedge_wins": 1}
+
+
+def test_fast_async_call_is_not_hedged():
+    policy = HedgePolicy(delay=1, max_ratio=1)
+
+    async def send():
+        return _response("fast")
+
+    assert asyncio.run(policy.call_async(URL, send)).text == "fast"
+    assert policy.stats() == {"calls": 1, "hedges": 0, "hedge_wins": 0}
+
+
+def test_hedge_ratio_is_capped():
+    policy = HedgePolicy(delay=0.01, max_ratio=0.5)
+
+    async def send():
+        await asyncio.sleep(0.03)
+        return _response("slow")
+
+    async def run():
+        for _ in range(4):
+            await policy.call_async(URL, send)
+
+    asyncio.run(run())
+
+    assert policy.stats()["hedges"] == 2
+
+
+def test_sync_calls_beyond_the_pool_run_on_the_caller_without_queueing():
+    policy = HedgePolicy(delay=0.01, max_ratio=1, max_workers=1)
+    callers = 4
+    all_sending = threading.Barrier(callers)
+    threads = []
+
+    def send():
+        threads.append(threading.current_thread().name)
+        all_sending.wait(2)
+        return _response("ok")
+
+    def caller():
+        assert policy.call(URL, send).text == "ok"
+
+    pool = ThreadPoolExecutor(max_workers=callers, thread_name_prefix="caller")
+    with pool:
+        for future in [pool.submit(caller) for _ in range(callers)]:
+            future.result()
+
+    assert len(threads) == callers
+    assert sum(name.startswith("hyper-sdk-hedge") for name in threads) <= 1
+    assert policy.stats()["hedges"] == 0
+    policy.close()
+
+
+def test_slow_sync_call_is_hedged_when_a_worker_is_free():
+    policy = HedgePolicy(delay=0.01, max_ratio=1, max_workers=2)
+    release_primary = threading.Event()
+    attempts = []
+
+    def send():
+        attempt = len(attempts)
+        attempts.append(attempt)
+        if attempt == 0:
+            release_primary.wait(2)
+        return _response(f"attempt {attempt}")
+
+    assert policy.call(URL, send).text == "attempt 1"
+    release_primary.set()
+    assert policy.stats() == {"calls": 1, "hedges": 1, "hedge_wins": 1}
+    policy.close()
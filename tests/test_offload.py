@@ -0,0 +1,90 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from hyper_sdk import LoopLagMonitor, PixelInput, SessionAsync, UtmvcInput, input_size, offload_executor
+
+SCRIPT = "var a = 1;" * 10000
+
+
+class _RecordingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1, thread_name_prefix="recording")
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def _generate(input_data, method, **kwargs):
+    def handler(request):
+        return httpx.Response(200, json={"payload": "payload", "swhanedl": "value"})
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with SessionAsync("api-key", client=client, **kwargs) as session:
+            return await getattr(session, method)(input_data)
+
+    asyncio.run(run())
+
+
+@pytest.fixture
+def executor():
+    executor = _RecordingExecutor()
+    yield executor
+    executor.shutdown()
+
+
+def test_large_requests_are_prepared_and_parsed_on_the_executor(executor):
+    _generate(UtmvcInput("ua", ["session-id"], SCRIPT), "generate_utmvc_cookie", offload_threshold=64 * 1024,
+              offload_executor=executor)
+
+    # Preparing the request and parsing its response.
+    assert executor.submitted == 2
+
+
+def test_small_requests_stay_on_the_loop(executor):
+    _generate(PixelInput("ua", "html", "script", "en", "1.1.1.1"), "generate_pixel_data", offload_executor=executor)
+
+    assert executor.submitted == 0
+
+
+def test_offloading_can_be_disabled(executor):
+    _generate(UtmvcInput("ua", ["session-id"], SCRIPT), "generate_utmvc_cookie", offload_threshold=None,
+              offload_executor=executor)
+
+    assert executor.submitted == 0
+
+
+def test_input_size_counts_the_string_fields():
+    assert input_size(UtmvcInput("ua", ["session-id"], SCRIPT)) == len("ua") + len(SCRIPT)
+
+
+def test_shared_executor_is_recreated_after_fork(monkeypatch):
+    executor = offload_executor()
+    assert offload_executor() is executor
+
+    parent = os.getpid()
+    monkeypatch.setattr(os, "getpid", lambda: parent + 1)
+
+    assert offload_executor() is not executor
+
+
+def test_loop_lag_monitor_reports_blocking_work():
+    async def run():
+        async with LoopLagMonitor(interval=0.005) as monitor:
+            await asyncio.sleep(0.02)
+            time.sleep(0.05)
+            await asyncio.sleep(0.02)
+        return monitor.stats()
+
+    stats = asyncio.run(run())
+
+    assert stats["samples"] >= 2
+    assert stats["max"] >= 0.03
+    assert stats["mean"] <= stats["max"]
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from hyper_sdk import RateLimiter
+from hyper_sdk import rate_limit
+
+URL = "https://akm.hypersolutions.co/v2/sensor"
+
+
+def _response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers, request=httpx.Request("POST", URL))
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 2
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: 100.0)
+
+
+def test_reservations_follow_the_gcra_schedule(frozen_clock):
+    bucket = RateLimiter(rate=10, burst=3)._bucket("api-key", URL)
+
+    delays = [bucket.reserve() for _ in range(6)]
+
+    assert delays == pytest.approx([0, 0, 0, 0.1, 0.2, 0.3])
+
+
+def test_429_slows_the_bucket_and_successes_restore_it(frozen_clock):
+    limiter = RateLimiter(rate=10, burst=1, decrease=0.5, increase=0.1)
+    limiter.acquire("api-key", URL)
+    limiter.release("api-key", URL, _response(429, {"retry-after": "2"}))
+    bucket = limiter._bucket("api-key", URL)
+
+    assert bucket.rate == 5
+    assert bucket.reserve() == pytest.approx(2.0)
+
+    limiter.release("api-key", URL, _response(200))
+    assert bucket.rate == 6
+
+
+def test_concurrency_slots_are_granted_in_fifo_order():
+    limiter = RateLimiter(rate=1000, burst=1000, max_concurrency=1)
+    limiter.acquire("api-key", URL)
+    order = []
+
+    def worker(name):
+        limiter.acquire("api-key", URL)
+        order.append(name)
+        limiter.release("api-key", URL)
+
+    threads = []
+    for name in range(4):
+        thread = threading.Thread(target=worker, args=(name,))
+        thread.start()
+        threads.append(thread)
+        _wait_for(lambda: limiter.stats()["api-key"]["waiting"] == name + 1)
+
+    limiter.release("api-key", URL)
+    for thread in threads:
+        thread.join(2)
+
+    assert order == [0, 1, 2, 3]
+    assert limiter.stats()["api-key"]["in_flight"] == 0
+
+
+def test_async_waiters_are_served_in_fifo_order_and_may_cancel():
+    limiter = RateLimiter(rate=1000, burst=1000, max_concurrency=1)
+    order = []
+
+    async def worker(name):
+        async with limiter.limit_async("api-key", URL):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async def run():
+        await limiter.acquire_async("api-key", URL)
+        tasks = []
+        for name in range(4):
+            tasks.append(asyncio.ensure_future(worker(name)))
+            await asyncio.sleep(0)
+        tasks[1].cancel()
+        await asyncio.sleep(0)
+        limiter.release("api-key", URL)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(asyncio.wait_for(run(), 2))
+
+    assert order == [0, 2, 3]
+    assert limiter.stats()["api-key"] == {"rate": 1000, "in_flight": 0, "waiting": 0, "throttled": 0}
+
+
+def test_per_host_buckets_are_independent():
+    limiter = RateLimiter(rate=1, per_host=True)
+    limiter.acquire("api-key-123456", URL)
+    limiter.acquire("api-key-123456", "https://kasada.hypersolutions.co/cd")
+
+    assert sorted(limiter.stats()) == ["api-key-@akm.hypersolutions.co", "api-key-@kasada.hypersolutions.co"]
@@ -0,0 +1,25 @@
+import gzip
+import json
+
+import httpx
+
+from hyper_sdk import PixelInput, Session, SessionCore, TransportResponse
+
+
+def test_decoded_content_is_parsed_as_is():
+    core = SessionCore("api-key")
+    body = json.dumps({"payload": "pixel-data"}).encode()
+    # The content-encoding header stays on the response after the transport decoded the body.
+    response = TransportResponse(200, {"content-encoding": "gzip"}, body)
+
+    assert core.parse_response(response) == ({"payload": "pixel-data"}, 200)
+
+
+def test_gzip_response_is_decoded_once_by_the_client():
+    def handler(request):
+        body = gzip.compress(json.dumps({"payload": "pixel-data"}).encode())
+        return httpx.Response(200, headers={"content-encoding": "gzip"}, content=body)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with Session("api-key", client=client) as session:
+        assert session.generate_pixel_data(PixelInput("ua", "html", "script", "en", "1.1.1.1")) == "pixel-data"
@@ -0,0 +1,155 @@
+import asyncio
+
+import httpx
+import pytest
+
+from hyper_sdk import PixelInput, RetryPolicy, Session
+from hyper_sdk import retry
+from hyper_sdk.retry import DeadlineExceeded, parse_retry_after
+
+URL = "https://akm.hypersolutions.co/pixel"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(retry.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(retry.time, "sleep", clock.sleep)
+    return clock
+
+
+def _response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers, request=httpx.Request("POST", URL))
+
+
+def _sender(outcomes, clock=None, elapsed=0.0):
+    timeouts = []
+
+    def send(timeout):
+        timeouts.append(timeout)
+        if clock is not None:
+            clock.now += elapsed
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _response(outcome)
+
+    send.timeouts = timeouts
+    return send
+
+
+def test_backoff_is_full_jitter_up_to_the_capped_exponential(monkeypatch):
+    bounds = []
+    monkeypatch.setattr(retry.random, "uniform", lambda low, high: bounds.append((low, high)) or high)
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.5)
+
+    delays = [policy.backoff(retry_number) for retry_number in range(1, 6)]
+
+    assert bounds == [(0, 0.1), (0, 0.2), (0, 0.4), (0, 0.5), (0, 0.5)]
+    assert delays == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+
+def test_transport_errors_and_retry_statuses_are_retried(clock):
+    policy = RetryPolicy(max_attempts=3)
+    send = _sender([httpx.ConnectError("reset"), 503, 200])
+
+    assert policy.call(URL, send, 5.0).status_code == 200
+    assert policy.stats() == {URL: {"attempts": 3, "retries": 2, "failures": 0}}
+    assert all(0 <= delay <= 0.2 for delay in clock.sleeps)
+
+
+def test_non_retryable_outcomes_are_returned_at_once(clock):
+    policy = RetryPolicy()
+
+    assert policy.call(URL, _sender([400]), 5.0).status_code == 400
+    with pytest.raises(ValueError):
+        policy.call(URL, _sender([ValueError("bug")]), 5.0)
+    assert clock.sleeps == []
+
+
+def test_last_outcome_is_returned_after_max_attempts(clock):
+    policy = RetryPolicy(max_attempts=2)
+
+    assert policy.call(URL, _sender([503, 502]), 5.0).status_code == 502
+    assert policy.stats()[URL]["failures"] == 1
+
+
+def test_retry_after_extends_the_backoff(clock):
+    policy = RetryPolicy(base_delay=0.01)
+    responses = [_response(429, {"retry-after": "3"}), _response(200)]
+
+    assert policy.call(URL, lambda timeout: responses.pop(0), 5.0).status_code == 200
+    assert clock.sleeps == [3.0]
+    assert parse_retry_after(_response(429, {"retry-after": "soon"})) is None
+
+
+def test_attempt_timeouts_are_capped_to_the_deadline(clock):
+    policy = RetryPolicy(deadline=2.0)
+    send = _sender([httpx.ReadTimeout("slow"), 200], clock, elapsed=1.5)
+
+    policy.call(URL, send, 10.0)
+
+    assert send.timeouts[0].read == 2.0
+    assert send.timeouts[1].read <= 0.5
+
+
+def test_retry_that_would_overrun_the_deadline_is_not_made(clock, monkeypatch):
+    policy = RetryPolicy(deadline=1.0, max_attempts=5)
+    monkeypatch.setattr(policy, "backoff", lambda retry_number: 0.05)
+    send = _sender([503, 200], clock, elapsed=0.99)
+
+    assert policy.call(URL, send, 10.0).status_code == 503
+    assert policy.stats()[URL] == {"attempts": 1, "retries": 0, "failures": 1}
+
+
+def test_exhausted_deadline_raises(clock, monkeypatch):
+    policy = RetryPolicy(deadline=1.0)
+    monkeypatch.setattr(policy, "backoff", lambda retry_number: 0.4)
+    # The sleep overshoots, so no budget is left for the second attempt.
+    monkeypatch.setattr(retry.time, "sleep", lambda delay: setattr(clock, "now", clock.now + 1.0))
+
+    with pytest.raises(DeadlineExceeded):
+        policy.call(URL, _sender([httpx.ConnectError("reset")], clock, elapsed=0.5), 10.0)
+
+
+def test_async_call_retries(monkeypatch):
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(retry.asyncio, "sleep", no_sleep)
+    outcomes = [httpx.ConnectError("reset"), 200]
+
+    async def send(timeout):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _response(outcome)
+
+    response = asyncio.run(RetryPolicy().call_async(URL, send, 5.0))
+
+    assert response.status_code == 200
+
+
+def test_session_retries_through_its_policy(clock):
+    statuses = [503, 200]
+
+    def handler(request):
+        status = statuses.pop(0)
+        return httpx.Response(status, json={"payload": "pixel-data"} if status == 200 else {"error": "busy"})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with Session("api-key", client=client, retry_policy=RetryPolicy()) as session:
+        assert session.generate_pixel_data(PixelInput("ua", "html", "script", "en", "1.1.1.1")) == "pixel-data"
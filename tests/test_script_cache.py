@@ -0,0 +1,165 @@
+import asyncio
+import gzip
+import json
+import pickle
+
+import httpx
+import pytest
+
+from hyper_sdk import Session, SessionAsync, UtmvcInput
+from hyper_sdk.script_cache import ScriptCache, ScriptFragmentCache, default_fragment_cache, script_hash
+from hyper_sdk.testing import ScriptCacheStandIn
+
+SCRIPT = "var a = 1;" * 200
+
+
+def _input():
+    return UtmvcInput("ua", ["session-id"], SCRIPT)
+
+
+def _run_sync(stand_in, script_cache, steps):
+    session = Session("api-key", client=httpx.Client(transport=httpx.MockTransport(stand_in)),
+                      script_cache=script_cache)
+    with session:
+        for step in steps:
+            if step is None:
+                session.generate_utmvc_cookie(_input())
+            else:
+                step()
+
+
+def _run_async(stand_in, script_cache, steps):
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(stand_in))
+        async with SessionAsync("api-key", client=client, script_cache=script_cache) as session:
+            for step in steps:
+                if step is None:
+                    await session.generate_utmvc_cookie(_input())
+                else:
+                    step()
+
+    asyncio.run(run())
+
+
+@pytest.fixture(params=[_run_sync, _run_async], ids=["sync", "async"])
+def run(request):
+    """Runs steps against a session, None steps call an endpoint carrying the script."""
+    return request.param
+
+
+def test_first_call_uploads_and_later_calls_send_the_hash(run):
+    stand_in = ScriptCacheStandIn()
+    script_cache = ScriptCache()
+
+    run(stand_in, script_cache, [None, None, None])
+
+    assert stand_in.full_uploads == 1
+    assert stand_in.hash_hits == 2
+    assert script_cache.stats() == {"hits": 2, "misses": 1, "entries": 1}
+
+
+def test_unknown_hash_is_uploaded_in_full(run):
+    stand_in = ScriptCacheStandIn()
+    script_cache = ScriptCache()
+    # The session believes the script is stored, the API does not know it.
+    script_cache.mark_uploaded(script_hash(SCRIPT))
+
+    run(stand_in, script_cache, [None])
+
+    assert stand_in.hash_misses == 1
+    assert stand_in.full_uploads == 1
+    assert script_hash(SCRIPT) in stand_in.scripts
+
+
+def test_evicted_script_is_uploaded_again(run):
+    stand_in = ScriptCacheStandIn()
+    script_cache = ScriptCache()
+
+    run(stand_in, script_cache, [None, stand_in.evict, None, None])
+
+    assert stand_in.full_uploads == 2
+    assert stand_in.hash_misses == 1
+    assert stand_in.hash_hits == 1
+
+
+def test_uploads_are_bounded():
+    script_cache = ScriptCache(max_entries=2)
+
+    for digest in ("a", "b", "c"):
+        script_cache.mark_uploaded(digest)
+
+    assert not script_cache.is_uploaded("a")
+    assert script_cache.is_uploaded("c")
+
+
+def test_fragment_body_matches_plain_json():
+    fragment_cache = ScriptFragmentCache()
+    data = {"userAgent": "ua", "script": SCRIPT + '"\\ ', "sessionIds": ["a"]}
+
+    body, compressed = fragment_cache.encode(data, compression=False)
+    gzipped, compressed_gzip = fragment_cache.encode(data, compression=True)
+
+    assert not compressed and compressed_gzip
+    assert json.loads(body) == data
+    assert json.loads(gzip.decompress(gzipped)) == data
+
+
+def test_reused_gzip_members_decompress_to_the_body():
+    fragment_cache = ScriptFragmentCache(reuse_compressed=True)
+    data = {"script": SCRIPT, "userAgent": "ua"}
+
+    first, _ = fragment_cache.encode(data, compression=True)
+    second, _ = fragment_cache.encode(dict(data, userAgent="other"), compression=True)
+
+    assert json.loads(gzip.decompress(first)) == data
+    assert json.loads(gzip.decompress(second))["userAgent"] == "other"
+    assert fragment_cache.stats()["hits"] >= 1
+
+
+def test_fragments_are_evicted_by_count_and_size():
+    by_count = ScriptFragmentCache(max_entries=2)
+    for index in range(3):
+        by_count.fragment(f"script {index}")
+
+    by_size = ScriptFragmentCache(max_bytes=3000)
+    for index in range(3):
+        by_size.fragment(str(index) * 1000)
+
+    assert by_count.stats()["entries"] == 2 and by_count.stats()["evictions"] == 1
+    assert by_size.stats()["entries"] == 1 and by_size.stats()["bytes"] <= 3000
+
+
+def test_session_escapes_a_script_once():
+    bodies = []
+
+    def handler(request):
+        bodies.append(json.loads(gzip.decompress(request.read())))
+        return httpx.Response(200, json={"payload": "utmvc", "swhanedl": "swh"})
+
+    fragment_cache = ScriptFragmentCache()
+    session = Session("api-key", client=httpx.Client(transport=httpx.MockTransport(handler)),
+                      fragment_cache=fragment_cache)
+    with session:
+        session.generate_utmvc_cookie(_input())
+        session.generate_utmvc_cookie(UtmvcInput("ua", ["other-id"], SCRIPT))
+
+    assert [body["sessionIds"] for body in bodies] == [["session-id"], ["other-id"]]
+    assert bodies[0]["script"] == SCRIPT
+    assert fragment_cache.stats()["misses"] == 1
+
+
+def test_sessions_share_the_default_fragment_cache():
+    explicit = ScriptFragmentCache()
+
+    assert Session("api-key").fragment_cache is default_fragment_cache
+    assert SessionAsync("api-key").fragment_cache is default_fragment_cache
+    assert Session("api-key", fragment_cache=explicit).fragment_cache is explicit
+
+
+def test_pickled_session_uses_the_default_fragment_cache_of_its_process():
+    copy = pickle.loads(pickle.dumps(Session("api-key")))
+    explicit = pickle.loads(pickle.dumps(Session("api-key", fragment_cache=ScriptFragmentCache(max_entries=2))))
+
+    assert copy.fragment_cache is default_fragment_cache
+    assert explicit.fragment_cache is not default_fragment_cache
+    assert explicit.fragment_cache.max_entries == 2
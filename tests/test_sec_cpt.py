@@ -0,0 +1,53 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+import hashlib
+import json
+
+from hyper_sdk.akamai.sec_cpt import SecCptChallenge, SecCptChallengeData, solve_sec_cpt_answers
+
+SEC, TIMESTAMP, NONCE, DIFFICULTY = "sec", 1700000000, "nonce", 50
+
+
+def _is_valid(answer, index):
+    prefix = f"{SEC}{TIMESTAMP}{NONCE}{DIFFICULTY + index}"
+    digest = hashlib.sha256((prefix + answer).encode("ascii")).digest()
+    return int.from_bytes(digest, "big") % (DIFFICULTY + index) == 0
+
+
+class _RecordingExecutor(Executor):
+    def __init__(self, executor):
+        self.executor = executor
+        self.futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = self.executor.submit(fn, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+
+def test_sequential_answers_satisfy_the_difficulty():
+    answers = solve_sec_cpt_answers(SEC, TIMESTAMP, NONCE, DIFFICULTY, 5)
+
+    assert len(answers) == 5
+    assert all(_is_valid(answer, index) for index, answer in enumerate(answers))
+
+
+def test_chunked_answers_are_returned_in_challenge_order():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        executor = _RecordingExecutor(pool)
+        answers = solve_sec_cpt_answers(SEC, TIMESTAMP, NONCE, DIFFICULTY, 5, workers=2, executor=executor,
+                                        chunk_size=4)
+
+    assert all(_is_valid(answer, index) for index, answer in enumerate(answers))
+    # Small chunks rarely contain an answer, so the search spans many tasks, none of them left pending.
+    assert len(executor.futures) > 5
+    assert all(future.done() for future in executor.futures)
+
+
+def test_payload_contains_the_token_and_answers():
+    challenge = SecCptChallenge(0, "/_sec/cp_challenge/verify",
+                                SecCptChallengeData("token", TIMESTAMP, NONCE, DIFFICULTY, 3))
+
+    payload = json.loads(challenge.generate_sec_cpt_payload(f"{SEC}~rest"))
+
+    assert payload["token"] == "token"
+    assert all(_is_valid(answer, index) for index, answer in enumerate(payload["answers"]))
@@ -0,0 +1,84 @@
+import asyncio
+
+from hyper_sdk.akamai.sec_cpt import SecCptChallenge, SecCptChallengeData
+from hyper_sdk.akamai.sec_cpt_scheduler import AsyncSecCptScheduler, SecCptScheduler, TimerWheel
+
+
+def _challenge(duration):
+    return SecCptChallenge(duration, "/_sec/cp_challenge/verify", SecCptChallengeData("token", 0, "nonce", 1, 1))
+
+
+def _advance(wheel, ticks):
+    return [wheel.advance() for _ in range(ticks)]
+
+
+def test_timers_expire_on_their_tick_across_revolutions():
+    wheel = TimerWheel(slots=4)
+    wheel.schedule(1, "first")
+    wheel.schedule(3, "third")
+    wheel.schedule(6, "sixth")
+
+    expired = _advance(wheel, 6)
+
+    assert expired == [["first"], [], ["third"], [], [], ["sixth"]]
+    assert len(wheel) == 0
+
+
+def test_cancelled_timer_does_not_expire():
+    wheel = TimerWheel(slots=4)
+    timer_id = wheel.schedule(2, "cancelled")
+    wheel.schedule(2, "kept")
+
+    assert wheel.cancel(timer_id)
+    assert not wheel.cancel(timer_id)
+    assert _advance(wheel, 2) == [[], ["kept"]]
+
+
+def test_drain_returns_pending_items():
+    wheel = TimerWheel()
+    wheel.schedule(5, "a")
+    wheel.schedule(600, "b")
+
+    assert sorted(wheel.drain()) == ["a", "b"]
+    assert len(wheel) == 0
+
+
+def test_scheduler_releases_challenges_in_duration_order():
+    released = []
+    with SecCptScheduler(tick=0.01) as scheduler:
+        late = scheduler.schedule(_challenge(0.1), "late", lambda future: released.append(future.result()))
+        early = scheduler.schedule(_challenge(0.02), "early", lambda future: released.append(future.result()))
+
+        assert late.result(timeout=2) == "late"
+        assert early.result() == "early"
+
+    assert released == ["early", "late"]
+
+
+def test_scheduler_cancel_and_close_drop_the_timers():
+    scheduler = SecCptScheduler(tick=0.01)
+    cancelled = scheduler.schedule(_challenge(60), "cancelled")
+    pending = scheduler.schedule(_challenge(60), "pending")
+
+    cancelled.cancel()
+    assert len(scheduler) == 1
+
+    scheduler.close()
+    assert pending.cancelled()
+
+
+def test_async_scheduler_releases_challenges():
+    async def run():
+        async with AsyncSecCptScheduler(tick=0.01) as scheduler:
+            late = scheduler.schedule(_challenge(0.05), "late")
+            early = scheduler.schedule(_challenge(0.01), "early")
+            cancelled = scheduler.schedule(_challenge(60), "cancelled")
+            cancelled.cancel()
+            await asyncio.sleep(0)
+
+            done, _ = await asyncio.wait([late, early], return_when=asyncio.FIRST_COMPLETED)
+            assert done == {early}
+            assert await late == "late"
+            assert len(scheduler) == 0
+
+    asyncio.run(asyncio.wait_for(run(), 2))
@@ -0,0 +1,81 @@
+import json
+import pickle
+
+import httpx
+import pytest
+
+from hyper_sdk import JsonBackend, Session, StdlibJsonBackend, UtmvcInput, json_backend
+from hyper_sdk import serialization
+
+DOCUMENT = {"script": "var s = \"é\\n\";</script>", "ids": [1, 2.5, None, True], "nested": {"a": ""}}
+
+
+def _backends():
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            yield json_backend(name)
+        except ImportError:
+            continue
+
+
+@pytest.mark.parametrize("backend", list(_backends()), ids=lambda backend: backend.name)
+def test_backends_round_trip_bytes_and_str(backend):
+    encoded = backend.dumps(DOCUMENT)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == DOCUMENT
+    assert backend.loads(encoded) == DOCUMENT
+    assert backend.loads(encoded.decode()) == DOCUMENT
+    with pytest.raises(ValueError):
+        backend.loads(b"{not json")
+
+
+def test_backends_are_resolved_by_name_or_instance():
+    backend = StdlibJsonBackend()
+
+    assert json_backend(backend) is backend
+    assert json_backend() is serialization.default_json_backend
+    with pytest.raises(ValueError):
+        json_backend("simplejson")
+
+
+def test_auto_falls_back_to_the_standard_library(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    monkeypatch.setattr(serialization, "msgspec", None)
+
+    assert isinstance(json_backend("auto"), StdlibJsonBackend)
+    with pytest.raises(ImportError):
+        json_backend("orjson")
+
+
+def test_session_encodes_through_its_backend():
+    calls = []
+
+    class RecordingBackend(StdlibJsonBackend):
+        def dumps(self, data):
+            calls.append("dumps")
+            return super().dumps(data)
+
+        def loads(self, data):
+            calls.append("loads")
+            return super().loads(data)
+
+    sent = []
+
+    def handler(request):
+        sent.append(json.loads(request.read()))
+        return httpx.Response(200, json={"payload": "utmvc-cookie", "swhanedl": "value"})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with Session("api-key", client=client, compression=False, json_backend=RecordingBackend()) as session:
+        session.generate_utmvc_cookie(UtmvcInput("ua", ["session-id"], "var a = \"é\";"))
+
+    assert sent[0]["script"] == "var a = \"é\";"
+    assert "dumps" in calls and calls[-1] == "loads"
+
+
+def test_session_keeps_its_backend_when_pickled():
+    copy = pickle.loads(pickle.dumps(Session("api-key", json_backend="json")))
+
+    assert isinstance(copy.json_backend, JsonBackend) and copy.json_backend.name == "json"
+    copy.close()
@@ -0,0 +1,72 @@
+import asyncio
+
+import httpx
+
+from hyper_sdk import PixelInput, Session, SessionAsync
+from hyper_sdk.shared import resolve_timeout
+
+PIXEL_URL = "https://akm.hypersolutions.co/pixel"
+
+
+def _pixel():
+    return PixelInput("ua", "html", "script", "en", "1.1.1.1")
+
+
+def _handler(timeouts):
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={"payload": "pixel-data"})
+
+    return handler
+
+
+def test_timeout_is_resolved_by_url_then_host():
+    timeouts = {PIXEL_URL: 1.0, "akm.hypersolutions.co": 2.0}
+
+    assert resolve_timeout(timeouts, PIXEL_URL) == 1.0
+    assert resolve_timeout(timeouts, "https://akm.hypersolutions.co/sbsd") == 2.0
+    assert resolve_timeout(timeouts, "https://kasada.hypersolutions.co/cd") is httpx.USE_CLIENT_DEFAULT
+    assert resolve_timeout(None, PIXEL_URL) is httpx.USE_CLIENT_DEFAULT
+
+
+def test_endpoint_timeout_is_applied_to_a_supplied_client():
+    timeouts = []
+    client = httpx.Client(transport=httpx.MockTransport(_handler(timeouts)), timeout=30.0)
+    with Session("api-key", client=client, timeouts={"akm.hypersolutions.co": 2.5}) as session:
+        session.generate_pixel_data(_pixel())
+
+    assert timeouts == [2.5]
+
+
+def test_endpoint_timeout_is_applied_by_the_async_session():
+    timeouts = []
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_handler(timeouts)), timeout=30.0)
+        async with SessionAsync("api-key", client=client, timeouts={PIXEL_URL: 4.0}) as session:
+            await session.generate_pixel_data(_pixel())
+
+    asyncio.run(run())
+
+    assert timeouts == [4.0]
+
+
+def test_owned_client_uses_the_pool_limits():
+    limits = httpx.Limits(max_connections=7, max_keepalive_connections=3)
+    with Session("api-key", limits=limits) as session:
+        pool = session.client._transport._pool
+
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+
+
+def test_only_the_async_session_negotiates_http2_by_default():
+    async def async_pool():
+        async with SessionAsync("api-key") as session:
+            return session.client._transport._pool
+
+    with Session("api-key") as session:
+        assert not session.client._transport._pool._http2
+    with Session("api-key", http2=True) as session:
+        assert session.client._transport._pool._http2
+    assert asyncio.run(async_pool())._http2
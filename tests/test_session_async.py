@@ -0,0 +1,28 @@
+import asyncio
+
+import httpx
+
+from hyper_sdk import SessionAsync, PixelInput
+
+
+def _mock_client(requests):
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"payload": "pixel-data"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_generate_without_context_manager(monkeypatch):
+    requests = []
+    session = SessionAsync("api-key")
+    monkeypatch.setattr(session, "_create_client", lambda: _mock_client(requests))
+
+    async def run():
+        try:
+            return await session.generate_pixel_data(PixelInput("ua", "html", "script", "en", "1.1.1.1"))
+        finally:
+            await session.close()
+
+    assert asyncio.run(run()) == "pixel-data"
+    assert len(requests) == 1
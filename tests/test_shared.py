@@ -0,0 +1,77 @@
+import pytest
+
+from hyper_sdk import shared
+from hyper_sdk.shared import HeaderCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(shared.time, "monotonic", clock)
+    return clock
+
+
+def test_signed_headers_are_reused_until_the_refresh_margin(clock):
+    cache = HeaderCache(refresh_margin=10, clock_skew=5, lifetime=60)
+
+    first = cache.get("api-key", jwt_key="jwt-key")
+    clock.now += 44
+    second = cache.get("api-key", jwt_key="jwt-key")
+
+    assert second["X-Signature"] == first["X-Signature"]
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+    clock.now += 1
+    cache.get("api-key", jwt_key="jwt-key")
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_changed_credentials_are_signed_again(clock):
+    cache = HeaderCache()
+
+    cache.get("api-key", jwt_key="jwt-key")
+    headers = cache.get("other-key", jwt_key="jwt-key")
+
+    assert headers["X-Api-Key"] == "other-key"
+    assert cache.stats() == {"hits": 0, "misses": 2}
+
+
+def test_unsigned_headers_never_expire(clock):
+    cache = HeaderCache()
+
+    cache.get("api-key")
+    clock.now += 10 ** 6
+    cache.get("api-key")
+
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_invalidate_forces_a_new_signature(clock):
+    cache = HeaderCache()
+
+    cache.get("api-key", jwt_key="jwt-key")
+    cache.invalidate()
+    cache.get("api-key", jwt_key="jwt-key")
+
+    assert cache.stats()["misses"] == 2
+
+
+def test_returned_headers_are_copies(clock):
+    cache = HeaderCache()
+
+    cache.get("api-key")["X-Api-Key"] = "changed"
+
+    assert cache.get("api-key")["X-Api-Key"] == "api-key"
+
+
+def test_margin_and_skew_must_leave_a_usable_lifetime():
+    with pytest.raises(ValueError):
+        HeaderCache(refresh_margin=50, clock_skew=10, lifetime=60)
@@ -0,0 +1,102 @@
+import asyncio
+import functools
+import json
+import threading
+
+import httpx
+import pytest
+
+from hyper_sdk import Session, SessionAsync, StreamingBody, UtmvcInput, json_backend
+from hyper_sdk.compression import available_encodings, compressor, decompress
+from hyper_sdk.serialization import StdlibJsonBackend
+
+TEXT = "quote \" backslash \\ newline \n tab \t control \x01 unicode é 😀 </script>" * 50
+SCRIPT = "var a = \"é\";\n" * 20000
+
+
+def _backends():
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            yield json_backend(name)
+        except ImportError:
+            continue
+
+
+@pytest.mark.parametrize("backend", list(_backends()), ids=lambda backend: backend.name)
+def test_chunked_escaping_equals_escaping_the_whole_string(backend):
+    body = StreamingBody([b'{"script":', TEXT, b'}'], backend=backend, chunk_size=7)
+
+    assert json.loads(b"".join(body)) == {"script": TEXT}
+    assert b"".join(body) == b'{"script":' + backend.dumps(TEXT) + b'}'
+
+
+def test_body_can_be_iterated_again():
+    body = StreamingBody([b"x" * 100, "text"], chunk_size=16)
+
+    first = list(body)
+    assert first == list(body)
+    assert max(len(chunk) for chunk in first) <= 16
+
+
+@pytest.mark.parametrize("encoding", available_encodings())
+def test_compressed_stream_decompresses_to_the_body(encoding):
+    body = StreamingBody([b'{"script":', TEXT, b'}'], compressor=functools.partial(compressor, encoding, 3),
+                         chunk_size=100)
+
+    assert json.loads(decompress(b"".join(body), encoding)) == {"script": TEXT}
+
+
+def _utmvc_handler(received):
+    def handler(request):
+        received.append((request.headers, request.read()))
+        return httpx.Response(200, json={"payload": "utmvc-cookie", "swhanedl": "value"})
+
+    return handler
+
+
+def test_session_streams_long_scripts():
+    received = []
+    client = httpx.Client(transport=httpx.MockTransport(_utmvc_handler(received)))
+    with Session("api-key", client=client, stream_threshold=64 * 1024) as session:
+        session.generate_utmvc_cookie(UtmvcInput("ua", ["session-id"], SCRIPT))
+
+    headers, body = received[0]
+    assert headers["transfer-encoding"] == "chunked"
+    assert json.loads(decompress(body, headers["content-encoding"]))["script"] == SCRIPT
+
+
+def test_async_session_streams_long_scripts():
+    received = []
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_utmvc_handler(received)))
+        async with SessionAsync("api-key", client=client, stream_threshold=64 * 1024) as session:
+            return await session.generate_utmvc_cookie(UtmvcInput("ua", ["session-id"], SCRIPT))
+
+    assert asyncio.run(run()) == ("utmvc-cookie", "value")
+    headers, body = received[0]
+    assert headers["transfer-encoding"] == "chunked"
+    assert json.loads(decompress(body, headers["content-encoding"]))["script"] == SCRIPT
+
+
+
+def test_async_session_produces_large_streamed_bodies_off_the_loop():
+    received = []
+    threads = set()
+
+    class RecordingBackend(StdlibJsonBackend):
+        def dumps(self, value):
+            threads.add(threading.current_thread().name)
+            return super().dumps(value)
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_utmvc_handler(received)))
+        async with SessionAsync("api-key", client=client, stream_threshold=64 * 1024,
+                                json_backend=RecordingBackend()) as session:
+            await session.generate_utmvc_cookie(UtmvcInput("ua", ["session-id"], SCRIPT))
+        return threading.current_thread().name
+
+    loop_thread = asyncio.run(run())
+
+    assert received[0][0]["transfer-encoding"] == "chunked"
+    assert threads and loop_thread not in threads
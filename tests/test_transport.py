@@ -0,0 +1,83 @@
+import json
+import socket
+
+import httpx
+import pytest
+
+from hyper_sdk import (AsyncTransport, PixelInput, ScriptCache, Session, SessionCore, Transport, TransportResponse,
+                       Urllib3Transport, UtmvcInput)
+from hyper_sdk.script_cache import SCRIPT_HASH_MISS
+
+PIXEL_URL = "https://akm.hypersolutions.co/pixel"
+
+
+def _response(data, status_code=200):
+    return TransportResponse(status_code, {"content-type": "application/json"}, json.dumps(data).encode())
+
+
+class _RecordingTransport(Transport):
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def post(self, url, headers, content, timeout):
+        self.requests.append((url, headers, json.loads(content)))
+        return self.responses.pop(0)
+
+
+def test_httpx_clients_implement_the_transport_interfaces():
+    with httpx.Client() as client:
+        assert isinstance(client, Transport)
+    assert isinstance(httpx.AsyncClient(), AsyncTransport)
+    with pytest.raises(TypeError):
+        Transport()
+
+
+def test_request_flow_is_driven_without_io():
+    core = SessionCore("api-key", compression=False)
+    flow = core.call_flow("generate_pixel_data", PixelInput("ua", "html", "script", "en", "1.1.1.1"))
+
+    request = next(flow)
+    assert request.headers["X-Api-Key"] == "api-key"
+    assert json.loads(request.body)["userAgent"] == "ua"
+
+    with pytest.raises(StopIteration) as done:
+        flow.send(core.parse_response(_response({"payload": "pixel-data"})))
+    assert done.value.value == "pixel-data"
+
+
+def test_request_flow_uploads_the_script_again_after_a_miss():
+    script_cache = ScriptCache()
+    core = SessionCore("api-key", compression=False, script_cache=script_cache)
+    script = "var a = 1;" * 10
+    script_cache.mark_uploaded(script_cache.digest(script))
+    flow = core.call_flow("generate_utmvc_cookie", UtmvcInput("ua", ["session-id"], script))
+
+    by_hash = json.loads(next(flow).body)
+    assert "script" not in by_hash and by_hash["scriptHash"]
+
+    full = json.loads(flow.send(({"error": SCRIPT_HASH_MISS}, 409)).body)
+    assert full["script"] == script
+
+    with pytest.raises(StopIteration):
+        flow.send(({"payload": "utmvc-cookie", "swhanedl": "value"}, 200))
+    assert script_cache.is_uploaded(full["scriptHash"])
+
+
+def test_session_posts_through_a_custom_transport():
+    transport = _RecordingTransport(_response({"payload": "pixel-data"}))
+    with Session("api-key", transport=transport) as session:
+        assert session.generate_pixel_data(PixelInput("ua", "html", "script", "en", "1.1.1.1")) == "pixel-data"
+
+    assert [url for url, _, _ in transport.requests] == [PIXEL_URL]
+
+
+def test_urllib3_errors_are_raised_as_httpx_errors():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    transport = Urllib3Transport(timeout=1)
+    with pytest.raises(httpx.ConnectError):
+        transport.post(f"http://127.0.0.1:{port}/", {}, b"{}", httpx.USE_CLIENT_DEFAULT)
+    transport.close()
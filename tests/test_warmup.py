@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import httpx
+
+from hyper_sdk import PixelInput, Session, SessionAsync
+from hyper_sdk.warmup import IdleTracker, resolve_hosts
+
+
+def _handler(heads, unreachable=()):
+    lock = threading.Lock()
+
+    def handler(request):
+        if request.url.host in unreachable:
+            raise httpx.ConnectError("unreachable", request=request)
+        if request.method == "HEAD":
+            with lock:
+                heads.append(request.url.host)
+            return httpx.Response(404)
+        return httpx.Response(200, json={"payload": "pixel-data"})
+
+    return handler
+
+
+def test_product_names_resolve_to_their_hosts():
+    assert resolve_hosts(["akamai", "api.example.com"]) == ["akm.hypersolutions.co", "api.example.com"]
+    assert "kasada.hypersolutions.co" in resolve_hosts()
+
+
+def test_warmup_reports_every_host():
+    heads, reports = [], []
+    client = httpx.Client(transport=httpx.MockTransport(_handler(heads, {"kasada.hypersolutions.co"})))
+    with Session("api-key", client=client) as session:
+        results = session.warmup(["akamai", "kasada"], hook=lambda *report: reports.append(report))
+
+    assert list(results) == ["akm.hypersolutions.co"]
+    assert heads == ["akm.hypersolutions.co"]
+    errors = {host: error for host, _, error in reports}
+    assert errors["akm.hypersolutions.co"] is None
+    assert isinstance(errors["kasada.hypersolutions.co"], httpx.ConnectError)
+
+
+def test_async_warmup_reports_every_host():
+    heads = []
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_handler(heads)))
+        async with SessionAsync("api-key", client=client) as session:
+            return await session.warmup(["datadome", "incapsula"])
+
+    assert sorted(asyncio.run(run())) == ["datadome.hypersolutions.co", "incapsula.hypersolutions.co"]
+    assert sorted(heads) == ["datadome.hypersolutions.co", "incapsula.hypersolutions.co"]
+
+
+def test_idle_tracker_skips_recently_used_hosts():
+    tracker = IdleTracker()
+    tracker.touch("https://akm.hypersolutions.co/pixel")
+
+    assert tracker.idle(["akm.hypersolutions.co", "kasada.hypersolutions.co"], 60) == ["kasada.hypersolutions.co"]
+
+
+def test_keep_warm_only_warms_idle_hosts():
+    heads = []
+    client = httpx.Client(transport=httpx.MockTransport(_handler(heads)))
+    with Session("api-key", client=client) as session:
+        session.keep_warm(interval=0.1, hosts=["akamai", "kasada"])
+        deadline = time.monotonic() + 0.35
+        while time.monotonic() < deadline:
+            # Requests keep akamai busy, so only kasada goes idle.
+            session.generate_pixel_data(PixelInput("ua", "html", "script", "en", "1.1.1.1"))
+            time.sleep(0.01)
+        session.stop_keep_warm()
+
+    assert heads
+    assert set(heads) == {"kasada.hypersolutions.co"}
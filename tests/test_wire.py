@@ -0,0 +1,79 @@
+import json
+import pickle
+
+import httpx
+
+from hyper_sdk import PixelInput, SensorInput, Session, UtmvcInput
+
+
+def _session(bodies):
+    def handler(request):
+        bodies.append(json.loads(request.read()))
+        return httpx.Response(200, json={"payload": "utmvc", "swhanedl": "swh"})
+
+    return Session("api-key", client=httpx.Client(transport=httpx.MockTransport(handler)), compression=False)
+
+
+def test_list_field_changed_in_place_is_sent():
+    bodies = []
+    session = _session(bodies)
+    input_data = UtmvcInput("ua", ["a"], "script")
+
+    session.generate_utmvc_cookie(input_data)
+    input_data.session_ids.append("b")
+    session.generate_utmvc_cookie(input_data)
+
+    assert [body["sessionIds"] for body in bodies] == [["a"], ["a", "b"]]
+
+
+def test_assigned_field_is_sent():
+    bodies = []
+    session = _session(bodies)
+    input_data = UtmvcInput("ua", ["a"], "script")
+
+    session.generate_utmvc_cookie(input_data)
+    input_data.user_agent = "ua2"
+    session.generate_utmvc_cookie(input_data)
+
+    assert [body["userAgent"] for body in bodies] == ["ua", "ua2"]
+
+
+def test_unchanged_input_reuses_request_data():
+    bodies = []
+    session = _session(bodies)
+    input_data = UtmvcInput("ua", ["a"], "script")
+
+    result = session.generate_utmvc_cookie(input_data)
+    cached = input_data._wire[3]
+    session.generate_utmvc_cookie(input_data)
+
+    assert input_data._wire[3] is cached
+    assert result == ("utmvc", "swh")
+    assert result.payload == "utmvc"
+
+
+def test_pickle_round_trip():
+    input_data = UtmvcInput("ua", ["a"], "script")
+    copy = pickle.loads(pickle.dumps(input_data))
+
+    assert (copy.user_agent, copy.session_ids, copy.script) == ("ua", ["a"], "script")
+
+
+def test_inputs_have_no_instance_dict():
+    input_data = UtmvcInput("ua", ["a"], "script")
+
+    assert not hasattr(input_data, "__dict__")
+    assert not hasattr(PixelInput("ua", "html", "script", "en", "1.1.1.1"), "__dict__")
+
+
+def test_sensor_result_is_named_and_unpacks_like_a_tuple():
+    def handler(request):
+        return httpx.Response(200, json={"payload": "sensor-data", "context": "next-context"})
+
+    with Session("api-key", client=httpx.Client(transport=httpx.MockTransport(handler))) as session:
+        result = session.generate_sensor_data(SensorInput("abck", "bmsz", "3", "https://example.com", "ua",
+                                                          "1.1.1.1", "en", "", "script", "https://example.com/s.js"))
+
+    payload, context = result
+    assert (payload, context) == ("sensor-data", "next-context")
+    assert result.context == "next-context"